@@ -34,6 +34,7 @@ from .inputs import (
 from .pagination import Pagination
 from .search_bar import SearchBar
 from .word_item import WordItem
+from .suggestion_item import SuggestionItem
 from .loading_indicator import LoadingIndicator
 
 __all__ = [
@@ -71,5 +72,6 @@ __all__ = [
     'Pagination',
     'SearchBar',
     'WordItem',
+    'SuggestionItem',
     'LoadingIndicator'
 ] 
\ No newline at end of file
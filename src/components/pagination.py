@@ -2,6 +2,7 @@
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
+from kivy.uix.textinput import TextInput
 from kivy.metrics import dp
 
 class Pagination(BoxLayout):
@@ -24,7 +25,7 @@ class Pagination(BoxLayout):
         self._init_ui()                     # 初始化UI組件
         
     def _init_ui(self):
-        """初始化UI組件：創建上一頁按鈕、頁碼標籤和下一頁按鈕"""
+        """初始化UI組件：創建上一頁按鈕、頁碼輸入框、總頁數標籤和下一頁按鈕"""
         # 創建上一頁按鈕
         self.prev_btn = Button(
             text="上一頁",
@@ -34,10 +35,22 @@ class Pagination(BoxLayout):
         )
         self.prev_btn.bind(on_press=self._on_prev_page)  # 綁定點擊事件
         
-        # 創建頁碼標籤
+        # 創建頁碼輸入框：輸入頁碼後按 Enter 跳轉
+        self.page_input = TextInput(
+            text="1",
+            size_hint_x=0.25,               # 佔用水平空間的25%
+            multiline=False,                # 單行，按 Enter 觸發跳轉
+            input_filter="int",             # 只允許輸入數字
+            halign="center",
+            font_size=dp(20)                # 字體大小為20dp
+        )
+        self.page_input.bind(on_text_validate=self._on_page_input)
+        self.page_input.bind(focus=self._on_page_input_focus)
+
+        # 創建總頁數標籤
         self.page_label = Label(
-            text="1/1",                     # 初始顯示"1/1"
-            size_hint_x=0.5,                # 佔用水平空間的50%
+            text="/1",                      # 初始顯示"/1"
+            size_hint_x=0.25,               # 佔用水平空間的25%
             font_name="ChineseFont",        # 使用中文字體
             font_size=dp(20)                # 字體大小為20dp
         )
@@ -53,36 +66,56 @@ class Pagination(BoxLayout):
         
         # 將所有組件添加到佈局中
         self.add_widget(self.prev_btn)
+        self.add_widget(self.page_input)
         self.add_widget(self.page_label)
         self.add_widget(self.next_btn)
     
-    def update_state(self, current_page, total_pages):
+    def update_state(self, current_page, total_pages, has_more=False):
         """
         更新分頁狀態
         Args:
             current_page: 當前頁碼
             total_pages: 總頁數
+            has_more: 總頁數是否為下限（計數達到上限，實際可能更多）
         """
         self.current_page = current_page
         self.total_pages = total_pages
         
         # 更新頁碼顯示文本
-        self.page_label.text = f"{current_page}/{total_pages}"
+        self.page_input.text = str(current_page)
+        self.page_label.text = f"/{total_pages}{'+' if has_more else ''}"
         
         # 根據當前頁碼更新按鈕狀態
         self.prev_btn.disabled = current_page == 1  # 在第一頁時禁用"上一頁"
         self.next_btn.disabled = current_page == total_pages  # 在最後一頁時禁用"下一頁"
     
-    def _on_prev_page(self, instance):
-        """處理上一頁按鈕點擊：頁碼減1並觸發回調"""
-        if self.current_page > 1:
-            self.current_page -= 1
+    def go_to_page(self, page):
+        """
+        跳轉到指定頁碼並觸發回調
+        Args:
+            page: 目標頁碼（超出範圍時會被限制在 1 到總頁數之間）
+        """
+        page = max(1, min(page, self.total_pages))
+        if page != self.current_page:
+            self.current_page = page
             if self.on_page_change:
                 self.on_page_change(self.current_page)
+
+    def _on_prev_page(self, instance):
+        """處理上一頁按鈕點擊：頁碼減1並觸發回調"""
+        self.go_to_page(self.current_page - 1)
     
     def _on_next_page(self, instance):
         """處理下一頁按鈕點擊：頁碼加1並觸發回調"""
-        if self.current_page < self.total_pages:
-            self.current_page += 1
-            if self.on_page_change:
-                self.on_page_change(self.current_page) 
\ No newline at end of file
+        self.go_to_page(self.current_page + 1)
+
+    def _on_page_input(self, instance):
+        """處理頁碼輸入框按 Enter：跳轉到輸入的頁碼，輸入無效時恢復當前頁碼"""
+        if instance.text.isdigit():
+            self.go_to_page(int(instance.text))
+        instance.text = str(self.current_page)
+
+    def _on_page_input_focus(self, instance, focused):
+        """頁碼輸入框失去焦點時恢復當前頁碼，未按 Enter 的輸入不生效"""
+        if not focused:
+            instance.text = str(self.current_page)
@@ -1,18 +1,23 @@
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.textinput import TextInput
 from kivy.uix.image import Image
+from kivy.uix.button import Button
 from kivy.uix.anchorlayout import AnchorLayout
 from kivy.uix.behaviors import ButtonBehavior
 from kivy.metrics import dp
+from kivy.clock import Clock
 from kivy.graphics import Color, RoundedRectangle
 
 class SearchIconButton(ButtonBehavior, Image):
     """可點擊的搜索圖標：將圖片轉換為可點擊的按鈕"""
     pass
 
+# 搜索範圍按鈕依序切換的模式：(範圍, 按鈕文字)
+SEARCH_MODES = [("japanese", "日文"), ("explanation", "解釋"), ("all", "全部")]
+
 class SearchBar(BoxLayout):
-    """搜索欄：包含搜索圖標和輸入框的組合控件"""
-    def __init__(self, search_callback=None, **kwargs):
+    """搜索欄：包含搜索圖標、輸入框和搜索範圍按鈕的組合控件"""
+    def __init__(self, search_callback=None, submit_callback=None, mode_callback=None, **kwargs):
         super().__init__(**kwargs)
         # 基本佈局設置
         self.orientation = "horizontal"      # 水平佈局
@@ -20,7 +25,12 @@ class SearchBar(BoxLayout):
         self.height = dp(50)                # 固定高度
         self.padding = [dp(10), dp(10), dp(10), dp(5)]  # 內邊距 [左, 上, 右, 下]
         self.spacing = dp(10)               # 元素間距
-        self.search_callback = search_callback  # 搜索回調函數
+        self.search_callback = search_callback  # 搜索回調函數（輸入變化時）
+        self.submit_callback = submit_callback  # 立即搜索回調（點擊圖標或按下 Enter）
+        self.mode_callback = mode_callback      # 搜索範圍切換回調
+        self.mode_index = 0                     # 當前搜索範圍在 SEARCH_MODES 中的位置
+        # 同一幀內的多次文字變化（例如輸入法提交時先刪除候選再插入）只觸發一次
+        self._emit_trigger = Clock.create_trigger(self._emit_text)
 
         # 創建搜索框容器：包含圖標和輸入框
         search_container = BoxLayout(
@@ -73,26 +83,59 @@ class SearchBar(BoxLayout):
 
         # 綁定輸入框事件
         self.search_input.bind(text=self._on_text_change)      # 文字變化時觸發搜索
+        self.search_input.bind(on_text_validate=self._on_search_press)  # Enter 立即搜索
         self.search_input.bind(size=self._maintain_text_pos)   # 保持文字位置固定
 
         search_container.add_widget(self.search_input)
         self.add_widget(search_container)
 
+        # 創建搜索範圍按鈕：點擊在日文、解釋、全部之間切換
+        self.mode_btn = Button(
+            text=SEARCH_MODES[0][1],
+            size_hint_x=0.15,         # 佔父容器15%寬度
+            font_name="ChineseFont",  # 中文字體
+            font_size=dp(16),
+        )
+        self.mode_btn.bind(on_press=self._on_mode_press)
+        self.add_widget(self.mode_btn)
+
     def _update_bg(self, instance, value):
         """更新搜索框背景的位置和大小"""
         self.bg.pos = instance.pos
         self.bg.size = instance.size
 
     def _on_search_press(self, instance):
-        """搜索圖標點擊事件：執行搜索回調"""
-        if self.search_callback:
-            self.search_callback(self.search_input.text)
+        """搜索圖標點擊事件：立即執行搜索回調"""
+        self._emit_trigger.cancel()
+        callback = self.submit_callback or self.search_callback
+        if callback:
+            callback(self.search_input.text)
+
+    def _on_mode_press(self, instance):
+        """搜索範圍按鈕點擊事件：切換到下一個範圍並執行回調"""
+        self.mode_index = (self.mode_index + 1) % len(SEARCH_MODES)
+        field, label = SEARCH_MODES[self.mode_index]
+        self.mode_btn.text = label
+        if self.mode_callback:
+            self.mode_callback(field)
 
     def _maintain_text_pos(self, instance, value):
         """保持輸入框文字位置：確保文字位置在大小變化時保持固定"""
         instance.padding = [0, dp(5), dp(10), dp(5)]
 
     def _on_text_change(self, instance, value):
-        """輸入框文字變化事件：即時搜索"""
+        """輸入框文字變化事件：延到下一幀再處理，合併同一幀內的變化"""
+        self._emit_trigger()
+
+    def clear(self):
+        """清空輸入框（不觸發搜索回調）"""
+        self.search_input.text = ""
+        self._emit_trigger.cancel()
+
+    def _emit_text(self, dt):
+        """執行搜索回調：輸入法仍在組字（文字含未確定的候選）時不搜索"""
+        # _ime_composition 是 Kivy TextInput 的內部屬性，不存在時視為沒有組字
+        if getattr(self.search_input, "_ime_composition", ""):
+            return
         if self.search_callback:
-            self.search_callback(value)
+            self.search_callback(self.search_input.text)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.anchorlayout import AnchorLayout
+from kivy.metrics import dp
+
+from components.labels import BaseLabel, WordLabel, ExplanationLabel
+
+class SuggestionItem(BoxLayout):
+    """模糊搜索建議項：唯讀顯示相近的單字、解釋與來源"""
+    def __init__(self, word, explanation, source="words", rank=None, **kwargs):
+        """
+        初始化建議項
+        Args:
+            word: 日語單字
+            explanation: 單字解釋
+            source: 來源集合（"words" 為單字本，"tests" 為測驗單字）
+            rank: 測驗單字的級別（如 N5）
+        """
+        super().__init__(**kwargs)
+        self.orientation = "horizontal"  # 水平佈局
+        self.spacing = dp(5)            # 元素間距
+        self.padding = [dp(10), dp(5)]  # 內邊距 [左右, 上下]
+        self.size_hint_y = None         # 固定高度
+        self.height = dp(80)            # 與單字列表項同高
+
+        self.word = word
+        self.explanation = explanation
+
+        # 左側顯示單字
+        word_anchor = AnchorLayout(
+            anchor_x="center",
+            anchor_y="center",
+            size_hint_x=0.3,
+            padding=[dp(-20), 0, dp(20), 0]
+        )
+        word_anchor.add_widget(WordLabel(text=str(word)))
+        self.add_widget(word_anchor)
+
+        # 中間顯示解釋
+        explanation_layout = BoxLayout(size_hint_x=0.55, padding=[dp(60), 0, 0, 0])
+        explanation_layout.add_widget(ExplanationLabel(text=str(explanation)))
+        self.add_widget(explanation_layout)
+
+        # 右側顯示來源
+        self.add_widget(BaseLabel(
+            text=(rank or "測驗") if source == "tests" else "單字本",
+            font_size=dp(16),
+            color=(0.6, 0.6, 0.6, 1),  # 灰色文字
+            size_hint_x=0.15
+        ))
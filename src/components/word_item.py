@@ -11,16 +11,21 @@ from ui.word_popup import WordPopup
 class WordItem(BoxLayout):
     """單字列表項：顯示單個單字的詳細信息和操作按鈕"""
     def __init__(
-        self, word, explanation, delete_callback, edit_callback, word_id, **kwargs
+        self, word, explanation, delete_callback, edit_callback, word_id,
+        truncated=False, load_callback=None, readonly=False, pending=False, **kwargs
     ):
         """
         初始化單字項
         Args:
             word: 日語單字
-            explanation: 單字解釋
+            explanation: 單字解釋（列表中可能只是開頭部分）
             delete_callback: 刪除回調函數
             edit_callback: 編輯回調函數
             word_id: 單字ID
+            truncated: 解釋是否已截斷
+            load_callback: 讀取完整單字的函數，參數為 (單字ID, 完成回調)
+            readonly: 是否只讀（不顯示編輯和刪除按鈕，例如瀏覽測驗單字）
+            pending: 是否暫存在離線日誌、尚未寫入數據庫（解釋後標示待同步）
         """
         super().__init__(**kwargs)
         self.orientation = "horizontal"  # 水平佈局
@@ -35,6 +40,11 @@ class WordItem(BoxLayout):
         self.delete_callback = delete_callback
         self.edit_callback = edit_callback
         self.word_id = word_id
+        self.truncated = truncated
+        self.load_callback = load_callback
+        self.readonly = readonly
+        self.pending = pending
+        self._previous = None  # 上次編輯前的 (單字, 解釋, 是否截斷)，寫入失敗時恢復
 
         # 創建UI組件
         self._create_word_section()          # 創建單字顯示區域
@@ -78,7 +88,7 @@ class WordItem(BoxLayout):
         )
         # 創建滾動視圖，使長文本可以滾動顯示
         explanation_scroll = ScrollView(size_hint=(1, None), height=dp(70))
-        self.explanation_label = ExplanationLabel(text=str(self.explanation))
+        self.explanation_label = ExplanationLabel(text=self._explanation_text())
         explanation_scroll.add_widget(self.explanation_label)
         explanation_layout.add_widget(explanation_scroll)
         return explanation_layout
@@ -92,6 +102,10 @@ class WordItem(BoxLayout):
             spacing=dp(5)   # 按鈕間距
         )
 
+        # 只讀時保留空白的按鈕區域，使解釋欄位與可編輯的列表對齊
+        if self.readonly:
+            return button_container
+
         # 添加編輯和刪除按鈕
         edit_button = EditButton(callback=self.edit_word)
         delete_button = DeleteButton(callback=self.delete_word)
@@ -105,8 +119,29 @@ class WordItem(BoxLayout):
         """刪除單字：調用刪除回調函數"""
         self.delete_callback(self)
 
+    def _explanation_text(self):
+        """列表顯示的解釋：截斷時加上省略號，尚未寫入數據庫時標示待同步"""
+        text = str(self.explanation) + ("…" if self.truncated else "")
+        return text + ("（待同步）" if self.pending else "")
+
     def edit_word(self, instance):
-        """編輯單字：打開編輯彈窗"""
+        """編輯單字：解釋已截斷時先讀取完整內容，再打開編輯彈窗"""
+        if self.truncated and self.load_callback:
+            self.load_callback(self.word_id, self._on_full_word_loaded)
+            return
+        self._open_edit_popup()
+
+    def _on_full_word_loaded(self, doc):
+        """完整單字讀取完成：更新解釋後打開編輯彈窗（單字已不存在時不打開）"""
+        if doc is None:
+            return
+        self.explanation = doc.get("explanation", "")
+        self.truncated = False
+        self.explanation_label.text = self._explanation_text()
+        self._open_edit_popup()
+
+    def _open_edit_popup(self):
+        """打開編輯彈窗"""
         popup = WordPopup(
             mode="edit",
             japanese=str(self.word),
@@ -124,8 +159,27 @@ class WordItem(BoxLayout):
             new_word: 新的日語單字
             new_explanation: 新的解釋文本
         """
+        self._previous = (self.word, self.explanation, self.truncated)
         self.word = new_word
         self.explanation = new_explanation
-        self.word_label.text = str(new_word)
-        self.explanation_label.text = str(new_explanation)
-        self.edit_callback(self, new_word, new_explanation)
\ No newline at end of file
+        self.truncated = False
+        self._refresh_labels()
+        self.edit_callback(self, new_word, new_explanation)
+
+    @property
+    def edit_changed(self):
+        """上次編輯是否改變了內容"""
+        return self._previous is not None and self._previous[:2] != (self.word, self.explanation)
+
+    def revert_edit(self):
+        """撤銷上次編輯在界面上的修改（數據庫寫入失敗時調用）"""
+        if self._previous is None:
+            return
+        self.word, self.explanation, self.truncated = self._previous
+        self._previous = None
+        self._refresh_labels()
+
+    def _refresh_labels(self):
+        """按目前的單字與解釋更新顯示"""
+        self.word_label.text = str(self.word)
+        self.explanation_label.text = self._explanation_text()
\ No newline at end of file
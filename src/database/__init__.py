@@ -1,5 +1,31 @@
-from .mongodb import words_collection
+from .mongodb import db_manager, get_words_collection
+from .pagination import KeysetPaginator, find_page
+from .crud import WordCRUD, TestCRUD, TEST_RANKS, words_page_cache
+from .page_cache import PageCache
+from .storage import StorageBackend, get_storage, storage_breaker
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .rows import WordRow
+from .write_journal import WriteJournal
+from .review import ReviewScheduler
+from .quiz import QuizGenerator
 
 __all__ = [
-    'words_collection',
+    'db_manager',
+    'get_words_collection',
+    'KeysetPaginator',
+    'find_page',
+    'WordCRUD',
+    'TestCRUD',
+    'TEST_RANKS',
+    'words_page_cache',
+    'PageCache',
+    'StorageBackend',
+    'get_storage',
+    'storage_breaker',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'WordRow',
+    'WriteJournal',
+    'ReviewScheduler',
+    'QuizGenerator',
 ]
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+from typing import List, Dict, Any, Iterable, Sequence
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+# 每批寫入的文檔數量
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _batches(items: Sequence[Any], batch_size: int) -> Iterable[tuple]:
+    """按批次切分列表，返回 (起始位置, 批次內容)"""
+    for start in range(0, len(items), batch_size):
+        yield start, items[start:start + batch_size]
+
+
+def _collect_errors(error: BulkWriteError, offset: int,
+                    docs: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    將 BulkWriteError 轉為逐行錯誤列表
+
+    Args:
+        error: 批量寫入錯誤
+        offset: 本批次在原始輸入中的起始位置
+        docs: 本批次的文檔
+
+    Returns:
+        List[Dict]: [{"index", "japanese", "code", "message"}]，index 為原始輸入中的位置
+    """
+    errors = []
+    for write_error in error.details.get("writeErrors", []):
+        index = write_error["index"]
+        errors.append({
+            "index": offset + index,
+            "japanese": docs[index].get("japanese"),
+            "code": write_error.get("code"),
+            "message": write_error.get("errmsg", ""),
+        })
+    return errors
+
+
+def insert_many_batched(collection, docs: Sequence[Dict[str, Any]],
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    分批無序插入文檔，單行失敗不影響同批其他文檔
+
+    Args:
+        collection: 集合實例
+        docs: 要插入的文檔
+        batch_size: 每批數量
+
+    Returns:
+        Dict: {"inserted_ids": [...], "errors": [...]}
+    """
+    docs = [dict(doc) for doc in docs]  # insert_many 會寫入 _id，避免修改呼叫方的資料
+    report = {"inserted_ids": [], "errors": []}
+    for offset, batch in _batches(docs, batch_size):
+        try:
+            collection.insert_many(batch, ordered=False)
+            report["inserted_ids"].extend(doc["_id"] for doc in batch)
+        except BulkWriteError as e:
+            errors = _collect_errors(e, offset, batch)
+            failed = {error["index"] - offset for error in errors}
+            report["inserted_ids"].extend(
+                doc["_id"] for i, doc in enumerate(batch) if i not in failed
+            )
+            report["errors"].extend(errors)
+    return report
+
+
+def upsert_many_batched(collection, docs: Sequence[Dict[str, Any]], keys: Sequence[str],
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    分批無序 upsert：按 keys 匹配已有文檔並更新，不存在則插入
+
+    Args:
+        collection: 集合實例
+        docs: 要寫入的文檔
+        keys: 用於匹配的字段
+        batch_size: 每批數量
+
+    Returns:
+        Dict: {"upserted": 新插入數, "modified": 更新數, "errors": [...]}
+    """
+    report = {"upserted": 0, "modified": 0, "errors": []}
+    for offset, batch in _batches(list(docs), batch_size):
+        requests = [
+            UpdateOne({key: doc[key] for key in keys}, {"$set": doc}, upsert=True)
+            for doc in batch
+        ]
+        try:
+            result = collection.bulk_write(requests, ordered=False)
+            report["upserted"] += result.upserted_count
+            report["modified"] += result.modified_count
+        except BulkWriteError as e:
+            report["upserted"] += e.details.get("nUpserted", 0)
+            report["modified"] += e.details.get("nModified", 0)
+            report["errors"].extend(_collect_errors(e, offset, batch))
+    return report
+
+
+def delete_many_batched(collection, ids: Sequence[Any],
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    分批按 _id 刪除文檔
+
+    Args:
+        collection: 集合實例
+        ids: 要刪除的 _id
+        batch_size: 每批數量
+
+    Returns:
+        int: 刪除的數量
+    """
+    deleted = 0
+    for _, batch in _batches(list(ids), batch_size):
+        deleted += collection.delete_many({"_id": {"$in": batch}}).deleted_count
+    return deleted
+
+
+def bulk_write_ordered(collection, requests: Sequence[Any]) -> Dict[str, Any]:
+    """
+    按順序執行寫入請求：某個請求失敗時記錄並從下一個請求繼續
+
+    沒有失敗時只需一次 bulk_write；每個失敗的請求多一次往返。
+
+    Args:
+        collection: 集合實例
+        requests: InsertOne / UpdateOne / DeleteOne 等寫入請求
+
+    Returns:
+        Dict: {"applied": 成功數, "matched": 更新匹配數, "errors": [...]}，
+              errors 為 [{"index", "code", "message", "key"}]，index 為請求在輸入中的位置，
+              key 為違反唯一索引時的索引鍵
+    """
+    requests = list(requests)
+    report = {"applied": 0, "matched": 0, "errors": []}
+    start = 0
+    while start < len(requests):
+        try:
+            result = collection.bulk_write(requests[start:], ordered=True)
+            report["applied"] += len(requests) - start
+            report["matched"] += result.matched_count
+            break
+        except BulkWriteError as e:
+            # 有序寫入在第一個錯誤處停止，之前的請求都已生效
+            write_error = e.details["writeErrors"][0]
+            report["applied"] += write_error["index"]
+            report["matched"] += e.details.get("nMatched", 0)
+            index = start + write_error["index"]
+            report["errors"].append({
+                "index": index,
+                "code": write_error.get("code"),
+                "message": write_error.get("errmsg", ""),
+                "key": write_error.get("keyPattern"),
+            })
+            start = index + 1
+    return report
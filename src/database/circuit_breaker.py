@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+from typing import Optional, Callable, List, Tuple, Type
+
+from pymongo.errors import ConnectionFailure
+
+# 斷路器狀態
+CLOSED = "closed"  # 正常：調用直接執行
+OPEN = "open"      # 斷開：調用立即失敗，背景探測恢復
+
+# 視為連接失敗的異常（ServerSelectionTimeoutError、AutoReconnect 都是 ConnectionFailure）
+CONNECTION_ERRORS: Tuple[Type[BaseException], ...] = (ConnectionFailure, ConnectionError)
+
+# 連續失敗多少次後斷開：每次失敗都已等待過伺服器選擇逾時，不必多次確認
+DEFAULT_FAILURE_THRESHOLD = 2
+
+# 背景探測的間隔（秒）：從 DEFAULT_PROBE_DELAY 開始每次加倍，最多 DEFAULT_MAX_PROBE_DELAY
+DEFAULT_PROBE_DELAY = 1.0
+DEFAULT_MAX_PROBE_DELAY = 30.0
+
+
+class CircuitOpenError(ConnectionError):
+    """斷路器斷開中，調用未執行"""
+    pass
+
+
+class CircuitBreaker:
+    """
+    斷路器：連續連接失敗後斷開，斷開期間調用立即失敗，不再每次等待連接逾時
+
+    斷開後在背景線程按指數退避執行探測，探測成功即自動閉合並通知監聽者。
+    """
+
+    def __init__(self, probe: Optional[Callable[[], bool]] = None,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 probe_delay: float = DEFAULT_PROBE_DELAY,
+                 max_probe_delay: float = DEFAULT_MAX_PROBE_DELAY,
+                 errors: Tuple[Type[BaseException], ...] = CONNECTION_ERRORS):
+        """
+        初始化斷路器
+
+        Args:
+            probe: 探測函數，返回 True 表示服務已恢復（拋出異常視為未恢復）
+            failure_threshold: 連續失敗多少次後斷開
+            probe_delay: 第一次探測前的等待秒數
+            max_probe_delay: 探測間隔上限
+            errors: 計為失敗的異常類型，其他異常不影響斷路器
+        """
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.probe_delay = probe_delay
+        self.max_probe_delay = max_probe_delay
+        self.errors = errors
+        self.state = CLOSED
+        self.failures = 0   # 連續失敗次數
+        self.rejected = 0   # 斷開期間被拒絕的調用數
+        self._listeners: List[Callable[[str], None]] = []
+        self._probe_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def add_listener(self, listener: Callable[[str], None]):
+        """
+        註冊狀態變化的監聽者
+
+        Args:
+            listener: 參數為新狀態（CLOSED 或 OPEN），在觸發變化的線程上調用
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def call(self, func: Callable, *args, **kwargs):
+        """
+        經由斷路器執行調用
+
+        Raises:
+            CircuitOpenError: 斷路器斷開中
+        """
+        if self.state == OPEN:
+            with self._lock:
+                self.rejected += 1
+            raise CircuitOpenError("數據庫暫時無法連接，正在背景重試")
+        try:
+            result = func(*args, **kwargs)
+        except self.errors:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def record_success(self):
+        """記錄成功：清除連續失敗次數"""
+        self.failures = 0
+
+    def record_failure(self):
+        """記錄一次連接失敗，達到門檻時斷開並開始背景探測"""
+        with self._lock:
+            self.failures += 1
+            if self.state == OPEN or self.failures < self.failure_threshold:
+                return
+            self.state = OPEN
+            self._start_probe_locked()
+        logging.warning(f"連續 {self.failures} 次連接失敗，斷路器斷開")
+        self._notify(OPEN)
+
+    def _start_probe_locked(self):
+        # 探測線程只在持有鎖時決定退出並清除 _probe_thread，因此不為 None 時必定會繼續探測
+        if self.probe is None or self._probe_thread is not None:
+            return
+        self._stop.clear()
+        self._probe_thread = threading.Thread(
+            target=self._probe_loop, name="circuit-probe", daemon=True
+        )
+        self._probe_thread.start()
+
+    def _probe_loop(self):
+        """
+        背景探測：按指數退避重試，成功時閉合
+
+        閉合時的監聽者在本線程執行（例如重放離線日誌），期間連接再次失敗而斷開時，
+        本線程繼續探測，不會留下沒有探測的斷開狀態。
+        """
+        delay = self.probe_delay
+        while True:
+            if not self._stop.wait(delay):
+                try:
+                    recovered = self.probe()
+                except Exception as e:
+                    logging.debug(f"探測失敗: {e}")
+                    recovered = False
+                if not recovered:
+                    delay = min(delay * 2, self.max_probe_delay)
+                    continue
+                self.close()
+            with self._lock:
+                if self.state != OPEN:
+                    self._probe_thread = None
+                    return
+                self._stop.clear()
+            delay = self.probe_delay
+
+    def close(self):
+        """閉合斷路器（探測成功或手動重置）"""
+        with self._lock:
+            was_open = self.state == OPEN
+            self.state = CLOSED
+            self.failures = 0
+            self._stop.set()
+        if was_open:
+            logging.info("數據庫已恢復連接，斷路器閉合")
+            self._notify(CLOSED)
+
+    def _notify(self, state: str):
+        for listener in list(self._listeners):
+            try:
+                listener(state)
+            except Exception as e:
+                logging.error(f"斷路器監聽者錯誤: {e}")
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from typing import Optional
+
+# 計數快取的預設有效時間（秒），過期後重新向數據庫取得總數
+DEFAULT_COUNT_TTL = 60
+
+
+class CountCache:
+    """文檔總數快取：本地寫入時增量調整，過期後以估算計數校正"""
+
+    def __init__(self, counter, ttl: float = DEFAULT_COUNT_TTL, exact: bool = False):
+        """
+        初始化計數快取
+
+        Args:
+            counter: 計數函數，參數 exact 表示是否精確計數（數據庫連接是延遲建立的）
+            ttl: 快取有效時間（秒）
+            exact: 校正時是否使用 count_documents 精確計數
+        """
+        self.counter = counter
+        self.ttl = ttl
+        self.exact = exact
+        self._count: Optional[int] = None
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> int:
+        """獲取總數：快取有效時不訪問數據庫"""
+        with self._lock:
+            if self._count is None or time.monotonic() - self._refreshed_at > self.ttl:
+                self._refresh_locked()
+            return self._count
+
+    def refresh(self) -> int:
+        """立即向數據庫重新取得總數"""
+        with self._lock:
+            self._refresh_locked()
+            return self._count
+
+    def _refresh_locked(self):
+        self._count = self.counter(self.exact)
+        self._refreshed_at = time.monotonic()
+
+    def adjust(self, delta: int):
+        """按本地寫入調整總數（尚未載入時不處理，下次讀取會直接查詢）"""
+        with self._lock:
+            if self._count is not None:
+                self._count = max(0, self._count + delta)
+
+    def invalidate(self):
+        """使快取失效，下次讀取時重新查詢"""
+        with self._lock:
+            self._count = None
@@ -1,14 +1,52 @@
 # -*- coding: utf-8 -*-
-from typing import Optional, List, Dict, Any
-from bson import ObjectId
+from typing import Optional, List, Dict, Any, Callable, Tuple
 import logging
-from .mongodb import words_collection
+import threading
+from .storage import get_storage, storage_breaker, STORAGE_CONFIG, DUPLICATE_ERRORS
+from .circuit_breaker import CLOSED, CONNECTION_ERRORS
+from .write_journal import WriteJournal, INSERT, UPDATE, DELETE, UPSERT
+from .bulk import DEFAULT_BATCH_SIZE
+from . import transfer
+from .count_cache import CountCache
+from .page_cache import PageCache
+from .distractor_pool import DistractorPool
+from .fuzzy import FuzzyIndex, DEFAULT_MAX_DISTANCE
+from .rows import WordRow
+from .validators import TESTS_VALIDATOR
+
+# 單字總數快取：經由 WordCRUD 的寫入會即時調整
+words_count = CountCache(lambda exact: get_storage().count_words(exact))
+
+# 單字頁面快取：經由 WordCRUD 的寫入會精確失效受影響的頁
+words_page_cache = PageCache()
+
+
+def _fuzzy_entries():
+    """模糊索引的資料來源：words 與 tests 集合的全部單字"""
+    storage = get_storage()
+    for source, docs in (("words", storage.iter_words()), ("tests", storage.iter_test_words())):
+        for doc in docs:
+            yield (source, doc["_id"]), doc["japanese"], {**doc, "source": source}
+
+# 「我的」單字測驗的干擾項池（見 quiz 模組）：經由 WordCRUD 的寫入會同步修改或移除
+words_distractor_pool = DistractorPool()
+
+# 單字模糊索引：首次模糊搜索時載入，經由 WordCRUD 的寫入會同步更新
+words_fuzzy_index = FuzzyIndex(_fuzzy_entries)
+
+# 搜索匹配數的計數上限：寬泛的關鍵詞（如「の」）不必數完全部匹配
+SEARCH_COUNT_CAP = 1000
+
+# 離線寫入日誌：數據庫無法連接時暫存新增、修改、刪除，恢復連接後按順序重放
+write_journal = WriteJournal(STORAGE_CONFIG["JOURNAL_PATH"])
+_journal_lock = threading.Lock()  # 寫入與重放互斥，保證日誌中的操作先於之後的寫入生效
+journal_conflicts: List[Dict[str, Any]] = []  # 重放時無法套用的操作，由界面取走並提示
 
 class WordCRUD:
-    """單字 CRUD 操作類"""
+    """單字 CRUD 操作類：按配置委派給 MongoDB 或 SQLite 存儲後端"""
     
     @staticmethod
-    def create_word(japanese: str, explanation: str) -> Optional[ObjectId]:
+    def create_word(japanese: str, explanation: str) -> Optional[Any]:
         """
         創建新單字
         
@@ -17,63 +55,329 @@ class WordCRUD:
             explanation: 解釋
             
         Returns:
-            ObjectId: 新創建單字的 ID
+            Any: 新創建單字的 ID（MongoDB 為 ObjectId，SQLite 為整數）；
+                 暫存到離線日誌時為預先分配的 ID，重放時單字已存在則記為衝突
+
+        Raises:
+            DUPLICATE_ERRORS: 同一日文已存在（交由調用方提示，不覆蓋原有解釋）
         """
         try:
-            result = words_collection.insert_one({
-                "japanese": japanese,
-                "explanation": explanation
-            })
-            return result.inserted_id
+            word_id, op = WordCRUD._write(
+                lambda: get_storage().insert_word(japanese, explanation),
+                lambda: {"op": INSERT, "_id": get_storage().backend.new_word_id(),
+                         "japanese": japanese, "explanation": explanation},
+            )
+            if op is not None:
+                word_id = op["_id"]
+            words_count.adjust(1)
+            words_page_cache.on_insert(word_id)
+            WordCRUD._index_word(word_id, japanese, explanation)
+            return word_id
+        except DUPLICATE_ERRORS:
+            raise
         except Exception as e:
             logging.error(f"創建單字失敗: {e}")
             return None
 
     @staticmethod
-    def get_words(skip: int = 0, limit: int = 5, sort_by: str = "_id", 
-                  sort_order: int = -1) -> List[Dict[str, Any]]:
+    def upsert_word(japanese: str, explanation: str) -> Optional[Tuple[Any, bool]]:
+        """
+        寫入單字：同一日文已存在時更新解釋，重複提交不會產生重複單字
+
+        Args:
+            japanese: 日文單字
+            explanation: 單字解釋
+
+        Returns:
+            Optional[Tuple]: (單字 ID, 是否新插入)，失敗時返回 None；
+                             暫存到離線日誌時為 (None, None)，是否新插入要等重放後才知道
+        """
+        try:
+            result, op = WordCRUD._write(
+                lambda: get_storage().upsert_word(japanese, explanation),
+                lambda: {"op": UPSERT, "japanese": japanese, "explanation": explanation},
+            )
+            if op is not None:
+                # 總數與頁面快取在重放後整體重新載入
+                return None, None
+            word_id, created = result
+            if created:
+                words_count.adjust(1)
+                words_page_cache.on_insert(word_id)
+            else:
+                words_page_cache.on_update(word_id)
+                words_distractor_pool.on_update(word_id, explanation)
+            WordCRUD._index_word(word_id, japanese, explanation)
+            return word_id, created
+        except Exception as e:
+            logging.error(f"寫入單字失敗: {e}")
+            return None
+
+    @staticmethod
+    def create_words(words: List[Dict[str, str]],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        批量創建單字
+
+        Args:
+            words: 單字列表，每項包含 japanese 和 explanation
+            batch_size: 每批寫入數量
+
+        Returns:
+            Dict: {"inserted_ids": [...], "errors": [...]}，errors 記錄被驗證規則拒絕的行
+        """
+        try:
+            report = get_storage().insert_words(words, batch_size)
+            words_count.adjust(len(report["inserted_ids"]))
+            words_page_cache.clear()
+            words_distractor_pool.clear()
+            words_fuzzy_index.invalidate()
+            return report
+        except Exception as e:
+            logging.error(f"批量創建單字失敗: {e}")
+            return {"inserted_ids": [], "errors": []}
+
+    @staticmethod
+    def upsert_words(words: List[Dict[str, str]],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        批量寫入單字：以 japanese 匹配，已存在則更新解釋
+
+        Args:
+            words: 單字列表，每項包含 japanese 和 explanation
+            batch_size: 每批寫入數量
+
+        Returns:
+            Dict: {"upserted": 新插入數, "modified": 更新數, "errors": [...]}
+        """
+        try:
+            report = get_storage().upsert_words(words, batch_size)
+            words_count.adjust(report["upserted"])
+            words_page_cache.clear()
+            words_distractor_pool.clear()
+            words_fuzzy_index.invalidate()
+            return report
+        except Exception as e:
+            logging.error(f"批量寫入單字失敗: {e}")
+            return {"upserted": 0, "modified": 0, "errors": []}
+
+    @staticmethod
+    def delete_words(word_ids: List[Any],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        批量刪除單字
+
+        Args:
+            word_ids: 單字 ID 列表
+            batch_size: 每批刪除數量
+
+        Returns:
+            int: 刪除的數量
+        """
+        try:
+            deleted = get_storage().delete_words(word_ids, batch_size)
+            words_count.adjust(-deleted)
+            words_page_cache.clear()
+            words_distractor_pool.clear()
+            words_fuzzy_index.invalidate()
+            return deleted
+        except Exception as e:
+            logging.error(f"批量刪除單字失敗: {e}")
+            return 0
+
+    @staticmethod
+    def export_words(path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                     progress: Optional[Callable[[int], None]] = None) -> Optional[int]:
+        """
+        將全部單字匯出到 JSONL 或 CSV 文件（.gz 結尾時壓縮），按批從數據庫游標讀取
+
+        Args:
+            path: 目標文件路徑
+            batch_size: 每批從數據庫讀取的數量
+            progress: 進度回調，參數為已匯出的數量
+
+        Returns:
+            Optional[int]: 匯出的數量，失敗時返回 None
+        """
+        try:
+            return transfer.export_words(path, get_storage().iter_words(batch_size), progress, batch_size)
+        except Exception as e:
+            logging.error(f"匯出單字失敗: {e}")
+            return None
+
+    @staticmethod
+    def import_words(path: str, upsert: bool = False, offset: int = 0,
+                     batch_size: int = DEFAULT_BATCH_SIZE,
+                     progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """
+        從 JSONL 或 CSV 文件分批匯入單字
+
+        Args:
+            path: 文件路徑
+            upsert: 是否以 japanese 匹配已有單字並更新（重複匯入不會產生重複單字）
+            offset: 跳過文件中的前幾筆（從上次中斷處繼續）
+            batch_size: 每批寫入數量
+            progress: 進度回調，參數為 (已處理到的位置, 已寫入數)
+
+        Returns:
+            Dict: {"offset": 已處理到的位置, "written": 寫入數, "errors": [...], "error": 中斷原因}，
+                  中斷時以 offset 再次調用即可繼續
+        """
+        write = get_storage().upsert_words if upsert else get_storage().insert_words
+        report = {"offset": offset, "written": 0, "errors": [], "error": None}
+        try:
+            for start, batch in transfer.read_batches(path, batch_size, offset):
+                result = write(batch, batch_size)
+                if upsert:
+                    report["written"] += result["upserted"] + result["modified"]
+                    words_count.adjust(result["upserted"])
+                else:
+                    report["written"] += len(result["inserted_ids"])
+                    words_count.adjust(len(result["inserted_ids"]))
+                for error in result["errors"]:
+                    report["errors"].append({**error, "index": start + error["index"]})
+                report["offset"] = start + len(batch)
+                if progress:
+                    progress(report["offset"], report["written"])
+        except Exception as e:
+            logging.error(f"匯入單字失敗（可從第 {report['offset']} 筆繼續）: {e}")
+            report["error"] = str(e)
+        if report["written"]:
+            words_page_cache.clear()
+            words_distractor_pool.clear()
+            words_fuzzy_index.invalidate()
+        return report
+
+    @staticmethod
+    def get_words(skip: int = 0, limit: int = 5, sort_by: str = "_id",
+                  sort_order: int = -1, anchor: Any = None,
+                  backward: bool = False) -> List[WordRow]:
         """
         獲取單字列表
-        
+
         Args:
-            skip: 跳過的數量
+            skip: 跳過的數量（提供 anchor 時忽略）
             limit: 返回的數量
             sort_by: 排序字段
             sort_order: 排序方向 (1: 升序, -1: 降序)
-            
+            anchor: 分頁邊界鍵，提供時使用 keyset 分頁
+            backward: 是否取邊界之前的一頁
+
         Returns:
-            List[Dict]: 單字列表
+            List[WordRow]: 單字列表（解釋為預覽，完整內容見 get_word）
         """
         try:
-            return list(words_collection.find()
-                       .sort([(sort_by, sort_order)])
-                       .skip(skip)
-                       .limit(limit))
+            params = {"limit": limit, "sort_by": sort_by, "sort_order": sort_order,
+                      "skip": skip, "anchor": anchor, "backward": backward}
+            return words_page_cache.get_or_load(
+                PageCache.make_key(params), lambda: get_storage().find_words(**params)
+            )
         except Exception as e:
             logging.error(f"獲取單字列表失敗: {e}")
             return []
 
     @staticmethod
-    def search_words(search_term: str) -> List[Dict[str, Any]]:
+    def get_word(word_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        讀取單字的完整內容（列表中的解釋可能已截斷）
+
+        Args:
+            word_id: 單字 ID
+
+        Returns:
+            Dict: 單字文檔，不存在或失敗時返回 None
+        """
+        try:
+            return get_storage().get_word(word_id)
+        except Exception as e:
+            logging.error(f"讀取單字失敗: {e}")
+            return None
+
+    @staticmethod
+    def search_words(search_term: str, limit: Optional[int] = None,
+                     sort_by: str = "_id", sort_order: int = -1, skip: int = 0,
+                     anchor: Any = None, backward: bool = False,
+                     field: str = "japanese") -> List[WordRow]:
         """
-        搜索單字
+        搜索單字（在數據庫端分頁）
         
         Args:
             search_term: 搜索關鍵詞
+            limit: 返回的數量，None 表示返回全部匹配
+            sort_by: 排序字段
+            sort_order: 排序方向 (1: 升序, -1: 降序)
+            skip: 跳過的數量（提供 anchor 時忽略）
+            anchor: 分頁邊界鍵，提供時使用 keyset 分頁
+            backward: 是否取邊界之前的一頁
+            field: 搜索範圍（"japanese"、"explanation" 或 "all"），
+                   後兩者可用 sort_by="relevance" 按相關度排序
             
         Returns:
-            List[Dict]: 搜索結果
+            List[WordRow]: 搜索結果（解釋為預覽）
         """
         try:
-            return list(words_collection.find(
-                {"japanese": {"$regex": search_term, "$options": "i"}}
-            ))
+            params = {"limit": limit, "sort_by": sort_by, "sort_order": sort_order,
+                      "skip": skip, "anchor": anchor, "backward": backward, "field": field}
+            return words_page_cache.get_or_load(
+                PageCache.make_key(params, search_term),
+                lambda: get_storage().search_words(search_term, **params),
+            )
         except Exception as e:
             logging.error(f"搜索單字失敗: {e}")
             return []
 
     @staticmethod
-    def update_word(word_id: ObjectId, japanese: str, 
+    def count_search(search_term: str, cap: Optional[int] = SEARCH_COUNT_CAP,
+                     field: str = "japanese") -> int:
+        """
+        計算搜索匹配數（寬泛的關鍵詞只數到上限為止）
+        
+        Args:
+            search_term: 搜索關鍵詞
+            cap: 計數上限，None 表示精確計數
+            field: 搜索範圍（"japanese"、"explanation" 或 "all"）
+            
+        Returns:
+            int: 匹配數，等於 cap 時表示可能還有更多
+        """
+        try:
+            return get_storage().count_matches(search_term, cap, field)
+        except Exception as e:
+            logging.error(f"計算搜索匹配數失敗: {e}")
+            return 0
+
+    @staticmethod
+    def fuzzy_search(search_term: str, max_distance: int = DEFAULT_MAX_DISTANCE,
+                     limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        模糊搜索：容許打錯字（っ/つ、漏打ー、濁點錯誤等），按編輯距離排序
+        
+        Args:
+            search_term: 搜索關鍵詞（平假名、片假名或羅馬字）
+            max_distance: 最大編輯距離
+            limit: 最多返回的數量
+            
+        Returns:
+            List[Dict]: 建議的單字，包含 source（"words" 或 "tests"）與 distance
+        """
+        try:
+            return [
+                {**doc, "distance": distance}
+                for distance, doc in words_fuzzy_index.lookup(search_term, max_distance, limit)
+            ]
+        except Exception as e:
+            logging.error(f"模糊搜索失敗: {e}")
+            return []
+
+    @staticmethod
+    def _index_word(word_id: Any, japanese: str, explanation: str):
+        """新增或修改單字後同步模糊索引"""
+        words_fuzzy_index.add(("words", word_id), japanese, {
+            "_id": word_id, "japanese": japanese, "explanation": explanation, "source": "words"
+        })
+
+    @staticmethod
+    def update_word(word_id: Any, japanese: str, 
                    explanation: str) -> bool:
         """
         更新單字
@@ -85,22 +389,29 @@ class WordCRUD:
             
         Returns:
             bool: 是否更新成功
+
+        Raises:
+            DUPLICATE_ERRORS: 改名為已存在的日文（交由調用方撤銷界面上的修改並提示）
         """
         try:
-            result = words_collection.update_one(
-                {"_id": word_id},
-                {"$set": {
-                    "japanese": japanese,
-                    "explanation": explanation
-                }}
+            modified, op = WordCRUD._write(
+                lambda: get_storage().update_word(word_id, japanese, explanation),
+                lambda: {"op": UPDATE, "_id": word_id,
+                         "japanese": japanese, "explanation": explanation},
             )
-            return result.modified_count > 0
+            modified = modified or op is not None
+            words_page_cache.on_update(word_id)
+            words_distractor_pool.on_update(word_id, explanation)
+            WordCRUD._index_word(word_id, japanese, explanation)
+            return modified
+        except DUPLICATE_ERRORS:
+            raise
         except Exception as e:
             logging.error(f"更新單字失敗: {e}")
             return False
 
     @staticmethod
-    def delete_word(word_id: ObjectId) -> bool:
+    def delete_word(word_id: Any) -> bool:
         """
         刪除單字
         
@@ -111,22 +422,212 @@ class WordCRUD:
             bool: 是否刪除成功
         """
         try:
-            result = words_collection.delete_one({"_id": word_id})
-            return result.deleted_count > 0
+            deleted, op = WordCRUD._write(
+                lambda: get_storage().delete_word(word_id),
+                lambda: {"op": DELETE, "_id": word_id},
+            )
+            deleted = deleted or op is not None
+            words_count.adjust(-int(deleted))
+            words_page_cache.on_delete(word_id)
+            words_distractor_pool.on_delete(word_id)
+            words_fuzzy_index.remove(("words", word_id))
+            return deleted
         except Exception as e:
             logging.error(f"刪除單字失敗: {e}")
             return False
 
     @staticmethod
-    def get_total_count() -> int:
+    def _write(write: Callable[[], Any],
+               make_op: Callable[[], Dict[str, Any]]) -> Tuple[Any, Optional[Dict[str, Any]]]:
         """
-        獲取單字總數
+        執行單筆寫入：數據庫無法連接，或日誌中還有未重放的操作時，改為寫入日誌
+        （存儲後端不支持離線寫入時直接寫入，不使用日誌）
+
+        Args:
+            write: 直接寫入數據庫的函數
+            make_op: 建立日誌操作的函數
+
+        Returns:
+            Tuple: (write 的返回值, None) 或 (None, 寫入日誌的操作)
+        """
+        if not WordCRUD._journaling():
+            return write(), None
+        with _journal_lock:
+            if not len(write_journal):
+                try:
+                    return write(), None
+                except CONNECTION_ERRORS as e:
+                    logging.warning(f"數據庫無法連接，寫入離線日誌: {e}")
+            op = make_op()
+            write_journal.append(op)
+        if not storage_breaker.is_open:
+            # 斷路器未斷開時不會收到恢復通知，直接在背景嘗試重放
+            threading.Thread(target=WordCRUD.replay_journal, name="journal-replay",
+                             daemon=True).start()
+        return None, op
+
+    @staticmethod
+    def _journaling() -> bool:
+        """目前的存儲後端是否使用離線日誌"""
+        return get_storage().backend.supports_offline_writes
+
+    @staticmethod
+    def pending_writes() -> int:
+        """離線日誌中等待重放的寫入數（存儲後端不支持離線寫入時為 0）"""
+        try:
+            if not WordCRUD._journaling():
+                return 0
+            return len(write_journal)
+        except Exception as e:
+            logging.error(f"讀取離線日誌失敗: {e}")
+            return 0
+
+    @staticmethod
+    def replay_journal(batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        按順序重放離線日誌：每批一次有序 bulk_write，成功後從日誌刪除
+
+        Args:
+            batch_size: 每批重放的操作數
+
+        Returns:
+            Dict: {"replayed": 已重放數, "conflicts": [{"op", "reason"}]}，
+                  衝突同時加入 journal_conflicts 供界面提示
+        """
+        report = {"replayed": 0, "conflicts": []}
+        if not WordCRUD.pending_writes():
+            return report
+        with _journal_lock:
+            try:
+                while True:
+                    entries = write_journal.peek(batch_size)
+                    if not entries:
+                        break
+                    result = get_storage().apply_writes([op for _, op in entries])
+                    write_journal.remove_through(entries[-1][0])
+                    report["replayed"] += len(entries)
+                    report["conflicts"].extend(result["conflicts"])
+            except Exception as e:
+                logging.error(f"重放離線日誌失敗: {e}")
+
+        if report["replayed"]:
+            # 重放期間的寫入沒有經過快取的精確失效，全部重新載入
+            words_count.invalidate()
+            words_page_cache.clear()
+            words_distractor_pool.clear()
+            words_fuzzy_index.invalidate()
+            logging.info(f"已重放 {report['replayed']} 筆離線寫入")
+        for conflict in report["conflicts"]:
+            logging.warning(f"離線寫入無法套用: {conflict['op']}（{conflict['reason']}）")
+        journal_conflicts.extend(report["conflicts"])
+        return report
+
+    @staticmethod
+    def take_journal_conflicts() -> List[Dict[str, Any]]:
+        """取走尚未提示的重放衝突"""
+        conflicts = list(journal_conflicts)
+        del journal_conflicts[:len(conflicts)]
+        return conflicts
+
+    @staticmethod
+    def get_total_count(refresh: bool = False) -> int:
+        """
+        獲取單字總數（使用計數快取，不必每次翻頁都查詢數據庫）
         
+        Args:
+            refresh: 是否忽略快取重新查詢
+            
         Returns:
             int: 單字總數
         """
         try:
-            return words_collection.count_documents({})
+            return words_count.refresh() if refresh else words_count.get()
         except Exception as e:
             logging.error(f"獲取單字總數失敗: {e}")
             return 0
+
+
+# 測驗單字的級別（與 TESTS_VALIDATOR 一致）
+TEST_RANKS = TESTS_VALIDATOR["validator"]["$jsonSchema"]["properties"]["rank"]["enum"]
+
+# 各級別（None 表示全部）的測驗單字數快取：tests 只由匯入腳本寫入，按有效時間校正即可
+tests_counts: Dict[Optional[str], CountCache] = {}
+_tests_counts_lock = threading.Lock()
+
+
+class TestCRUD:
+    """測驗單字（tests 集合）的數據訪問類：按級別分頁瀏覽與計數"""
+
+    @staticmethod
+    def get_tests(rank: Optional[str] = None, skip: int = 0, limit: int = 5,
+                  sort_by: str = "_id", sort_order: int = -1, anchor: Any = None,
+                  backward: bool = False) -> List[WordRow]:
+        """
+        按級別獲取一頁測驗單字：有邊界鍵時使用 keyset 分頁，否則退回 skip/limit
+
+        Args:
+            rank: 級別（見 TEST_RANKS），None 表示全部
+            skip: 跳過的數量（僅在沒有邊界鍵時使用）
+            limit: 返回的數量
+            sort_by: 排序字段（按 _id 時由 {rank, _id} 索引直接提供順序）
+            sort_order: 排序方向 (1: 升序, -1: 降序)
+            anchor: 邊界鍵，見 KeysetPaginator
+            backward: 是否取邊界之前的一頁
+
+        Returns:
+            List[WordRow]: 單字行列表，解釋為預覽
+        """
+        try:
+            if rank is not None and rank not in TEST_RANKS:
+                raise ValueError(f"未知的級別: {rank}")
+            return get_storage().find_test_words(
+                rank, limit=limit, sort_by=sort_by, sort_order=sort_order,
+                skip=skip, anchor=anchor, backward=backward,
+            )
+        except Exception as e:
+            logging.error(f"獲取測驗單字失敗: {e}")
+            return []
+
+    @staticmethod
+    def get_test(word_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        獲取測驗單字的完整內容
+
+        Args:
+            word_id: 單字 ID
+
+        Returns:
+            Optional[Dict]: 單字文檔（_id、japanese、explanation、rank），不存在或失敗時返回 None
+        """
+        try:
+            return get_storage().get_test_word(word_id)
+        except Exception as e:
+            logging.error(f"獲取測驗單字失敗: {e}")
+            return None
+
+    @staticmethod
+    def get_total_count(rank: Optional[str] = None, refresh: bool = False) -> int:
+        """
+        獲取某級別的測驗單字數（快取有效時不訪問數據庫）
+
+        Args:
+            rank: 級別，None 表示全部
+            refresh: 是否忽略快取重新計數
+
+        Returns:
+            int: 單字數
+        """
+        with _tests_counts_lock:
+            cache = tests_counts.get(rank)
+            if cache is None:
+                cache = CountCache(lambda exact: get_storage().count_test_words(rank))
+                tests_counts[rank] = cache
+        try:
+            return cache.refresh() if refresh else cache.get()
+        except Exception as e:
+            logging.error(f"獲取測驗單字數失敗: {e}")
+            return 0
+
+
+# 數據庫恢復連接時先重放離線日誌（在斷路器的探測線程執行，早於界面的重新載入）
+storage_breaker.add_listener(lambda state: state == CLOSED and WordCRUD.replay_journal())
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import logging
+from typing import Optional, List, Dict, Any, Sequence
+from pymongo import UpdateOne, DeleteMany
+
+from .bulk import DEFAULT_BATCH_SIZE
+from .ngrams import search_fields
+
+# 各集合的唯一鍵（與 indexes.py 中的唯一索引一致）
+UNIQUE_KEYS = {
+    "words": ("japanese",),
+    "tests": ("japanese", "rank"),
+}
+
+# 報告中列出的重複組數量上限
+SAMPLE_LIMIT = 20
+
+
+def merge_explanations(explanations: Sequence[Optional[str]]) -> str:
+    """
+    合併重複單字的解釋：按出現順序保留不同的非空解釋，以「；」連接
+
+    Args:
+        explanations: 各重複文檔的解釋（按 _id 升序）
+
+    Returns:
+        str: 合併後的解釋
+    """
+    merged: List[str] = []
+    for explanation in explanations:
+        explanation = (explanation or "").strip()
+        if explanation and explanation not in merged:
+            merged.append(explanation)
+    return "；".join(merged)
+
+
+def dedupe_collection(collection, keys: Sequence[str],
+                      batch_size: int = DEFAULT_BATCH_SIZE,
+                      dry_run: bool = False) -> Dict[str, Any]:
+    """
+    合併唯一鍵重複的文檔：保留 _id 最小的一筆並合併解釋，刪除其餘
+
+    重複組由數據庫端 $group 找出，每 batch_size 組以一次 bulk_write 合併。
+
+    Args:
+        collection: 集合實例
+        keys: 唯一鍵字段
+        batch_size: 每批合併的重複組數
+        dry_run: 只統計不修改
+
+    Returns:
+        Dict: {"groups": 重複組數, "removed": 刪除的文檔數,
+               "samples": [{唯一鍵..., "count": 文檔數, "explanation": 合併後的解釋}]}
+    """
+    pipeline = [
+        {"$sort": {"_id": 1}},
+        {"$group": {
+            "_id": {key: f"${key}" for key in keys},
+            "count": {"$sum": 1},
+            "ids": {"$push": "$_id"},
+            "explanations": {"$push": "$explanation"},  # 沒有解釋的文檔不計入
+        }},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    report = {"groups": 0, "removed": 0, "samples": []}
+    requests = []
+
+    def flush():
+        if requests and not dry_run:
+            collection.bulk_write(requests, ordered=False)
+        requests.clear()
+
+    for group in collection.aggregate(pipeline, allowDiskUse=True, batchSize=batch_size):
+        ids = group["ids"]
+        merged = merge_explanations(group["explanations"])
+        update = {"explanation": merged}
+        if collection.name == "words":
+            update.update(search_fields(group["_id"]["japanese"], merged))
+        requests.append(UpdateOne({"_id": ids[0]}, {"$set": update}))
+        requests.append(DeleteMany({"_id": {"$in": ids[1:]}}))
+
+        report["groups"] += 1
+        report["removed"] += len(ids) - 1
+        if len(report["samples"]) < SAMPLE_LIMIT:
+            report["samples"].append({**group["_id"], "count": len(ids), "explanation": merged})
+        if report["groups"] % batch_size == 0:
+            flush()
+    flush()
+
+    if report["groups"]:
+        logging.info(
+            f"{collection.name} 合併 {report['groups']} 組重複，刪除 {report['removed']} 筆"
+        )
+    return report
+
+
+def dedupe_all(db, batch_size: int = DEFAULT_BATCH_SIZE,
+               dry_run: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    合併 UNIQUE_KEYS 中所有集合的重複文檔
+
+    Returns:
+        Dict: 集合名稱 -> dedupe_collection 的報告
+    """
+    return {
+        name: dedupe_collection(db[name], keys, batch_size, dry_run)
+        for name, keys in UNIQUE_KEYS.items()
+    }
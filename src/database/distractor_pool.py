@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterable
+
+# 干擾項池的預設大小
+DEFAULT_POOL_SIZE = 200
+
+
+class DistractorPool:
+    """測驗干擾項池：按單字 ID 保存解釋，單字被修改或刪除時同步更新"""
+
+    def __init__(self, max_size: int = DEFAULT_POOL_SIZE):
+        """
+        初始化干擾項池
+
+        Args:
+            max_size: 最多保留的解釋數，超出時擠出最早加入的
+        """
+        self.max_size = max_size
+        self.version = 0  # 每次修改或移除都會遞增，用於丟棄之前發出的抽樣結果
+        self._entries: "OrderedDict[Any, str]" = OrderedDict()  # 單字 ID -> 解釋
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def texts(self) -> List[str]:
+        """池中的全部解釋"""
+        with self._lock:
+            return list(self._entries.values())
+
+    def extend(self, docs: Iterable[Dict[str, Any]]):
+        """加入單字的解釋（已在池中的移到最新），池已滿時擠出最早加入的"""
+        with self._lock:
+            self._extend_locked(docs)
+
+    def _extend_locked(self, docs: Iterable[Dict[str, Any]]):
+        for doc in docs:
+            text = doc.get("explanation")
+            if not text:
+                continue
+            self._entries[doc["_id"]] = text
+            self._entries.move_to_end(doc["_id"])
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def extend_if_current(self, docs: Iterable[Dict[str, Any]], version: int) -> bool:
+        """
+        僅在抽樣期間沒有單字被修改或刪除時加入
+
+        Args:
+            docs: 抽樣得到的單字
+            version: 抽樣開始時的 version
+
+        Returns:
+            bool: 是否已加入
+        """
+        with self._lock:
+            if version != self.version:
+                return False
+            self._extend_locked(docs)
+            return True
+
+    def on_update(self, word_id: Any, explanation: str):
+        """單字修改後替換池中的解釋（不在池中時不處理）"""
+        with self._lock:
+            self.version += 1
+            if word_id in self._entries:
+                if explanation:
+                    self._entries[word_id] = explanation
+                else:
+                    del self._entries[word_id]
+
+    def on_delete(self, word_id: Any):
+        """單字刪除後從池中移除"""
+        with self._lock:
+            self.version += 1
+            self._entries.pop(word_id, None)
+
+    def clear(self):
+        """清空（批量寫入後使用），下次測驗時重新抽樣建立"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+import heapq
+import threading
+from itertools import combinations
+from typing import Optional, List, Dict, Any, Iterable, Hashable, Set, Tuple, Callable
+
+from .kana import normalize_kana, normalize_query
+
+# 模糊搜索允許的最大編輯距離
+DEFAULT_MAX_DISTANCE = 2
+
+# 不超過此長度的查詢只容許 1 個錯字（兩三個假名的詞允許 2 個錯字幾乎能匹配任何詞）
+SHORT_QUERY_LENGTH = 3
+
+
+def allowed_distance(query: str, max_distance: int = DEFAULT_MAX_DISTANCE) -> int:
+    """
+    按查詢長度決定容許的編輯距離
+
+    Args:
+        query: 正規化後的查詢詞
+        max_distance: 編輯距離上限
+
+    Returns:
+        int: 短查詢為 1，其他為 max_distance
+    """
+    return min(max_distance, 1) if len(query) <= SHORT_QUERY_LENGTH else max_distance
+
+
+def levenshtein(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    計算兩個字串的編輯距離（插入、刪除、替換各算 1）
+
+    Args:
+        a: 字串
+        b: 字串
+        max_distance: 距離上限，確定超過時提前返回 max_distance + 1
+
+    Returns:
+        int: 編輯距離
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,                       # 刪除
+                current[j - 1] + 1,                    # 插入
+                previous[j - 1] + (char_a != char_b),  # 替換
+            ))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def _deletes(key: str, max_distance: int) -> Set[str]:
+    """產生刪除最多 max_distance 個字元後的所有變體（包含原字串）"""
+    variants = {key}
+    for count in range(1, min(max_distance, len(key)) + 1):
+        for positions in combinations(range(len(key)), count):
+            variants.add("".join(
+                char for index, char in enumerate(key) if index not in positions
+            ))
+    return variants
+
+
+class FuzzyIndex:
+    """
+    對稱刪除（SymSpell）模糊索引：以正規化鍵建立，查詢時只需比對共享刪除變體的候選
+
+    兩個字串的編輯距離不超過 d 時，各自刪除最多 d 個字元後必有相同的變體，
+    因此寫入時預先展開刪除變體，查詢時只對少量候選計算編輯距離。
+    """
+
+    def __init__(self, loader: Optional[Callable[[], Iterable[Tuple[Hashable, str, Dict[str, Any]]]]] = None,
+                 max_distance: int = DEFAULT_MAX_DISTANCE):
+        """
+        初始化模糊索引
+
+        Args:
+            loader: 返回全部 (條目 ID, 日文單字, 文檔) 的函數，首次查詢時載入
+            max_distance: 支持的最大編輯距離（決定寫入時展開的刪除變體數量）
+        """
+        self.loader = loader
+        self.max_distance = max_distance
+        self.loaded = loader is None
+        self._generation = 0  # 移除或失效時遞增，載入期間有變動則下次重新載入
+        self._entries: Dict[Hashable, Tuple[str, Dict[str, Any]]] = {}  # 條目 ID -> (鍵, 文檔)
+        self._keys: Dict[str, Set[Hashable]] = {}      # 正規化鍵 -> 條目 ID
+        self._variants: Dict[str, List[str]] = {}     # 刪除變體 -> 正規化鍵（列表比集合省內存）
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, entry_id: Hashable, japanese: str, doc: Dict[str, Any]):
+        """
+        加入或替換條目
+
+        Args:
+            entry_id: 條目 ID（同一 ID 再次加入時替換舊條目）
+            japanese: 日文單字
+            doc: 查詢時返回的文檔
+        """
+        key = normalize_kana(japanese)
+        with self._lock:
+            self._remove_locked(entry_id)
+            self._entries[entry_id] = (key, doc)
+            if key not in self._keys:
+                self._keys[key] = set()
+                for variant in _deletes(key, self.max_distance):
+                    self._variants.setdefault(variant, []).append(key)
+            self._keys[key].add(entry_id)
+
+    def add_many(self, entries: Iterable[Tuple[Hashable, str, Dict[str, Any]]]):
+        """批量加入 (條目 ID, 日文單字, 文檔)"""
+        for entry_id, japanese, doc in entries:
+            self.add(entry_id, japanese, doc)
+
+    def remove(self, entry_id: Hashable):
+        """移除條目（不存在時忽略）"""
+        with self._lock:
+            self._generation += 1
+            self._remove_locked(entry_id)
+
+    def _remove_locked(self, entry_id: Hashable):
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        key = entry[0]
+        ids = self._keys[key]
+        ids.discard(entry_id)
+        if ids:
+            return
+        # 鍵已沒有條目，移除其刪除變體
+        del self._keys[key]
+        for variant in _deletes(key, self.max_distance):
+            keys = self._variants.get(variant)
+            if keys is not None and key in keys:
+                keys.remove(key)
+                if not keys:
+                    del self._variants[variant]
+
+    def clear(self):
+        """清空索引"""
+        with self._lock:
+            self._entries.clear()
+            self._keys.clear()
+            self._variants.clear()
+
+    def invalidate(self):
+        """清空並標記為未載入（批量寫入後使用），下次查詢時重新載入"""
+        with self._lock:
+            self._generation += 1
+            self.loaded = self.loader is None
+            self._entries.clear()
+            self._keys.clear()
+            self._variants.clear()
+
+    def ensure_loaded(self):
+        """首次查詢前由 loader 載入全部條目（在調用方線程執行）"""
+        if self.loaded:
+            return
+        generation = self._generation
+        self.add_many(self.loader())
+        with self._lock:
+            # 載入期間有條目被移除時，已讀取的文檔可能過期，下次重新載入
+            self.loaded = generation == self._generation
+
+    def lookup(self, term: str, max_distance: Optional[int] = None,
+               limit: int = 10) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        查詢編輯距離內的條目
+
+        Args:
+            term: 查詢詞（平假名、片假名或羅馬字）
+            max_distance: 最大編輯距離（不超過建立索引時的設定）
+            limit: 最多返回的數量
+
+        Returns:
+            List[Tuple]: (編輯距離, 文檔)，按距離、長度差與單字排序；
+                         短查詢的容許距離見 allowed_distance
+        """
+        query = normalize_query(term)
+        if not query:
+            return []
+        self.ensure_loaded()
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        max_distance = allowed_distance(query, max_distance)
+
+        with self._lock:
+            candidates = set()
+            for variant in _deletes(query, max_distance):
+                candidates.update(self._variants.get(variant, ()))
+
+            ranked = []
+            for key in candidates:
+                distance = levenshtein(query, key, max_distance)
+                if distance > max_distance:
+                    continue
+                for entry_id in self._keys[key]:
+                    ranked.append((distance, abs(len(key) - len(query)), key, entry_id))
+
+            ranked = heapq.nsmallest(limit, ranked, key=lambda item: item[:3])
+            return [(distance, self._entries[entry_id][1])
+                    for distance, _, _, entry_id in ranked]
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import logging
+from typing import Dict, List, Any
+from pymongo import IndexModel, ASCENDING
+from pymongo.errors import OperationFailure
+
+# MongoDB 索引註冊表：集合名稱 -> 索引定義
+# 每個索引必須有固定的 name，啟動時按名稱比對，未宣告的索引會被刪除
+INDEXES = {
+    "words": [
+        {
+            "name": "japanese_1",
+            "keys": [("japanese", ASCENDING)],
+            "options": {"unique": True},
+        },
+        {
+            "name": "japanese_normalized_1",
+            "keys": [("japanese_normalized", ASCENDING)],
+        },
+        {
+            "name": "japanese_ngrams_1",
+            "keys": [("japanese_ngrams", ASCENDING)],
+        },
+        {
+            "name": "explanation_ngrams_1",
+            "keys": [("explanation_ngrams", ASCENDING)],
+        },
+        {
+            # 複習佇列：到期卡片按 review.due 範圍讀取，新卡片（review.due 為 null）按 _id 讀取
+            "name": "review.due_1__id_1",
+            "keys": [("review.due", ASCENDING), ("_id", ASCENDING)],
+        },
+    ],
+    "tests": [
+        {
+            "name": "rank_1_japanese_1",
+            "keys": [("rank", ASCENDING), ("japanese", ASCENDING)],
+            "options": {"unique": True},
+        },
+        {
+            # 按級別瀏覽：等值匹配 rank 後按 _id 順序讀取一頁，不需排序
+            "name": "rank_1__id_1",
+            "keys": [("rank", ASCENDING), ("_id", ASCENDING)],
+        },
+    ],
+}
+
+# 比對時需要檢查的索引選項
+_COMPARED_OPTIONS = ("unique", "sparse", "partialFilterExpression", "default_language", "weights")
+
+
+def _matches(existing: Dict[str, Any], spec: Dict[str, Any]) -> bool:
+    """
+    檢查現有索引是否與宣告的定義一致
+
+    Args:
+        existing: list_indexes 返回的索引資訊
+        spec: 註冊表中的索引定義
+
+    Returns:
+        bool: 鍵與選項是否一致
+    """
+    if list(existing["key"].items()) != [tuple(key) for key in spec["keys"]]:
+        return False
+    options = spec.get("options", {})
+    for option in _COMPARED_OPTIONS:
+        if existing.get(option) != options.get(option):
+            # unique/sparse 為 False 與未設置等價
+            if not existing.get(option) and not options.get(option):
+                continue
+            return False
+    return True
+
+
+def _model(name: str, keys: List[Any], options: Dict[str, Any]) -> IndexModel:
+    """按名稱、鍵與選項建立索引模型"""
+    return IndexModel([tuple(key) for key in keys], name=name, **options)
+
+
+def _has_duplicates(collection, spec: Dict[str, Any]) -> bool:
+    """檢查集合中是否有違反唯一索引定義的重複鍵（建立唯一索引前的預檢）"""
+    group = {f"k{i}": "$" + key for i, (key, _) in enumerate(spec["keys"])}
+    pipeline = [
+        {"$group": {"_id": group, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+        {"$limit": 1},
+    ]
+    return bool(list(collection.aggregate(pipeline, allowDiskUse=True)))
+
+
+def reconcile_indexes(collection, specs: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    使集合上的索引與宣告一致：建立缺少的、重建不一致的、刪除未宣告的
+
+    每個索引單獨建立，非唯一索引先建，某個索引失敗不影響其他索引。
+    不一致的索引在確認新定義可以建立後才刪除；重建仍失敗時恢復原索引。
+
+    Args:
+        collection: 集合實例
+        specs: 索引定義列表
+
+    Returns:
+        Dict: {"created": [...], "dropped": [...], "failed": [...]} 本次建立、刪除與建立失敗的索引名稱
+    """
+    report = {"created": [], "dropped": [], "failed": []}
+    declared = {spec["name"]: spec for spec in specs}
+    existing = {info["name"]: info for info in collection.list_indexes()}
+
+    for name in existing:
+        if name != "_id_" and name not in declared:
+            collection.drop_index(name)
+            report["dropped"].append(name)
+
+    # 唯一索引可能因重複資料而失敗，最後建立
+    ordered = sorted(declared.values(), key=lambda spec: bool(spec.get("options", {}).get("unique")))
+    for spec in ordered:
+        name, options = spec["name"], spec.get("options", {})
+        info = existing.get(name)
+        if info is not None and _matches(info, spec):
+            continue
+        if info is not None:
+            if options.get("unique") and _has_duplicates(collection, spec):
+                logging.error(f"{collection.name}.{name} 有重複資料，保留原索引")
+                report["failed"].append(name)
+                continue
+            collection.drop_index(name)
+            report["dropped"].append(name)
+        try:
+            collection.create_indexes([_model(name, spec["keys"], options)])
+            report["created"].append(name)
+        except OperationFailure as e:
+            logging.error(f"{collection.name}.{name} 索引建立失敗: {e}")
+            report["failed"].append(name)
+            if info is not None:
+                # 恢復原索引，不讓集合在重建失敗後失去該索引
+                old_options = {option: info[option] for option in _COMPARED_OPTIONS if option in info}
+                collection.create_indexes([_model(name, list(info["key"].items()), old_options)])
+                report["dropped"].remove(name)
+
+    if report["created"] or report["dropped"]:
+        logging.info(
+            f"{collection.name} 索引已同步：建立 {report['created']}，刪除 {report['dropped']}"
+        )
+    return report
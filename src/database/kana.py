@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import unicodedata
+
+# 長音符號：正規化時去除，使「ラーメン」「らめん」「ramen」可以互相匹配
+LONG_VOWEL_MARKS = {"ー", "〜", "～"}
+
+# 片假名（ァ-ヶ）與平假名的碼位差
+_KATAKANA_OFFSET = 0x60
+
+_VOWELS = set("aeiou")
+
+# 羅馬字 -> 平假名（平文式與訓令式，較長的拼寫優先匹配）
+ROMAJI_TABLE = {
+    "a": "あ", "i": "い", "u": "う", "e": "え", "o": "お",
+    "ka": "か", "ki": "き", "ku": "く", "ke": "け", "ko": "こ",
+    "ga": "が", "gi": "ぎ", "gu": "ぐ", "ge": "げ", "go": "ご",
+    "sa": "さ", "shi": "し", "si": "し", "su": "す", "se": "せ", "so": "そ",
+    "za": "ざ", "ji": "じ", "zi": "じ", "zu": "ず", "ze": "ぜ", "zo": "ぞ",
+    "ta": "た", "chi": "ち", "ti": "ち", "tsu": "つ", "tu": "つ", "te": "て", "to": "と",
+    "da": "だ", "di": "ぢ", "du": "づ", "de": "で", "do": "ど",
+    "na": "な", "ni": "に", "nu": "ぬ", "ne": "ね", "no": "の",
+    "ha": "は", "hi": "ひ", "fu": "ふ", "hu": "ふ", "he": "へ", "ho": "ほ",
+    "ba": "ば", "bi": "び", "bu": "ぶ", "be": "べ", "bo": "ぼ",
+    "pa": "ぱ", "pi": "ぴ", "pu": "ぷ", "pe": "ぺ", "po": "ぽ",
+    "ma": "ま", "mi": "み", "mu": "む", "me": "め", "mo": "も",
+    "ya": "や", "yu": "ゆ", "yo": "よ",
+    "ra": "ら", "ri": "り", "ru": "る", "re": "れ", "ro": "ろ",
+    "la": "ら", "li": "り", "lu": "る", "le": "れ", "lo": "ろ",
+    "wa": "わ", "wi": "うぃ", "we": "うぇ", "wo": "を",
+    "n'": "ん",
+    "kya": "きゃ", "kyu": "きゅ", "kyo": "きょ",
+    "gya": "ぎゃ", "gyu": "ぎゅ", "gyo": "ぎょ",
+    "sha": "しゃ", "shu": "しゅ", "sho": "しょ", "she": "しぇ",
+    "sya": "しゃ", "syu": "しゅ", "syo": "しょ",
+    "ja": "じゃ", "ju": "じゅ", "jo": "じょ", "je": "じぇ",
+    "jya": "じゃ", "jyu": "じゅ", "jyo": "じょ",
+    "zya": "じゃ", "zyu": "じゅ", "zyo": "じょ",
+    "cha": "ちゃ", "chu": "ちゅ", "cho": "ちょ", "che": "ちぇ",
+    "tya": "ちゃ", "tyu": "ちゅ", "tyo": "ちょ",
+    "nya": "にゃ", "nyu": "にゅ", "nyo": "にょ",
+    "hya": "ひゃ", "hyu": "ひゅ", "hyo": "ひょ",
+    "bya": "びゃ", "byu": "びゅ", "byo": "びょ",
+    "pya": "ぴゃ", "pyu": "ぴゅ", "pyo": "ぴょ",
+    "mya": "みゃ", "myu": "みゅ", "myo": "みょ",
+    "rya": "りゃ", "ryu": "りゅ", "ryo": "りょ",
+    "fa": "ふぁ", "fi": "ふぃ", "fe": "ふぇ", "fo": "ふぉ",
+    "thi": "てぃ", "dhi": "でぃ", "tsa": "つぁ",
+    "va": "ゔぁ", "vi": "ゔぃ", "vu": "ゔ", "ve": "ゔぇ", "vo": "ゔぉ",
+    "xa": "ぁ", "xi": "ぃ", "xu": "ぅ", "xe": "ぇ", "xo": "ぉ",
+    "xya": "ゃ", "xyu": "ゅ", "xyo": "ょ", "xtu": "っ", "xtsu": "っ", "ltu": "っ",
+    "-": "ー",
+}
+
+_MAX_ROMAJI_LENGTH = max(len(key) for key in ROMAJI_TABLE)
+
+
+def katakana_to_hiragana(text: str) -> str:
+    """將片假名（ァ-ヶ）轉為平假名，其他字元不變"""
+    return "".join(
+        chr(ord(char) - _KATAKANA_OFFSET) if "ァ" <= char <= "ヶ" else char
+        for char in text
+    )
+
+
+def romaji_to_kana(text: str) -> str:
+    """
+    將羅馬字轉為平假名，無法轉換的字元保持原樣
+
+    Args:
+        text: 輸入文字（可混合假名）
+
+    Returns:
+        str: 轉換後的文字
+    """
+    text = text.lower()
+    result = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        following = text[i + 1] if i + 1 < len(text) else ""
+
+        # 重複的羅馬字子音（n 除外）表示促音；假名與漢字重複不是促音
+        if (char == following and char.isascii() and char.isalpha()
+                and char not in _VOWELS and char != "n"):
+            result.append("っ")
+            i += 1
+            continue
+        # tch -> っち
+        if text.startswith("tch", i):
+            result.append("っ")
+            i += 1
+            continue
+        # nn：後面接母音或 y 時只消耗一個 n（konnichiha -> こんにちは）
+        if char == "n" and following == "n":
+            after = text[i + 2] if i + 2 < len(text) else ""
+            result.append("ん")
+            i += 1 if (after in _VOWELS or after == "y") else 2
+            continue
+        # 後面不是母音或 y 的 n 為撥音
+        if char == "n" and following not in _VOWELS and following not in ("y", "'"):
+            result.append("ん")
+            i += 1
+            continue
+
+        for length in range(_MAX_ROMAJI_LENGTH, 0, -1):
+            kana = ROMAJI_TABLE.get(text[i:i + length])
+            if kana is not None:
+                result.append(kana)
+                i += length
+                break
+        else:
+            result.append(char)
+            i += 1
+    return "".join(result)
+
+
+def normalize_kana(text: str) -> str:
+    """
+    計算搜索用的正規化鍵：全形/半形統一（NFKC）、片假名轉平假名、去除長音符號
+
+    Args:
+        text: 日文文字
+
+    Returns:
+        str: 正規化後的文字
+    """
+    text = katakana_to_hiragana(unicodedata.normalize("NFKC", text))
+    return "".join(char for char in text if char not in LONG_VOWEL_MARKS).lower()
+
+
+def normalize_query(term: str) -> str:
+    """
+    將搜索詞轉為正規化鍵：含拉丁字母時先由羅馬字轉為假名
+
+    Args:
+        term: 搜索關鍵詞
+
+    Returns:
+        str: 正規化後的關鍵詞
+    """
+    term = unicodedata.normalize("NFKC", term)
+    if any("a" <= char <= "z" for char in term.lower()):
+        term = romaji_to_kana(term)
+    return normalize_kana(term)
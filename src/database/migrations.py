@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+import logging
+from typing import Optional, List, Dict, Any, Callable
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from .bulk import DEFAULT_BATCH_SIZE
+from .validators import WORDS_VALIDATOR, TESTS_VALIDATOR
+from .ngrams import search_fields, EXPLANATION_NORMALIZED_FIELD
+from .dedupe import dedupe_all
+
+# 記錄結構版本的集合與文檔：{"_id": "schema", "version": 已完成的版本, "backfill": 回填斷點}
+META_COLLECTION = "schema_meta"
+SCHEMA_DOC_ID = "schema"
+
+
+class Backfill:
+    """分批回填：按 _id 升序以 bulk_write 更新文檔，每批記錄斷點，中斷後從斷點繼續"""
+
+    def __init__(self, collection: str, update: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 query: Optional[Dict[str, Any]] = None,
+                 projection: Optional[Dict[str, Any]] = None):
+        """
+        初始化回填步驟
+
+        Args:
+            collection: 集合名稱
+            update: 由文檔計算更新操作的函數（例如 {"$set": {...}}）
+            query: 需要回填的文檔條件，None 表示全部
+            projection: 計算更新所需的字段
+        """
+        self.collection = collection
+        self.update = update
+        self.query = query or {}
+        self.projection = projection
+
+
+class Migration:
+    """結構遷移步驟：按版本號依序執行，可包含 DDL 與分批回填"""
+
+    def __init__(self, version: int, name: str,
+                 ddl: Optional[Callable[[Any], None]] = None,
+                 backfill: Optional[Backfill] = None):
+        """
+        初始化遷移步驟
+
+        Args:
+            version: 結構版本號（遞增）
+            name: 步驟名稱（用於日誌與進度回報）
+            ddl: 修改集合結構的函數，參數為數據庫實例（必須可重複執行）
+            backfill: 在 DDL 之後執行的分批回填
+        """
+        self.version = version
+        self.name = name
+        self.ddl = ddl
+        self.backfill = backfill
+
+
+def _set_validators(db):
+    """設置 words 與 tests 集合的驗證規則（集合不存在時以驗證規則建立）"""
+    existing = db.list_collection_names()
+    for name, validator in (("words", WORDS_VALIDATOR), ("tests", TESTS_VALIDATOR)):
+        if name in existing:
+            db.command({"collMod": name, **validator})
+        else:
+            db.create_collection(name, **validator)
+
+
+def _search_fields_update(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """按日文與解釋計算搜索字段"""
+    return {"$set": search_fields(
+        str(doc.get("japanese", "")), str(doc.get("explanation") or "")
+    )}
+
+
+# 遷移步驟：修改驗證規則或搜索字段的計算方式時，在末尾新增一步並遞增版本號
+MIGRATIONS = [
+    Migration(1, "validators", ddl=_set_validators),
+    Migration(2, "search_fields", backfill=Backfill(
+        "words", _search_fields_update, projection={"japanese": 1, "explanation": 1}
+    )),
+    # 在建立唯一索引前合併已有的重複單字
+    Migration(3, "dedupe", ddl=dedupe_all),
+    # 解釋搜索改為在正規化的解釋上確認匹配：新數據庫已由第 2 步回填，這裡只補缺少的文檔
+    Migration(4, "explanation_normalized", ddl=_set_validators, backfill=Backfill(
+        "words", _search_fields_update,
+        query={EXPLANATION_NORMALIZED_FIELD: {"$exists": False}},
+        projection={"japanese": 1, "explanation": 1},
+    )),
+    # words 的驗證規則加入 review 子文檔的字段類型
+    Migration(5, "review_validator", ddl=_set_validators),
+]
+
+# 程序要求的結構版本
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(db) -> int:
+    """讀取數據庫已完成的結構版本（從未遷移時為 0）"""
+    state = db[META_COLLECTION].find_one({"_id": SCHEMA_DOC_ID}, {"version": 1})
+    return state.get("version", 0) if state else 0
+
+
+def run_migrations(db, migrations: List[Migration] = MIGRATIONS,
+                   batch_size: int = DEFAULT_BATCH_SIZE,
+                   progress: Optional[Callable[[str, int, int], None]] = None) -> Dict[str, Any]:
+    """
+    將數據庫遷移到最新結構版本（已是最新時只需一次查詢，不執行任何 DDL）
+
+    Args:
+        db: 數據庫實例
+        migrations: 按版本號排序的遷移步驟
+        batch_size: 回填每批更新數量
+        progress: 回填進度回調，參數為 (步驟名稱, 已處理數, 總數)
+
+    Returns:
+        Dict: {"from": 原版本, "to": 目前版本, "applied": [已執行的步驟名稱]}
+    """
+    meta = db[META_COLLECTION]
+    state = meta.find_one({"_id": SCHEMA_DOC_ID}) or {}
+    current = state.get("version", 0)
+    report = {"from": current, "to": current, "applied": []}
+    pending = [migration for migration in migrations if migration.version > current]
+    if not pending:
+        return report
+
+    checkpoint = state.get("backfill") or {}
+    for migration in pending:
+        logging.info(f"執行結構遷移 {migration.version}: {migration.name}")
+        if migration.ddl is not None:
+            migration.ddl(db)
+        if migration.backfill is not None:
+            resume = checkpoint if checkpoint.get("version") == migration.version else {}
+            _run_backfill(db, migration, resume, batch_size, progress)
+        meta.update_one(
+            {"_id": SCHEMA_DOC_ID},
+            {"$set": {"version": migration.version}, "$unset": {"backfill": ""}},
+            upsert=True,
+        )
+        checkpoint = {}
+        report["to"] = migration.version
+        report["applied"].append(migration.name)
+    return report
+
+
+def _run_backfill(db, migration: Migration, checkpoint: Dict[str, Any], batch_size: int,
+                  progress: Optional[Callable[[str, int, int], None]]) -> int:
+    """
+    執行遷移的分批回填
+
+    Args:
+        db: 數據庫實例
+        migration: 遷移步驟
+        checkpoint: 上次中斷時的斷點 {"last_id", "processed"}，空字典表示從頭開始
+        batch_size: 每批更新數量
+        progress: 進度回調
+
+    Returns:
+        int: 本步驟累計處理的文檔數
+    """
+    backfill = migration.backfill
+    collection = db[backfill.collection]
+    meta = db[META_COLLECTION]
+    last_id = checkpoint.get("last_id")
+    processed = checkpoint.get("processed", 0)
+
+    def remaining_query():
+        if last_id is None:
+            return backfill.query
+        after = {"_id": {"$gt": last_id}}
+        return {"$and": [backfill.query, after]} if backfill.query else after
+
+    total = processed + collection.count_documents(remaining_query())
+    while True:
+        docs = list(collection.find(remaining_query(), backfill.projection)
+                    .sort("_id", 1).limit(batch_size))
+        if not docs:
+            break
+        requests = [UpdateOne({"_id": doc["_id"]}, backfill.update(doc)) for doc in docs]
+        try:
+            collection.bulk_write(requests, ordered=False)
+        except BulkWriteError as e:
+            # 不符合驗證規則的舊文檔無法更新，跳過並繼續
+            logging.warning(
+                f"{migration.name} 回填有 {len(e.details.get('writeErrors', []))} 筆文檔無法更新"
+            )
+
+        last_id = docs[-1]["_id"]
+        processed += len(docs)
+        meta.update_one(
+            {"_id": SCHEMA_DOC_ID},
+            {"$set": {"backfill": {"version": migration.version,
+                                   "last_id": last_id, "processed": processed}}},
+            upsert=True,
+        )
+        if progress:
+            progress(migration.name, processed, total)
+
+    logging.info(f"{migration.name} 回填完成：{collection.name} 共處理 {processed} 筆")
+    return processed
@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+import re
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from bson import ObjectId
+from pymongo import InsertOne, UpdateOne, DeleteOne
+from pymongo.errors import DuplicateKeyError
+
+from .storage import StorageBackend, RELEVANCE
+from .mongodb import db_manager, get_words_collection
+from .pagination import find_page
+from .rows import WordRow, PREVIEW_LENGTH
+from .ngrams import (
+    NGRAM_FIELD, NORMALIZED_FIELD, EXPLANATION_NGRAM_FIELD, EXPLANATION_NORMALIZED_FIELD,
+    GLOSS_SEPARATORS,
+    search_fields, query_ngrams, normalize_explanation
+)
+from .kana import normalize_query
+from .bulk import (
+    DEFAULT_BATCH_SIZE, insert_many_batched, upsert_many_batched, delete_many_batched,
+    bulk_write_ordered
+)
+from .write_journal import INSERT, UPDATE, DELETE, UPSERT
+from .review import new_state
+
+
+class MongoStorage(StorageBackend):
+    """MongoDB 存儲後端：使用 MongoDBManager 管理的 words 集合"""
+
+    supports_offline_writes = True
+
+    # 內部索引字段與複習狀態不返回給界面
+    _INTERNAL_FIELDS = (NGRAM_FIELD, NORMALIZED_FIELD, EXPLANATION_NGRAM_FIELD,
+                        EXPLANATION_NORMALIZED_FIELD, "review")
+    _PROJECTION = dict.fromkeys(_INTERNAL_FIELDS, 0)
+
+    # 各用途只取需要的字段：列表只取解釋開頭（在數據庫端截斷），模糊索引不取其他字段
+    _LIST_PROJECTION = {
+        "japanese": 1,
+        "explanation": {"$substrCP": [{"$ifNull": ["$explanation", ""]}, 0, PREVIEW_LENGTH + 1]},
+    }
+    _WORD_FIELDS = {"japanese": 1, "explanation": 1}
+    _TEST_WORD_FIELDS = {"japanese": 1, "explanation": 1, "rank": 1}
+    _CARD_FIELDS = {"japanese": 1, "explanation": 1, "review": 1}
+    _CARD_SORT = [("review.due", 1), ("_id", 1)]  # 與 review.due_1__id_1 索引一致，不需排序
+
+    def __init__(self, collection=None):
+        """
+        初始化 MongoDB 存儲
+        Args:
+            collection: 指定使用的集合（用於基準測試），None 表示使用全局連接
+        """
+        self._collection = collection
+
+    @property
+    def collection(self):
+        """words 集合，連接失敗時拋出 ConnectionError"""
+        if self._collection is not None:
+            return self._collection
+        return get_words_collection()
+
+    def connect_async(self):
+        if self._collection is None:
+            db_manager.connect_async()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        if self._collection is not None:
+            return True
+        return db_manager.wait_ready(timeout)
+
+    def insert_word(self, japanese: str, explanation: str) -> Any:
+        result = self.collection.insert_one(self._with_search_fields({
+            "japanese": japanese,
+            "explanation": explanation
+        }))
+        return result.inserted_id
+
+    def upsert_word(self, japanese: str, explanation: str) -> Tuple[Any, bool]:
+        def upsert():
+            return self.collection.update_one(
+                {"japanese": japanese},
+                {"$set": self._with_search_fields({"japanese": japanese, "explanation": explanation})},
+                upsert=True,
+            )
+        try:
+            result = upsert()
+        except DuplicateKeyError:
+            # 並發寫入同一單字時只有一方能插入，另一方重試即會匹配到已插入的文檔
+            result = upsert()
+        if result.upserted_id is not None:
+            return result.upserted_id, True
+        return self.collection.find_one({"japanese": japanese}, {"_id": 1})["_id"], False
+
+    def insert_words(self, words: List[Dict[str, str]],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        return insert_many_batched(
+            self.collection, [self._with_search_fields(word) for word in words], batch_size
+        )
+
+    def upsert_words(self, words: List[Dict[str, str]],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        return upsert_many_batched(
+            self.collection, [self._with_search_fields(word) for word in words], ["japanese"], batch_size
+        )
+
+    def find_words(self, limit: int = 5, sort_by: str = "_id", sort_order: int = -1,
+                   skip: int = 0, anchor: Any = None,
+                   backward: bool = False) -> List[WordRow]:
+        return self._rows(find_page(self.collection, limit=limit, sort_by=sort_by,
+                                    sort_order=sort_order, skip=skip,
+                                    anchor=anchor, backward=backward,
+                                    projection=self._LIST_PROJECTION))
+
+    def search_words(self, search_term: str, limit: Optional[int] = None,
+                     sort_by: str = "_id", sort_order: int = -1, skip: int = 0,
+                     anchor: Any = None, backward: bool = False,
+                     field: str = "japanese") -> List[WordRow]:
+        if field == "japanese":
+            # limit 為 0 時 MongoDB 不限制返回數量
+            return self._rows(find_page(self.collection, self._search_query(search_term),
+                                        limit=limit or 0, sort_by=sort_by, sort_order=sort_order,
+                                        skip=skip, anchor=anchor, backward=backward,
+                                        projection=self._LIST_PROJECTION))
+
+        # 解釋與全部模式：在數據庫端計算相關度分級後排序分頁
+        pipeline = [
+            {"$match": self._field_query(search_term, field)},
+            {"$addFields": {RELEVANCE: self._relevance(search_term, field)}},
+            {"$sort": {RELEVANCE: 1, "_id": -1}},
+        ]
+        if skip:
+            pipeline.append({"$skip": skip})
+        if limit:
+            pipeline.append({"$limit": limit})
+        pipeline.append({"$project": self._LIST_PROJECTION})
+        return self._rows(self.collection.aggregate(pipeline))
+
+    @staticmethod
+    def _rows(docs) -> List[WordRow]:
+        """將列表投影的結果轉為單字行"""
+        return [WordRow.from_preview(doc["_id"], doc.get("japanese"), doc.get("explanation"))
+                for doc in docs]
+
+    def get_word(self, word_id: Any) -> Optional[Dict[str, Any]]:
+        return self.collection.find_one({"_id": word_id}, self._PROJECTION)
+
+    def count_matches(self, search_term: str, cap: Optional[int] = None,
+                      field: str = "japanese") -> int:
+        options = {"limit": cap} if cap else {}
+        return self.collection.count_documents(
+            self._field_query(search_term, field), **options
+        )
+
+    @classmethod
+    def _field_query(cls, search_term: str, field: str) -> Dict[str, Any]:
+        """按搜索範圍建立搜索條件"""
+        if field == "japanese":
+            return cls._search_query(search_term)
+        if field == "explanation":
+            return cls._explanation_query(search_term)
+        return {"$or": [cls._search_query(search_term), cls._explanation_query(search_term)]}
+
+    @staticmethod
+    def _explanation_query(search_term: str) -> Dict[str, Any]:
+        """
+        建立解釋搜索條件：字元 n-gram 多鍵索引縮小範圍，再以正則確認是連續子字串
+
+        n-gram 與正則都比對正規化後的解釋，全形或相容字元的解釋與 SQLite 後端一樣能匹配
+        """
+        normalized = normalize_explanation(search_term)
+        return {
+            EXPLANATION_NGRAM_FIELD: {"$all": query_ngrams(normalized)},
+            EXPLANATION_NORMALIZED_FIELD: {"$regex": re.escape(normalized)},
+        }
+
+    @staticmethod
+    def _relevance(search_term: str, field: str) -> Dict[str, Any]:
+        """
+        相關度分級（越小越相關）：
+        0-2 日文完全相同、開頭相同、包含；3-6 解釋完全相同、為完整義項、開頭相同、包含
+        """
+        def matches(value, pattern, options=""):
+            return {"$regexMatch": {"input": {"$ifNull": [value, ""]},
+                                    "regex": pattern, "options": options}}
+
+        branches = []
+        normalized = normalize_query(search_term)
+        if field == "all" and normalized:
+            escaped = re.escape(normalized)
+            branches += [
+                {"case": {"$eq": ["$" + NORMALIZED_FIELD, normalized]}, "then": 0},
+                {"case": matches("$" + NORMALIZED_FIELD, "^" + escaped), "then": 1},
+                {"case": matches("$" + NORMALIZED_FIELD, escaped), "then": 2},
+            ]
+        escaped = re.escape(normalize_explanation(search_term))
+        separators = f"[{re.escape(normalize_explanation(GLOSS_SEPARATORS))}\\s]"
+        explanation = "$" + EXPLANATION_NORMALIZED_FIELD
+        branches += [
+            {"case": matches(explanation, f"^{escaped}$"), "then": 3},
+            {"case": matches(explanation, f"(^|{separators}){escaped}($|{separators})"), "then": 4},
+            {"case": matches(explanation, "^" + escaped), "then": 5},
+        ]
+        return {"$switch": {"branches": branches, "default": 6}}
+
+    @staticmethod
+    def _search_query(search_term: str) -> Dict[str, Any]:
+        """建立日文搜索條件：平假名、片假名與羅馬字統一為正規化鍵後比對"""
+        normalized = normalize_query(search_term)
+        if not normalized:
+            # 只有長音符號等被正規化去除的字元時，直接比對原文
+            return {"japanese": {"$regex": re.escape(search_term)}}
+
+        # n-gram 多鍵索引縮小候選範圍，再以轉義後的正則確認是連續子字串
+        return {
+            NGRAM_FIELD: {"$all": query_ngrams(normalized)},
+            NORMALIZED_FIELD: {"$regex": re.escape(normalized)},
+        }
+
+    def update_word(self, word_id: Any, japanese: str, explanation: str) -> bool:
+        result = self.collection.update_one(
+            {"_id": word_id},
+            {"$set": self._with_search_fields({
+                "japanese": japanese,
+                "explanation": explanation
+            })}
+        )
+        return result.modified_count > 0
+
+    def delete_word(self, word_id: Any) -> bool:
+        return self.collection.delete_one({"_id": word_id}).deleted_count > 0
+
+    def new_word_id(self) -> Any:
+        return ObjectId()
+
+    def apply_writes(self, ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+        requests = []
+        for op in ops:
+            fields = {"japanese": op.get("japanese"), "explanation": op.get("explanation")}
+            if op["op"] == INSERT:
+                requests.append(InsertOne(self._with_search_fields({"_id": op["_id"], **fields})))
+            elif op["op"] == UPDATE:
+                requests.append(UpdateOne({"_id": op["_id"]},
+                                          {"$set": self._with_search_fields(fields)}))
+            elif op["op"] == UPSERT:
+                requests.append(UpdateOne({"japanese": op["japanese"]},
+                                          {"$set": self._with_search_fields(fields)}, upsert=True))
+            else:
+                requests.append(DeleteOne({"_id": op["_id"]}))
+        result = bulk_write_ordered(self.collection, requests)
+
+        conflicts = []
+        for error in result["errors"]:
+            op = ops[error["index"]]
+            if (op["op"] == INSERT and error["code"] == 11000
+                    and self.collection.count_documents({"_id": op["_id"]}, limit=1)):
+                # 相同 _id 已寫入過（例如逾時前其實已成功），重放的新增視為完成
+                result["applied"] += 1
+                continue
+            reason = "單字已存在" if error["code"] == 11000 else error["message"]
+            conflicts.append({"op": op, "reason": reason})
+
+        # 修改的單字可能已在其他地方被刪除：匹配數不足時找出不存在的目標
+        # （UPSERT 匹配到已有單字時也計入匹配數，批中有 UPSERT 時總是檢查）
+        failed = {error["index"] for error in result["errors"]}
+        updates = [i for i, op in enumerate(ops) if op["op"] == UPDATE and i not in failed]
+        has_upserts = any(op["op"] == UPSERT for op in ops)
+        if updates and (has_upserts or result["matched"] < len(updates)):
+            missing = {ops[i]["_id"] for i in updates} - {
+                doc["_id"] for doc in self.collection.find(
+                    {"_id": {"$in": [ops[i]["_id"] for i in updates]}}, {"_id": 1}
+                )
+            }
+            deleted_at = {op["_id"]: i for i, op in enumerate(ops) if op["op"] == DELETE}
+            for i in updates:
+                # 之後在同一批被刪除的不算衝突
+                deleted_later = deleted_at.get(ops[i]["_id"], -1) > i
+                if ops[i]["_id"] in missing and not deleted_later:
+                    result["applied"] -= 1
+                    conflicts.append({"op": ops[i], "reason": "單字已被刪除"})
+        return {"applied": result["applied"], "conflicts": conflicts}
+
+    def delete_words(self, word_ids: List[Any],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        return delete_many_batched(self.collection, word_ids, batch_size)
+
+    def count_words(self, exact: bool = False) -> int:
+        if exact:
+            return self.collection.count_documents({})
+        return self.collection.estimated_document_count()
+
+    def iter_words(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        return self.collection.find({}, self._WORD_FIELDS, batch_size=batch_size)
+
+    @property
+    def tests(self):
+        """tests 集合，連接失敗時拋出 ConnectionError（指定集合時為 None）"""
+        if self._collection is not None:
+            return None  # 指定集合（基準測試）時沒有對應的 tests 集合
+        tests = db_manager.get_collection("tests")
+        if tests is None:
+            raise ConnectionError("無法連接到數據庫")
+        return tests
+
+    def iter_test_words(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        tests = self.tests
+        if tests is None:
+            return iter(())
+        return tests.find({}, self._TEST_WORD_FIELDS, batch_size=batch_size)
+
+    def find_test_words(self, rank: Optional[str] = None, limit: int = 5, sort_by: str = "_id",
+                        sort_order: int = -1, skip: int = 0, anchor: Any = None,
+                        backward: bool = False) -> List[WordRow]:
+        tests = self.tests
+        if tests is None:
+            return []
+        # rank 等值加 _id 範圍由 rank_1__id_1 索引直接定位，翻頁成本與頁碼無關
+        return self._rows(find_page(tests, {"rank": rank} if rank else None, limit=limit,
+                                    sort_by=sort_by, sort_order=sort_order, skip=skip,
+                                    anchor=anchor, backward=backward,
+                                    projection=self._LIST_PROJECTION))
+
+    def count_test_words(self, rank: Optional[str] = None) -> int:
+        tests = self.tests
+        if tests is None:
+            return 0
+        if rank is None:
+            return tests.estimated_document_count()
+        return tests.count_documents({"rank": rank})
+
+    def get_test_word(self, word_id: Any) -> Optional[Dict[str, Any]]:
+        tests = self.tests
+        if tests is None:
+            return None
+        return tests.find_one({"_id": word_id}, self._TEST_WORD_FIELDS)
+
+    @staticmethod
+    def _with_search_fields(word: Dict[str, Any]) -> Dict[str, Any]:
+        """返回加上正規化鍵與 n-gram 字段的單字副本"""
+        japanese = word.get("japanese")
+        if not isinstance(japanese, str):
+            return dict(word)  # 交由驗證規則拒絕
+        explanation = word.get("explanation")
+        return {**word, **search_fields(
+            japanese, explanation if isinstance(explanation, str) else None
+        )}
+
+    def due_reviews(self, now: float, limit: int) -> List[Dict[str, Any]]:
+        # 新卡片的 review.due 為 null，不在數字範圍內
+        docs = self.collection.find(
+            {"review.due": {"$lte": now}}, self._CARD_FIELDS
+        ).sort(self._CARD_SORT).limit(limit)
+        return [self._card(doc) for doc in docs]
+
+    def new_reviews(self, limit: int) -> List[Dict[str, Any]]:
+        docs = self.collection.find(
+            {"review.due": None}, self._CARD_FIELDS
+        ).sort(self._CARD_SORT).limit(limit)
+        return [self._card(doc) for doc in docs]
+
+    @staticmethod
+    def _card(doc: Dict[str, Any]) -> Dict[str, Any]:
+        """將單字文檔轉為複習卡片"""
+        return {"_id": doc["_id"], "japanese": doc.get("japanese"),
+                "explanation": doc.get("explanation", ""),
+                "review": doc.get("review") or new_state()}
+
+    def save_review(self, word_id: Any, expected_due: Optional[float],
+                    state: Dict[str, Any]) -> bool:
+        result = self.collection.update_one(
+            {"_id": word_id, "review.due": expected_due}, {"$set": {"review": state}}
+        )
+        return result.matched_count == 1
+
+    def count_due_reviews(self, now: float) -> int:
+        return self.collection.count_documents({"review.due": {"$lte": now}})
+
+    def sample_words(self, size: int) -> List[Dict[str, Any]]:
+        return self._sample(self.collection, None, size)
+
+    def sample_test_words(self, size: int, rank: Optional[str] = None) -> List[Dict[str, Any]]:
+        tests = self.tests
+        if tests is None:
+            return []
+        return self._sample(tests, {"rank": rank} if rank else None, size)
+
+    @staticmethod
+    def _sample(collection, query: Optional[Dict[str, Any]], size: int) -> List[Dict[str, Any]]:
+        """
+        以 $sample 隨機抽取文檔：$sample 為第一階段時由服務端隨機游標直接取樣，
+        有條件時先經索引過濾再取樣，都只返回 size 筆
+        """
+        pipeline = [{"$match": query}] if query else []
+        pipeline += [{"$sample": {"size": size}},
+                     {"$project": {"japanese": 1, "explanation": 1}}]
+        return list(collection.aggregate(pipeline))
+
+    def ping(self) -> bool:
+        if self._collection is not None:
+            self._collection.database.command("ping")
+            return True
+        return db_manager.ping()
+
+    def close(self):
+        if self._collection is None:
+            db_manager.close()
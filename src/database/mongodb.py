@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 from pymongo import MongoClient
+from pymongo.errors import OperationFailure
 import logging
-from .validators import WORDS_VALIDATOR, TESTS_VALIDATOR
+import threading
+from .indexes import INDEXES, reconcile_indexes
+from .migrations import run_migrations
 
 # MongoDB 配置常量
 MONGODB_CONFIG = {
@@ -12,7 +15,7 @@ MONGODB_CONFIG = {
 }
 
 class MongoDBManager:
-    """MongoDB 管理類"""
+    """MongoDB 管理類：連接與結構初始化在背景線程中進行，不阻塞界面啟動"""
     _instance = None
     
     def __new__(cls):
@@ -25,8 +28,47 @@ class MongoDBManager:
             self.client = None
             self.db = None
             self.collection = None
+            self.index_report = {}    # 集合名稱 -> 啟動時建立/刪除的索引
+            self.migration_report = {}  # 啟動時執行的結構遷移
+            self._ready = threading.Event()  # 背景連接結束（無論成功與否）
+            self._thread = None
+            self._start_lock = threading.Lock()
             self.initialized = True
+
+    def connect_async(self):
+        """在背景線程建立連接（重複調用只會啟動一次）"""
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._connect_in_background,
+                    name="mongodb-connect",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _connect_in_background(self):
+        """背景線程入口：完成後通知等待者"""
+        try:
             self._connect()
+        finally:
+            self._ready.set()
+
+    @property
+    def is_ready(self) -> bool:
+        """連接是否已成功建立"""
+        return self._ready.is_set() and self.collection is not None
+
+    def wait_ready(self, timeout=None) -> bool:
+        """
+        等待背景連接完成（尚未開始時會先啟動）
+        Args:
+            timeout: 最長等待秒數，None 表示一直等待
+        Returns:
+            bool: 連接是否可用
+        """
+        self.connect_async()
+        self._ready.wait(timeout)
+        return self.is_ready
     
     def _connect(self):
         """建立 MongoDB 連接"""
@@ -39,7 +81,8 @@ class MongoDBManager:
             
             self._init_database()
             self._init_collection()
-            self._set_validation_rules()
+            self._migrate()
+            self._ensure_indexes()
             
         except Exception as e:
             logging.error(f"無法連接到 MongoDB: {e}")
@@ -70,30 +113,77 @@ class MongoDBManager:
             logging.info("創建 tests 集合")
             self.db.create_collection("tests")
     
-    def _set_validation_rules(self):
-        """設置驗證規則"""
-        validator_config = {
-            "collMod": MONGODB_CONFIG["COLLECTION"],
-            **WORDS_VALIDATOR
-        }
-        self.db.command(validator_config)
-        
-        # 設置 tests 集合的驗證規則
-        tests_validator_config = {
-            "collMod": "tests",
-            **TESTS_VALIDATOR
-        }
-        self.db.command(tests_validator_config)
+    def _migrate(self):
+        """執行結構遷移（驗證規則、搜索字段回填）；已是最新版本時不執行任何 DDL"""
+        self.migration_report = run_migrations(self.db)
     
-    def get_collection(self):
-        """獲取集合實例"""
-        return self.collection
+    def _ensure_indexes(self):
+        """同步索引：按註冊表建立缺少的索引並刪除多餘的索引"""
+        for collection_name, specs in INDEXES.items():
+            try:
+                self.index_report[collection_name] = reconcile_indexes(
+                    self.db[collection_name], specs
+                )
+                if self.index_report[collection_name]["failed"]:
+                    logging.error(
+                        f"{collection_name} 索引 {self.index_report[collection_name]['failed']} "
+                        f"未能建立（可執行 src/scripts/dedupe.py 後重啟）"
+                    )
+            except OperationFailure as e:
+                # 例如遷移後又寫入了重複單字，唯一索引無法建立：不影響使用，提示手動去重
+                logging.error(
+                    f"{collection_name} 索引同步失敗（可執行 src/scripts/dedupe.py 後重啟）: {e}"
+                )
+
+    def ping(self) -> bool:
+        """
+        檢查伺服器是否可用：背景連接已失敗時重新連接（在調用方線程執行）
+        Returns:
+            bool: 連接是否可用
+        """
+        if not self._ready.is_set():
+            return False  # 背景連接仍在進行
+        if self.collection is None:
+            if self.client:
+                self.client.close()
+            self._connect()
+            return self.collection is not None
+        self.client.admin.command("ping")
+        return True
+
+    def get_collection(self, name=None, timeout=None):
+        """
+        獲取集合實例：等待背景連接完成
+        Args:
+            name: 集合名稱，None 表示 words 集合
+            timeout: 最長等待秒數
+        Returns:
+            集合實例，連接失敗或逾時返回 None
+        """
+        if not self.wait_ready(timeout):
+            return None
+        return self.collection if name is None else self.db[name]
     
     def close(self):
         """關閉數據庫連接"""
         if self.client:
             self.client.close()
 
-# 創建全局單例實例
+# 創建全局單例實例（不在導入時連接，首次取用集合或調用 connect_async 時才開始）
 db_manager = MongoDBManager()
-words_collection = db_manager.get_collection()
+
+
+def get_words_collection(timeout=None):
+    """
+    獲取 words 集合：必要時等待背景連接完成
+    Args:
+        timeout: 最長等待秒數
+    Returns:
+        words 集合實例
+    Raises:
+        ConnectionError: 無法連接到數據庫
+    """
+    collection = db_manager.get_collection(timeout=timeout)
+    if collection is None:
+        raise ConnectionError("無法連接到數據庫")
+    return collection
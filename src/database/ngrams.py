@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import unicodedata
+from typing import Optional, List, Dict, Any
+
+from .kana import normalize_kana
+
+# 存放 japanese 正規化鍵（平假名、去除長音）的字段
+NORMALIZED_FIELD = "japanese_normalized"
+
+# 存放正規化鍵字元 n-gram 的字段（有多鍵索引）
+NGRAM_FIELD = "japanese_ngrams"
+
+# 存放 explanation 正規化文字（見 normalize_explanation）的字段：n-gram 篩選後以正則在此確認
+EXPLANATION_NORMALIZED_FIELD = "explanation_normalized"
+
+# 存放 explanation 字元 n-gram 的字段（有多鍵索引）：中文沒有空白分詞，以字元 n-gram 代替
+EXPLANATION_NGRAM_FIELD = "explanation_ngrams"
+
+# 解釋中分隔多個義項的符號，完整義項匹配的排名高於部分匹配
+GLOSS_SEPARATORS = "，,、；;／/"
+
+
+def normalize_explanation(text: str) -> str:
+    """
+    計算解釋搜索用的正規化文字：全形/半形統一（NFKC）、英文轉小寫
+
+    Args:
+        text: 解釋文字
+
+    Returns:
+        str: 正規化後的文字
+    """
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def text_ngrams(text: str) -> List[str]:
+    """
+    計算文字的單字元與雙字元 n-gram（去重，保持出現順序）
+
+    Args:
+        text: 日文單字
+
+    Returns:
+        List[str]: n-gram 列表
+    """
+    grams = list(text) + [text[i:i + 2] for i in range(len(text) - 1)]
+    return list(dict.fromkeys(grams))
+
+
+def query_ngrams(term: str) -> List[str]:
+    """
+    計算查詢詞需要匹配的 n-gram：單字元查詢用單字元，否則用全部雙字元
+
+    Args:
+        term: 搜索關鍵詞
+
+    Returns:
+        List[str]: 文檔必須全部包含的 n-gram
+    """
+    if len(term) <= 1:
+        return [term] if term else []
+    return list(dict.fromkeys(term[i:i + 2] for i in range(len(term) - 1)))
+
+
+def search_fields(japanese: str, explanation: Optional[str] = None) -> Dict[str, Any]:
+    """
+    計算寫入時需要一併保存的搜索字段
+
+    Args:
+        japanese: 日文單字
+        explanation: 解釋，None 表示本次寫入不修改解釋
+
+    Returns:
+        Dict: {NORMALIZED_FIELD: 正規化鍵, NGRAM_FIELD: 正規化鍵的 n-gram,
+               EXPLANATION_NORMALIZED_FIELD: 解釋的正規化文字（提供解釋時）,
+               EXPLANATION_NGRAM_FIELD: 解釋的 n-gram（提供解釋時）}
+    """
+    normalized = normalize_kana(japanese)
+    fields = {NORMALIZED_FIELD: normalized, NGRAM_FIELD: text_ngrams(normalized)}
+    if explanation is not None:
+        normalized_explanation = normalize_explanation(explanation)
+        fields[EXPLANATION_NORMALIZED_FIELD] = normalized_explanation
+        fields[EXPLANATION_NGRAM_FIELD] = text_ngrams(normalized_explanation)
+    return fields
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+import threading
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Callable, Tuple
+
+from .pagination import sort_key
+
+# 頁面快取最多保留的頁數
+DEFAULT_PAGE_CACHE_SIZE = 64
+
+
+def _before(a: Any, b: Any, sort_order: int) -> bool:
+    """a 在排序中是否排在 b 之前"""
+    return a > b if sort_order == -1 else a < b
+
+
+class PageCache:
+    """單字頁面 LRU 快取：按頁面覆蓋的鍵範圍精確失效"""
+
+    def __init__(self, max_size: int = DEFAULT_PAGE_CACHE_SIZE):
+        """
+        初始化頁面快取
+
+        Args:
+            max_size: 最多保留的頁數，超出時淘汰最久未使用的頁
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.version = 0  # 每次失效都會遞增，用於丟棄失效前發出的背景查詢結果
+        self._entries: "OrderedDict[Tuple, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(params: Dict[str, Any], search_term: Optional[str] = None) -> Tuple:
+        """
+        根據查詢參數建立快取鍵
+
+        Args:
+            params: find_words 的參數（limit、sort_by、sort_order、skip、anchor、backward），
+                    搜索時可另含 field
+            search_term: 搜索關鍵詞，None 表示普通列表
+
+        Returns:
+            Tuple: (搜索詞, 邊界鍵, 是否向前, skip, 每頁數量, 排序字段, 排序方向, 搜索範圍)
+        """
+        return (
+            search_term,
+            params.get("anchor"),
+            params.get("backward", False),
+            params.get("skip", 0),
+            params.get("limit"),
+            params.get("sort_by", "_id"),
+            params.get("sort_order", -1),
+            params.get("field", "japanese"),
+        )
+
+    def get(self, key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        """讀取快取，同時更新命中統計"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple, docs: List[Dict[str, Any]]):
+        """寫入快取，超出容量時淘汰最久未使用的頁"""
+        with self._lock:
+            self._put_locked(key, docs)
+
+    def _put_locked(self, key: Tuple, docs: List[Dict[str, Any]]):
+        self._entries[key] = docs
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def contains(self, key: Tuple) -> bool:
+        """是否已快取（不影響命中統計與 LRU 順序）"""
+        with self._lock:
+            return key in self._entries
+
+    def put_if_current(self, key: Tuple, docs: List[Dict[str, Any]], version: int) -> bool:
+        """
+        僅在查詢期間沒有發生失效時寫入快取
+
+        Args:
+            key: 快取鍵
+            docs: 頁面文檔
+            version: 查詢開始時的 version
+
+        Returns:
+            bool: 是否已寫入
+        """
+        with self._lock:
+            if version != self.version:
+                return False
+            self._put_locked(key, docs)
+            return True
+
+    def get_or_load(self, key: Tuple,
+                    loader: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        讀取快取，未命中時調用 loader 查詢並寫入
+
+        Args:
+            key: 快取鍵
+            loader: 查詢函數（異常會直接拋出，不會寫入快取）
+
+        Returns:
+            List[Dict]: 頁面文檔
+        """
+        docs = self.get(key)
+        if docs is None:
+            docs = loader()
+            self.put(key, docs)
+        return docs
+
+    def on_insert(self, word_id: Any):
+        """新增單字後失效：鍵落在頁面範圍內的頁與所有搜索結果"""
+        self._invalidate(lambda key, docs: key[0] is not None or self._covers(key, docs, word_id))
+
+    def on_delete(self, word_id: Any):
+        """刪除單字後失效：包含該單字或範圍受影響的頁（搜索結果是子集，範圍判斷同樣適用）"""
+        self._invalidate(lambda key, docs: (
+            self._contains(docs, word_id) or self._covers(key, docs, word_id)
+        ))
+
+    def on_update(self, word_id: Any):
+        """修改單字後失效：包含該單字的頁、非 _id 排序的頁與所有搜索結果"""
+        self._invalidate(lambda key, docs: (
+            key[0] is not None or key[5] != "_id" or self._contains(docs, word_id)
+        ))
+
+    def clear(self):
+        """清空快取（批量寫入後使用）"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """命中統計：hits、misses、size、hit_rate"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def _invalidate(self, predicate: Callable[[Tuple, List[Dict[str, Any]]], bool]):
+        with self._lock:
+            self.version += 1
+            for key in [key for key, docs in self._entries.items() if predicate(key, docs)]:
+                del self._entries[key]
+
+    @staticmethod
+    def _contains(docs: List[Dict[str, Any]], word_id: Any) -> bool:
+        return any(doc["_id"] == word_id for doc in docs)
+
+    @staticmethod
+    def _covers(key: Tuple, docs: List[Dict[str, Any]], word_id: Any) -> bool:
+        """
+        判斷新增或刪除 word_id 是否會改變該頁內容
+
+        頁面覆蓋的範圍（按顯示順序）：
+        - keyset 向後：邊界之後到最後一筆（未滿頁時延伸到結尾）
+        - keyset 向前：第一筆（未滿頁時從開頭）到邊界之前
+        - skip 或第一頁：開頭到最後一筆（前面的變動都會使頁面位移）
+        """
+        _, anchor, backward, _, limit, sort_by, sort_order, _ = key
+        if sort_by != "_id":
+            return True  # 無法從 _id 得知排序值，保守失效
+        full = limit is not None and len(docs) >= limit  # 不分頁的搜索結果延伸到結尾
+
+        if anchor is not None and backward:
+            after_start = not full or not _before(word_id, sort_key(docs[0]), sort_order)
+            return after_start and _before(word_id, anchor, sort_order)
+
+        after_start = anchor is None or _before(anchor, word_id, sort_order)
+        before_end = not full or not _before(sort_key(docs[-1]), word_id, sort_order)
+        return after_start and before_end
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+from typing import Optional, List, Dict, Any, Tuple
+
+# 比較運算子：降序時「下一頁」取更小的鍵，升序時取更大的鍵
+_NEXT_OPERATOR = {-1: "$lt", 1: "$gt"}
+
+
+def sort_key(doc: Dict[str, Any], sort_by: str = "_id") -> Any:
+    """
+    取得文檔的分頁邊界鍵
+
+    Args:
+        doc: 文檔
+        sort_by: 排序字段
+
+    Returns:
+        Any: 以 _id 排序時為 _id，否則為 (排序值, _id)
+    """
+    if sort_by == "_id":
+        return doc["_id"]
+    return (doc.get(sort_by), doc["_id"])
+
+
+def keyset_filter(anchor: Any, sort_by: str = "_id", sort_order: int = -1,
+                  backward: bool = False) -> Dict[str, Any]:
+    """
+    根據邊界鍵建立 keyset 查詢條件
+
+    Args:
+        anchor: 邊界鍵（見 sort_key）
+        sort_by: 排序字段
+        sort_order: 排序方向 (1: 升序, -1: 降序)
+        backward: 是否向前翻頁（取邊界之前的文檔）
+
+    Returns:
+        Dict: MongoDB 查詢條件
+    """
+    operator = _NEXT_OPERATOR[-sort_order if backward else sort_order]
+    if sort_by == "_id":
+        return {"_id": {operator: anchor}}
+
+    # 非 _id 排序時以 _id 作為同值的次序，避免重複或遺漏
+    value, anchor_id = anchor
+    return {"$or": [
+        {sort_by: {operator: value}},
+        {sort_by: value, "_id": {operator: anchor_id}},
+    ]}
+
+
+def find_page(collection, query: Optional[Dict[str, Any]] = None, limit: int = 5,
+              sort_by: str = "_id", sort_order: int = -1, skip: int = 0,
+              anchor: Any = None, backward: bool = False,
+              projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    查詢一頁文檔：有邊界鍵時使用 keyset 分頁，否則退回 skip/limit
+
+    Args:
+        collection: 集合實例
+        query: 額外的查詢條件
+        limit: 返回的數量
+        sort_by: 排序字段
+        sort_order: 排序方向 (1: 升序, -1: 降序)
+        skip: 跳過的數量（僅在沒有邊界鍵時使用）
+        anchor: 邊界鍵
+        backward: 是否取邊界之前的一頁
+        projection: 返回字段的投影
+
+    Returns:
+        List[Dict]: 按 sort_order 排列的文檔列表
+    """
+    conditions = dict(query or {})
+    order = sort_order
+    if anchor is not None:
+        boundary = keyset_filter(anchor, sort_by, sort_order, backward)
+        conditions = {"$and": [conditions, boundary]} if conditions else boundary
+        if backward:
+            order = -sort_order
+        skip = 0
+
+    sort = [(sort_by, order)]
+    if sort_by != "_id":
+        sort.append(("_id", order))
+
+    cursor = collection.find(conditions, projection).sort(sort)
+    if skip:
+        cursor = cursor.skip(skip)
+    docs = list(cursor.limit(limit))
+
+    # 向前翻頁時結果是反向的，需還原順序
+    if anchor is not None and backward:
+        docs.reverse()
+    return docs
+
+
+class KeysetPaginator:
+    """Keyset 分頁器：記錄每頁的邊界鍵，使任意深度的翻頁成本相同"""
+
+    def __init__(self, sort_by: str = "_id", sort_order: int = -1):
+        self.sort_by = sort_by
+        self.sort_order = sort_order
+        self._bounds: Dict[int, Tuple[Any, Any]] = {}  # 頁碼 -> (首個鍵, 最後鍵)
+
+    def locate(self, page: int, limit: int) -> Dict[str, Any]:
+        """
+        計算查詢指定頁所需的參數
+
+        Args:
+            page: 頁碼（從 1 開始）
+            limit: 每頁數量
+
+        Returns:
+            Dict: 可直接傳給 find_page 的參數
+        """
+        params = {"limit": limit, "sort_by": self.sort_by, "sort_order": self.sort_order}
+        if page <= 1:
+            return params
+        # 從上一頁的最後一筆往後取
+        if page - 1 in self._bounds:
+            params["anchor"] = self._bounds[page - 1][1]
+            return params
+        # 從下一頁的第一筆往前取（下一頁存在代表本頁必為滿頁）
+        if page + 1 in self._bounds:
+            params["anchor"] = self._bounds[page + 1][0]
+            params["backward"] = True
+            return params
+        # 沒有相鄰邊界（跳頁），退回 skip/limit
+        params["skip"] = (page - 1) * limit
+        return params
+
+    def record(self, page: int, docs: List[Dict[str, Any]]):
+        """記錄已載入頁面的邊界鍵"""
+        if docs:
+            self._bounds[page] = (
+                sort_key(docs[0], self.sort_by),
+                sort_key(docs[-1], self.sort_by),
+            )
+        else:
+            self._bounds.pop(page, None)
+
+    def invalidate(self, from_page: int):
+        """清除指定頁及之後的邊界（刪除資料時，之前的頁面不受影響）"""
+        for page in [p for p in self._bounds if p >= from_page]:
+            del self._bounds[page]
+
+    def reset(self):
+        """清除所有邊界（資料新增或刪除後頁面邊界會移動）"""
+        self._bounds.clear()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import logging
+import random
+import threading
+from typing import Optional, List, Dict, Any
+
+from .storage import get_storage
+from .crud import TEST_RANKS, words_distractor_pool
+from .distractor_pool import DistractorPool, DEFAULT_POOL_SIZE
+
+QUESTION_COUNT = 20    # 每次測驗的題數
+CHOICE_COUNT = 4       # 每題的選項數（含正確答案）
+POOL_SIZE = DEFAULT_POOL_SIZE  # 每個級別的干擾項池大小
+
+# 各級別（None 表示「我的」單字）的干擾項池：按單字 ID 保存解釋。
+# 池為空時以一次隨機抽樣建立；之後每次測驗抽到的題目解釋加入池中、擠出最舊的，
+# 池內容隨測驗逐漸輪換，不需重新讀取。「我的」單字的池由 WordCRUD 的寫入同步修改與移除
+distractor_pools: Dict[Optional[str], DistractorPool] = {None: words_distractor_pool}
+_pools_lock = threading.Lock()
+
+
+def _sample(rank: Optional[str], size: int) -> List[Dict[str, Any]]:
+    """從 words（rank 為 None）或 tests 的某級別隨機抽取單字"""
+    storage = get_storage()
+    if rank is None:
+        return storage.sample_words(size)
+    return storage.sample_test_words(size, rank)
+
+
+def _get_pool(rank: Optional[str]) -> DistractorPool:
+    """取得級別的干擾項池（不存在時建立空池）"""
+    with _pools_lock:
+        pool = distractor_pools.get(rank)
+        if pool is None:
+            pool = distractor_pools[rank] = DistractorPool(POOL_SIZE)
+        return pool
+
+
+def _pool(rank: Optional[str]) -> List[str]:
+    """取得級別的干擾項，池為空時先抽樣建立（多一次查詢）"""
+    pool = _get_pool(rank)
+    if len(pool):
+        return pool.texts()
+    version = pool.version
+    docs = _sample(rank, POOL_SIZE)
+    # 抽樣期間有單字被修改或刪除時不寫入池，這次直接使用抽樣結果
+    if not pool.extend_if_current(docs, version):
+        return [doc["explanation"] for doc in docs if doc.get("explanation")]
+    return pool.texts()
+
+
+def make_question(doc: Dict[str, Any], candidates: List[str],
+                  choice_count: int = CHOICE_COUNT) -> Dict[str, Any]:
+    """
+    以單字為題目，從候選解釋中隨機選出干擾項
+
+    Args:
+        doc: 題目單字 {"_id", "japanese", "explanation"}
+        candidates: 候選的干擾項解釋
+        choice_count: 選項數
+
+    Returns:
+        Dict: {"_id", "japanese", "choices": 打亂後的解釋, "answer": 正確選項的位置}；
+              不同的候選解釋不足時選項會少於 choice_count
+    """
+    answer = doc.get("explanation") or ""
+    distractors = list({text for text in candidates if text != answer})
+    choices = random.sample(distractors, min(len(distractors), choice_count - 1))
+    choices.append(answer)
+    random.shuffle(choices)
+    return {"_id": doc["_id"], "japanese": doc.get("japanese"),
+            "choices": choices, "answer": choices.index(answer)}
+
+
+class QuizGenerator:
+    """選擇題測驗：題目在數據庫端隨機抽樣，干擾項取自內存中的干擾項池"""
+
+    @staticmethod
+    def new_session(rank: Optional[str] = None,
+                    count: int = QUESTION_COUNT) -> List[Dict[str, Any]]:
+        """
+        產生一組測驗題目
+
+        題目以一次隨機抽樣取得；干擾項池已建立時整組題目只需這一次查詢，
+        否則再多一次抽樣建立池，與集合大小無關。
+
+        Args:
+            rank: 級別（見 TEST_RANKS），None 表示「我的」單字
+            count: 題數
+
+        Returns:
+            List[Dict]: make_question 產生的題目，單字不足時題數較少，失敗時返回空列表
+        """
+        try:
+            if rank is not None and rank not in TEST_RANKS:
+                raise ValueError(f"未知的級別: {rank}")
+            version = _get_pool(rank).version
+            docs = [doc for doc in _sample(rank, count) if doc.get("explanation")]
+            if not docs:
+                return []
+            # 本組其他題目的解釋也可作為干擾項（題目本身就是隨機抽出的）
+            candidates = _pool(rank) + [doc["explanation"] for doc in docs]
+            questions = [make_question(doc, candidates) for doc in docs]
+            # 把本次抽到的題目解釋加入干擾項池（池已滿時擠出最早加入的；期間有刪改時不加入）
+            _get_pool(rank).extend_if_current(docs, version)
+            return questions
+        except Exception as e:
+            logging.error(f"產生測驗失敗: {e}")
+            return []
+
+    @staticmethod
+    def clear_pool(rank: Optional[str] = None):
+        """清除干擾項池，下次測驗時重新抽樣建立（經由 WordCRUD 的寫入已自動同步，不必手動清除）"""
+        _get_pool(rank).clear()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+from typing import Optional, List, Dict, Any
+
+from .storage import get_storage
+
+# 評分：忘記、困難、記得、輕鬆
+AGAIN = 0
+HARD = 1
+GOOD = 2
+EASY = 3
+GRADES = (AGAIN, HARD, GOOD, EASY)
+
+DAY = 86400                    # 間隔以秒為單位保存
+DEFAULT_EASE = 2.5             # 新卡片的難易係數
+MIN_EASE = 1.3                 # 難易係數下限，避免間隔停止增長
+RELEARN_INTERVAL = 10 * 60     # 忘記後 10 分鐘再複習
+EASE_DELTA = {AGAIN: -0.2, HARD: -0.15, GOOD: 0.0, EASY: 0.15}
+FIRST_INTERVALS = {HARD: 1 * DAY, GOOD: 1 * DAY, EASY: 4 * DAY}   # 第一次記得後的間隔
+SECOND_INTERVALS = {HARD: 3 * DAY, GOOD: 6 * DAY, EASY: 8 * DAY}  # 第二次記得後的間隔
+HARD_FACTOR = 1.2              # 困難時間隔只小幅增長
+EASY_BONUS = 1.3               # 輕鬆時額外增長
+
+# 複習狀態字段（MongoDB 存在單字文檔的 review 子文檔，SQLite 存在 words 表的同名欄位）
+REVIEW_FIELDS = ("due", "interval", "ease", "reps", "lapses")
+
+
+def new_state() -> Dict[str, Any]:
+    """尚未複習過的卡片狀態（due 為 None 表示新卡片）"""
+    return {"due": None, "interval": 0, "ease": DEFAULT_EASE, "reps": 0, "lapses": 0}
+
+
+def schedule(state: Optional[Dict[str, Any]], grade: int,
+             now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    按 SM-2 計算評分後的複習狀態
+
+    Args:
+        state: 目前的複習狀態，None 表示新卡片
+        grade: 評分（AGAIN、HARD、GOOD、EASY）
+        now: 評分時間（Unix 秒），None 表示現在
+
+    Returns:
+        Dict: 新的複習狀態 {"due", "interval", "ease", "reps", "lapses"}
+    """
+    if grade not in GRADES:
+        raise ValueError(f"未知的評分: {grade}")
+    now = time.time() if now is None else now
+    state = {**new_state(), **(state or {})}
+    ease = max(MIN_EASE, state["ease"] + EASE_DELTA[grade])
+
+    if grade == AGAIN:
+        reps, lapses, interval = 0, state["lapses"] + 1, RELEARN_INTERVAL
+    else:
+        reps, lapses = state["reps"] + 1, state["lapses"]
+        if reps == 1:
+            interval = FIRST_INTERVALS[grade]
+        elif reps == 2:
+            interval = SECOND_INTERVALS[grade]
+        else:
+            factor = {HARD: HARD_FACTOR, GOOD: ease, EASY: ease * EASY_BONUS}[grade]
+            interval = max(state["interval"] * factor, state["interval"] + DAY)
+    return {"due": now + interval, "interval": interval, "ease": ease,
+            "reps": reps, "lapses": lapses}
+
+
+class ReviewScheduler:
+    """複習排程：按到期時間從索引取出待複習的卡片，評分以一次條件更新寫回"""
+
+    @staticmethod
+    def next_cards(limit: int = 20, now: Optional[float] = None,
+                   new_limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        獲取接下來要複習的卡片：先取已到期的（最早到期的在前），不足時補上新卡片
+
+        Args:
+            limit: 最多返回的數量
+            now: 目前時間（Unix 秒），None 表示現在
+            new_limit: 最多補上的新卡片數，None 表示不限
+
+        Returns:
+            List[Dict]: [{"_id", "japanese", "explanation", "review": 複習狀態}]，
+                        新卡片的 review 為 new_state()
+        """
+        now = time.time() if now is None else now
+        try:
+            storage = get_storage()
+            cards = storage.due_reviews(now, limit)
+            remaining = limit - len(cards)
+            if new_limit is not None:
+                remaining = min(remaining, new_limit)
+            if remaining > 0:
+                cards.extend(storage.new_reviews(remaining))
+            return cards
+        except Exception as e:
+            logging.error(f"獲取複習卡片失敗: {e}")
+            return []
+
+    @staticmethod
+    def grade(card: Dict[str, Any], grade: int,
+              now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        為卡片評分並寫回新的複習狀態
+
+        只有卡片的到期時間仍與讀取時相同才更新（同一張卡片被重複評分時只計一次）。
+
+        Args:
+            card: next_cards 返回的卡片
+            grade: 評分（AGAIN、HARD、GOOD、EASY）
+            now: 評分時間（Unix 秒），None 表示現在
+
+        Returns:
+            Optional[Dict]: 新的複習狀態；卡片已被評分、已刪除或失敗時返回 None
+        """
+        try:
+            state = schedule(card.get("review"), grade, now)
+            expected_due = (card.get("review") or {}).get("due")
+            if not get_storage().save_review(card["_id"], expected_due, state):
+                return None
+            return state
+        except Exception as e:
+            logging.error(f"寫入複習結果失敗: {e}")
+            return None
+
+    @staticmethod
+    def count_due(now: Optional[float] = None) -> int:
+        """
+        計算已到期的卡片數（不含新卡片）
+
+        Returns:
+            int: 到期數
+        """
+        try:
+            return get_storage().count_due_reviews(time.time() if now is None else now)
+        except Exception as e:
+            logging.error(f"計算到期卡片數失敗: {e}")
+            return 0
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+from typing import Optional, Dict, Any
+
+# 列表顯示的解釋最多字元數：數據庫端只返回前 PREVIEW_LENGTH + 1 個字元，
+# 多出的一個字元用來判斷是否被截斷，完整解釋在編輯時另行讀取
+PREVIEW_LENGTH = 100
+
+
+class WordRow:
+    """
+    列表顯示用的單字行：只包含列表需要的字段，以 __slots__ 省去每行的字典
+
+    支持 row["_id"] 與 row.get(...) 的讀取方式，可直接用於分頁邊界與頁面快取。
+    """
+
+    __slots__ = ("_id", "japanese", "explanation", "truncated")
+
+    def __init__(self, _id: Any, japanese: str, explanation: Optional[str],
+                 truncated: bool = False):
+        self._id = _id
+        self.japanese = japanese
+        self.explanation = explanation
+        self.truncated = truncated  # 解釋是否只有開頭部分
+
+    @classmethod
+    def from_preview(cls, _id: Any, japanese: str, explanation: Optional[str],
+                     preview_length: int = PREVIEW_LENGTH) -> "WordRow":
+        """
+        由數據庫返回的預覽建立單字行
+
+        Args:
+            _id: 單字 ID
+            japanese: 日文單字
+            explanation: 解釋的前 preview_length + 1 個字元
+            preview_length: 列表顯示的解釋最多字元數
+
+        Returns:
+            WordRow: 解釋超出 preview_length 時截斷並標記 truncated
+        """
+        if explanation is not None and len(explanation) > preview_length:
+            return cls(_id, japanese, explanation[:preview_length], True)
+        return cls(_id, japanese, explanation)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """轉換為字典（不含 truncated）"""
+        return {"_id": self._id, "japanese": self.japanese, "explanation": self.explanation}
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, WordRow):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        suffix = "…" if self.truncated else ""
+        return f"WordRow({self._id!r}, {self.japanese!r}, {self.explanation!r}{suffix})"
@@ -0,0 +1,695 @@
+# -*- coding: utf-8 -*-
+import re
+import random
+import logging
+import sqlite3
+import threading
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+
+from .storage import StorageBackend
+from .bulk import DEFAULT_BATCH_SIZE
+from .validators import WORDS_VALIDATOR
+from .rows import WordRow, PREVIEW_LENGTH
+from .kana import normalize_kana, normalize_query
+from .ngrams import GLOSS_SEPARATORS, text_ngrams, query_ngrams, normalize_explanation
+from .dedupe import merge_explanations
+from .review import REVIEW_FIELDS, new_state
+
+# 與 MongoDB 驗證規則相同的日文格式
+JAPANESE_PATTERN = re.compile(
+    WORDS_VALIDATOR["validator"]["$jsonSchema"]["properties"]["japanese"]["pattern"]
+)
+
+# MongoDB 文件驗證失敗的錯誤碼，保持批量寫入報告格式一致
+VALIDATION_ERROR_CODE = 121
+DUPLICATE_KEY_CODE = 11000
+
+# 排序字段 -> SQLite 欄位
+_SORT_COLUMNS = {"_id": "id", "japanese": "japanese", "explanation": "explanation"}
+
+# FTS5 trigram 分詞至少需要 3 個字符才能使用索引
+_TRIGRAM_MIN_LENGTH = 3
+
+# FTS5 建立在正規化鍵上，平假名、片假名與羅馬字查詢共用同一索引
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    japanese TEXT NOT NULL,
+    explanation TEXT,
+    japanese_normalized TEXT,
+    due REAL,
+    interval REAL,
+    ease REAL,
+    reps INTEGER,
+    lapses INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_words_due ON words (due, id);
+CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5(
+    japanese_normalized, content='words', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS words_ai AFTER INSERT ON words BEGIN
+    INSERT INTO words_fts (rowid, japanese_normalized) VALUES (new.id, new.japanese_normalized);
+END;
+CREATE TRIGGER IF NOT EXISTS words_ad AFTER DELETE ON words BEGIN
+    INSERT INTO words_fts (words_fts, rowid, japanese_normalized)
+    VALUES ('delete', old.id, old.japanese_normalized);
+END;
+CREATE TRIGGER IF NOT EXISTS words_au AFTER UPDATE OF japanese_normalized ON words BEGIN
+    INSERT INTO words_fts (words_fts, rowid, japanese_normalized)
+    VALUES ('delete', old.id, old.japanese_normalized);
+    INSERT INTO words_fts (rowid, japanese_normalized) VALUES (new.id, new.japanese_normalized);
+END;
+CREATE VIRTUAL TABLE IF NOT EXISTS words_explanation_fts USING fts5(tokens);
+CREATE TRIGGER IF NOT EXISTS words_explanation_ad AFTER DELETE ON words BEGIN
+    DELETE FROM words_explanation_fts WHERE rowid = old.id;
+END;
+"""
+
+# 解釋以字元 n-gram 作為詞元（空白分隔）存入 words_explanation_fts，寫入時在 Python 端計算
+_EXPLANATION_FTS_UPSERT = (
+    "INSERT OR REPLACE INTO words_explanation_fts (rowid, tokens) VALUES (?, ?)"
+)
+
+# 複習狀態欄位（見 review 模組），due 為 NULL 表示新卡片
+_REVIEW_COLUMNS = (("due", "REAL"), ("interval", "REAL"), ("ease", "REAL"),
+                   ("reps", "INTEGER"), ("lapses", "INTEGER"))
+_CARD_COLUMNS = "id, japanese, explanation, " + ", ".join(REVIEW_FIELDS)
+
+# 隨機抽樣：按主鍵隨機取 ID 的嘗試次數，刪除留下的空缺過多時退回隨機排序
+_SAMPLE_ATTEMPTS = 3
+
+# japanese 唯一索引（取代舊版的普通索引），建立前先合併已有的重複單字
+_UNIQUE_INDEX = """
+CREATE UNIQUE INDEX IF NOT EXISTS idx_words_japanese_unique ON words (japanese);
+DROP INDEX IF EXISTS idx_words_japanese;
+"""
+
+# 舊版表結構（FTS 建立在 japanese 上）升級時需要移除的對象
+_LEGACY_OBJECTS = """
+DROP TRIGGER IF EXISTS words_ai;
+DROP TRIGGER IF EXISTS words_ad;
+DROP TRIGGER IF EXISTS words_au;
+DROP TABLE IF EXISTS words_fts;
+"""
+
+
+class ValidationError(ValueError):
+    """單字不符合驗證規則"""
+    pass
+
+
+# 列表只取解釋開頭（多取一個字元用於判斷是否截斷）
+_LIST_COLUMNS = f"w.id, w.japanese, substr(w.explanation, 1, {PREVIEW_LENGTH + 1})"
+
+
+def _row_to_doc(row) -> Dict[str, Any]:
+    """將資料行轉為與 MongoDB 相同格式的文檔"""
+    return {"_id": row[0], "japanese": row[1], "explanation": row[2]}
+
+
+def _row_to_sample(row) -> Dict[str, Any]:
+    """將抽樣查詢的資料行轉為單字"""
+    return {"_id": row[0], "japanese": row[1], "explanation": row[2] or ""}
+
+
+def _row_to_card(row) -> Dict[str, Any]:
+    """將複習查詢的資料行轉為複習卡片"""
+    review = new_state() if row[3] is None else dict(zip(REVIEW_FIELDS, row[3:]))
+    return {"_id": row[0], "japanese": row[1], "explanation": row[2] or "", "review": review}
+
+
+def _row_to_word_row(row) -> WordRow:
+    """將列表查詢的資料行轉為單字行"""
+    return WordRow.from_preview(row[0], row[1], row[2])
+
+
+def _explanation_tokens(explanation: Optional[str]) -> str:
+    """計算解釋的 n-gram 詞元"""
+    return " ".join(text_ngrams(normalize_explanation(explanation or "")))
+
+
+def _separated(expression: str) -> str:
+    """SQL 表達式：將義項分隔符統一為「；」並在前後補上，用於判斷完整義項"""
+    for separator in GLOSS_SEPARATORS + " ":
+        if separator != "；":
+            expression = f"replace({expression}, '{separator}', '；')"
+    return f"'；' || {expression} || '；'"
+
+
+def _normalized_explanation(explanation: Optional[str]) -> str:
+    """SQL 函數 normalize_explanation：與解釋詞元相同的正規化（NULL 視為空字串）"""
+    return normalize_explanation(explanation or "")
+
+
+def _validate(japanese: Any):
+    """按 WORDS_VALIDATOR 的規則驗證 japanese 字段"""
+    if not isinstance(japanese, str) or not JAPANESE_PATTERN.fullmatch(japanese):
+        raise ValidationError("Document failed validation")
+
+
+class SQLiteStorage(StorageBackend):
+    """嵌入式 SQLite 存儲後端：WAL 模式、japanese 索引與 FTS5 trigram 搜索"""
+
+    def __init__(self, path: str):
+        """
+        初始化 SQLite 存儲
+        Args:
+            path: 數據庫文件路徑（":memory:" 表示內存數據庫）
+        """
+        self.path = path
+        self._conn = None
+        self._lock = threading.RLock()  # 工作線程與主線程共用同一連接
+
+    def connect_async(self):
+        # 本地文件打開很快，直接同步建立
+        self._connection()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        try:
+            self._connection()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _connection(self) -> sqlite3.Connection:
+        """獲取連接，首次調用時建立連接與表結構"""
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.create_function("normalize_explanation", 1, _normalized_explanation,
+                                     deterministic=True)
+                upgraded = self._upgrade_schema(conn)
+                self._add_review_columns(conn)
+                has_explanation_index = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'words_explanation_fts'"
+                ).fetchone() is not None
+                has_unique_index = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'idx_words_japanese_unique'"
+                ).fetchone() is not None
+                conn.executescript(_SCHEMA)
+                if upgraded:
+                    # 舊 FTS 已刪除，依正規化鍵重建全文索引
+                    with conn:
+                        conn.execute("INSERT INTO words_fts (words_fts) VALUES ('rebuild')")
+                if not has_explanation_index:
+                    self._backfill_explanation_index(conn)
+                if not has_unique_index:
+                    self._dedupe(conn)
+                    conn.executescript(_UNIQUE_INDEX)
+                self._conn = conn
+            return self._conn
+
+    @staticmethod
+    def _upgrade_schema(conn: sqlite3.Connection,
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> bool:
+        """
+        升級舊版數據庫：移除建立在 japanese 上的 FTS，補上並分批回填 japanese_normalized
+
+        Returns:
+            bool: 是否進行了升級（需要重建 FTS）
+        """
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(words)")]
+        if not columns or "japanese_normalized" in columns:
+            return False
+
+        # 先移除觸發器，回填時不會對尚未建立的 FTS 內容做刪除
+        conn.executescript(_LEGACY_OBJECTS)
+        conn.execute("ALTER TABLE words ADD COLUMN japanese_normalized TEXT")
+        while True:
+            rows = conn.execute(
+                "SELECT id, japanese FROM words WHERE japanese_normalized IS NULL LIMIT ?",
+                (batch_size,),
+            ).fetchall()
+            if not rows:
+                break
+            with conn:
+                conn.executemany(
+                    "UPDATE words SET japanese_normalized = ? WHERE id = ?",
+                    [(normalize_kana(japanese), word_id) for word_id, japanese in rows],
+                )
+        return True
+
+    @staticmethod
+    def _add_review_columns(conn: sqlite3.Connection):
+        """為舊版數據庫補上複習狀態欄位（現有單字都成為新卡片）"""
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(words)")]
+        if not columns or "due" in columns:
+            return
+        with conn:
+            for column, column_type in _REVIEW_COLUMNS:
+                conn.execute(f"ALTER TABLE words ADD COLUMN {column} {column_type}")
+
+    @staticmethod
+    def _backfill_explanation_index(conn: sqlite3.Connection,
+                                    batch_size: int = DEFAULT_BATCH_SIZE):
+        """為新建的解釋全文索引分批寫入現有單字"""
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                "SELECT id, explanation FROM words WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            with conn:
+                conn.executemany(
+                    _EXPLANATION_FTS_UPSERT,
+                    [(word_id, _explanation_tokens(explanation)) for word_id, explanation in rows],
+                )
+            last_id = rows[-1][0]
+
+    @staticmethod
+    def _dedupe(conn: sqlite3.Connection, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        合併 japanese 重複的單字：保留 id 最小的一筆並合併解釋，刪除其餘
+
+        Returns:
+            int: 刪除的數量
+        """
+        duplicates = [row[0] for row in conn.execute(
+            "SELECT japanese FROM words GROUP BY japanese HAVING COUNT(*) > 1"
+        )]
+        removed = 0
+        for start in range(0, len(duplicates), batch_size):
+            with conn:
+                for japanese in duplicates[start:start + batch_size]:
+                    rows = conn.execute(
+                        "SELECT id, explanation FROM words WHERE japanese = ? ORDER BY id",
+                        (japanese,),
+                    ).fetchall()
+                    merged = merge_explanations([row[1] for row in rows])
+                    conn.execute("UPDATE words SET explanation = ? WHERE id = ?", (merged, rows[0][0]))
+                    conn.execute(_EXPLANATION_FTS_UPSERT, (rows[0][0], _explanation_tokens(merged)))
+                    conn.executemany("DELETE FROM words WHERE id = ?", [(row[0],) for row in rows[1:]])
+                    removed += len(rows) - 1
+        if removed:
+            logging.info(f"words 合併 {len(duplicates)} 組重複，刪除 {removed} 筆")
+        return removed
+
+    def insert_word(self, japanese: str, explanation: str) -> Any:
+        _validate(japanese)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO words (japanese, explanation, japanese_normalized) "
+                    "VALUES (?, ?, ?)",
+                    (japanese, explanation, normalize_kana(japanese)),
+                )
+                conn.execute(_EXPLANATION_FTS_UPSERT,
+                             (cursor.lastrowid, _explanation_tokens(explanation)))
+            return cursor.lastrowid
+
+    def insert_words(self, words: List[Dict[str, str]],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        report = {"inserted_ids": [], "errors": []}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(words), batch_size):
+                # 每批一個事務，驗證失敗的行單獨記錄，不影響同批其他行
+                with conn:
+                    tokens = []
+                    for index in range(start, min(start + batch_size, len(words))):
+                        word = words[index]
+                        try:
+                            _validate(word.get("japanese"))
+                            cursor = conn.execute(
+                                "INSERT INTO words (japanese, explanation, japanese_normalized) "
+                                "VALUES (?, ?, ?)",
+                                (word["japanese"], word.get("explanation"),
+                                 normalize_kana(word["japanese"])),
+                            )
+                        except ValidationError as e:
+                            report["errors"].append(self._error(index, word, e))
+                            continue
+                        except sqlite3.IntegrityError as e:
+                            report["errors"].append(self._error(index, word, e, DUPLICATE_KEY_CODE))
+                            continue
+                        tokens.append((cursor.lastrowid, _explanation_tokens(word.get("explanation"))))
+                        report["inserted_ids"].append(cursor.lastrowid)
+                    conn.executemany(_EXPLANATION_FTS_UPSERT, tokens)
+        return report
+
+    def upsert_word(self, japanese: str, explanation: str) -> Tuple[Any, bool]:
+        with self._lock:
+            report = self.upsert_words([{"japanese": japanese, "explanation": explanation}])
+            if report["errors"]:
+                raise ValidationError(report["errors"][0]["message"])
+            word_id = self._connection().execute(
+                "SELECT id FROM words WHERE japanese = ?", (japanese,)
+            ).fetchone()[0]
+        return word_id, report["upserted"] > 0
+
+    def upsert_words(self, words: List[Dict[str, str]],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        report = {"upserted": 0, "modified": 0, "errors": []}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(words), batch_size):
+                with conn:
+                    for index in range(start, min(start + batch_size, len(words))):
+                        word = words[index]
+                        try:
+                            _validate(word.get("japanese"))
+                        except ValidationError as e:
+                            report["errors"].append(self._error(index, word, e))
+                            continue
+                        existing = conn.execute(
+                            "SELECT id, explanation FROM words WHERE japanese = ? LIMIT 1",
+                            (word["japanese"],),
+                        ).fetchone()
+                        explanation = word.get("explanation")
+                        if existing is None:
+                            cursor = conn.execute(
+                                "INSERT INTO words (japanese, explanation, japanese_normalized) "
+                                "VALUES (?, ?, ?)",
+                                (word["japanese"], explanation, normalize_kana(word["japanese"])),
+                            )
+                            conn.execute(_EXPLANATION_FTS_UPSERT,
+                                         (cursor.lastrowid, _explanation_tokens(explanation)))
+                            report["upserted"] += 1
+                        elif "explanation" in word and existing[1] != explanation:
+                            conn.execute(
+                                "UPDATE words SET explanation = ? WHERE id = ?",
+                                (explanation, existing[0]),
+                            )
+                            conn.execute(_EXPLANATION_FTS_UPSERT,
+                                         (existing[0], _explanation_tokens(explanation)))
+                            report["modified"] += 1
+        return report
+
+    @staticmethod
+    def _error(index: int, word: Dict[str, Any], error: Exception,
+               code: int = VALIDATION_ERROR_CODE) -> Dict[str, Any]:
+        """建立與 bulk 模組相同格式的逐行錯誤"""
+        return {
+            "index": index,
+            "japanese": word.get("japanese"),
+            "code": code,
+            "message": str(error),
+        }
+
+    def find_words(self, limit: int = 5, sort_by: str = "_id", sort_order: int = -1,
+                   skip: int = 0, anchor: Any = None,
+                   backward: bool = False) -> List[WordRow]:
+        return self._select_page("words w", [], [], limit, sort_by, sort_order,
+                                 skip, anchor, backward)
+
+    def search_words(self, search_term: str, limit: Optional[int] = None,
+                     sort_by: str = "_id", sort_order: int = -1, skip: int = 0,
+                     anchor: Any = None, backward: bool = False,
+                     field: str = "japanese") -> List[WordRow]:
+        if field == "japanese":
+            source, conditions, params = self._search_clause(search_term)
+            return self._select_page(source, conditions, params, limit, sort_by, sort_order,
+                                     skip, anchor, backward)
+
+        # 解釋與全部模式：按相關度分級排序，同級時新單字在前
+        condition, params = self._field_condition(search_term, field)
+        rank, rank_params = self._relevance(search_term, field)
+        sql = (f"SELECT {_LIST_COLUMNS} FROM words w WHERE {condition} "
+               f"ORDER BY {rank}, w.id DESC LIMIT ? OFFSET ?")
+        with self._lock:
+            rows = self._connection().execute(
+                sql, params + rank_params + [limit or -1, skip]
+            ).fetchall()
+        return [_row_to_word_row(row) for row in rows]
+
+    def count_matches(self, search_term: str, cap: Optional[int] = None,
+                      field: str = "japanese") -> int:
+        if field == "japanese":
+            source, conditions, params = self._search_clause(search_term)
+            where = " AND ".join(conditions)
+        else:
+            source = "words w"
+            where, params = self._field_condition(search_term, field)
+        # 子查詢帶 LIMIT，達到上限後即停止掃描
+        sql = f"SELECT COUNT(*) FROM (SELECT 1 FROM {source} WHERE {where} LIMIT ?)"
+        with self._lock:
+            return self._connection().execute(sql, params + [cap or -1]).fetchone()[0]
+
+    @staticmethod
+    def _search_clause(search_term: str):
+        """
+        建立日文搜索的 FROM 與 WHERE 子句（資料表別名為 w）
+
+        Returns:
+            Tuple: (FROM 子句, 條件列表, 參數列表)
+        """
+        # 平假名、片假名與羅馬字統一為正規化鍵後比對
+        normalized = normalize_query(search_term)
+        column = "japanese_normalized"
+        if not normalized:
+            # 只有長音符號等被正規化去除的字元時，直接比對原文
+            normalized, column = search_term, "japanese"
+
+        if column == "japanese_normalized" and len(normalized) >= _TRIGRAM_MIN_LENGTH:
+            # 片語查詢：trigram 分詞下等同子字串匹配，走 FTS 索引
+            phrase = '"' + normalized.replace('"', '""') + '"'
+            return ("words_fts JOIN words w ON w.id = words_fts.rowid",
+                    ["words_fts MATCH ?"], [phrase])
+
+        # 短關鍵詞無法使用 trigram，退回 LIKE 掃描
+        pattern = "%" + re.sub(r"([\\%_])", r"\\\1", normalized) + "%"
+        return "words w", [f"w.{column} LIKE ? ESCAPE '\\'"], [pattern]
+
+    @classmethod
+    def _field_condition(cls, search_term: str, field: str):
+        """
+        建立解釋或全部模式的 WHERE 條件（資料表別名為 w）
+
+        Returns:
+            Tuple: (條件, 參數列表)
+        """
+        condition, params = cls._explanation_condition(search_term)
+        if field == "all":
+            source, conditions, japanese_params = cls._search_clause(search_term)
+            if source == "words w":
+                japanese = " AND ".join(conditions)
+            else:
+                japanese = "w.id IN (SELECT rowid FROM words_fts WHERE words_fts MATCH ?)"
+            condition = f"(({japanese}) OR ({condition}))"
+            params = japanese_params + params
+        return condition, params
+
+    @staticmethod
+    def _explanation_condition(search_term: str):
+        """解釋搜索條件：n-gram 詞元走全文索引縮小範圍，再以 instr 確認是連續子字串"""
+        normalized = normalize_explanation(search_term)
+        condition, params = "instr(normalize_explanation(w.explanation), ?) > 0", [normalized]
+        # 只含標點的 n-gram 不會成為詞元，無法用於全文索引
+        phrases = [
+            '"' + gram.replace('"', '""') + '"'
+            for gram in query_ngrams(normalized) if any(char.isalnum() for char in gram)
+        ]
+        if phrases:
+            condition = ("w.id IN (SELECT rowid FROM words_explanation_fts "
+                         "WHERE words_explanation_fts MATCH ?) AND " + condition)
+            params = [" ".join(phrases)] + params
+        return condition, params
+
+    @staticmethod
+    def _relevance(search_term: str, field: str):
+        """
+        相關度分級的 ORDER BY 表達式（越小越相關），分級與 MongoStorage 相同：
+        0-2 日文完全相同、開頭相同、包含；3-6 解釋完全相同、為完整義項、開頭相同、包含
+
+        Returns:
+            Tuple: (表達式, 參數列表)
+        """
+        cases, params = [], []
+        normalized = normalize_query(search_term)
+        if field == "all" and normalized:
+            cases += [
+                "WHEN w.japanese_normalized = ? THEN 0",
+                "WHEN instr(w.japanese_normalized, ?) = 1 THEN 1",
+                "WHEN instr(w.japanese_normalized, ?) > 0 THEN 2",
+            ]
+            params += [normalized] * 3
+        explanation = normalize_explanation(search_term)
+        normalized_explanation = "normalize_explanation(w.explanation)"
+        cases += [
+            f"WHEN {normalized_explanation} = ? THEN 3",
+            f"WHEN instr({_separated(normalized_explanation)}, '；' || ? || '；') > 0 THEN 4",
+            f"WHEN instr({normalized_explanation}, ?) = 1 THEN 5",
+        ]
+        params += [explanation] * 3
+        return f"CASE {' '.join(cases)} ELSE 6 END", params
+
+    def _select_page(self, source: str, conditions: List[str], params: List[Any],
+                     limit: Optional[int], sort_by: str, sort_order: int, skip: int,
+                     anchor: Any, backward: bool) -> List[WordRow]:
+        """按排序與 keyset 邊界查詢一頁（語義與 pagination.find_page 一致）"""
+        column = "w." + _SORT_COLUMNS[sort_by]
+        order = -sort_order if (anchor is not None and backward) else sort_order
+        direction = "DESC" if order == -1 else "ASC"
+
+        conditions, params = list(conditions), list(params)
+        if anchor is not None:
+            operator = "<" if order == -1 else ">"
+            if column == "w.id":
+                conditions.append(f"w.id {operator} ?")
+                params.append(anchor)
+            else:
+                # 以 id 作為同值的次序，與 keyset_filter 的語義一致
+                conditions.append(f"({column}, w.id) {operator} (?, ?)")
+                params.extend(anchor)
+            skip = 0
+
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        order_by = (f"{column} {direction}" if column == "w.id"
+                    else f"{column} {direction}, w.id {direction}")
+        sql = (f"SELECT {_LIST_COLUMNS} FROM {source} {where}"
+               f"ORDER BY {order_by} LIMIT ? OFFSET ?")
+        with self._lock:
+            rows = self._connection().execute(
+                sql, params + [limit or -1, skip]
+            ).fetchall()
+
+        docs = [_row_to_word_row(row) for row in rows]
+        if anchor is not None and backward:
+            docs.reverse()
+        return docs
+
+    def get_word(self, word_id: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT id, japanese, explanation FROM words WHERE id = ?", (word_id,)
+            ).fetchone()
+        return _row_to_doc(row) if row else None
+
+    def update_word(self, word_id: Any, japanese: str, explanation: str) -> bool:
+        _validate(japanese)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute(
+                    "UPDATE words SET japanese = ?, explanation = ?, japanese_normalized = ? "
+                    "WHERE id = ? AND (japanese IS NOT ? OR explanation IS NOT ?)",
+                    (japanese, explanation, normalize_kana(japanese),
+                     word_id, japanese, explanation),
+                )
+                if cursor.rowcount > 0:
+                    conn.execute(_EXPLANATION_FTS_UPSERT,
+                                 (word_id, _explanation_tokens(explanation)))
+            return cursor.rowcount > 0
+
+    def delete_word(self, word_id: Any) -> bool:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute("DELETE FROM words WHERE id = ?", (word_id,))
+            return cursor.rowcount > 0
+
+    def delete_words(self, word_ids: List[Any],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        deleted = 0
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(word_ids), batch_size):
+                batch = list(word_ids[start:start + batch_size])
+                placeholders = ",".join("?" * len(batch))
+                with conn:
+                    cursor = conn.execute(
+                        f"DELETE FROM words WHERE id IN ({placeholders})", batch
+                    )
+                deleted += cursor.rowcount
+        return deleted
+
+    def count_words(self, exact: bool = False) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM words").fetchone()[0]
+
+    def iter_words(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        # 按 id 分批讀取，不在整個迭代期間佔用鎖
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._connection().execute(
+                    "SELECT id, japanese, explanation FROM words WHERE id > ? "
+                    "ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _row_to_doc(row)
+            last_id = rows[-1][0]
+
+    def due_reviews(self, now: float, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT {_CARD_COLUMNS} FROM words WHERE due <= ? ORDER BY due, id LIMIT ?",
+                (now, limit),
+            ).fetchall()
+        return [_row_to_card(row) for row in rows]
+
+    def new_reviews(self, limit: int) -> List[Dict[str, Any]]:
+        # due IS NULL 由 (due, id) 索引定位，結果已按 id 排序
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT {_CARD_COLUMNS} FROM words WHERE due IS NULL ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [_row_to_card(row) for row in rows]
+
+    def save_review(self, word_id: Any, expected_due: Optional[float],
+                    state: Dict[str, Any]) -> bool:
+        assignments = ", ".join(f"{field} = ?" for field in REVIEW_FIELDS)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute(
+                    f"UPDATE words SET {assignments} WHERE id = ? AND due IS ?",
+                    [state[field] for field in REVIEW_FIELDS] + [word_id, expected_due],
+                )
+        return cursor.rowcount == 1
+
+    def count_due_reviews(self, now: float) -> int:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT COUNT(*) FROM words WHERE due <= ?", (now,)
+            ).fetchone()[0]
+
+    def sample_words(self, size: int) -> List[Dict[str, Any]]:
+        # 在 ID 範圍內隨機取 ID，經主鍵逐一定位（MIN/MAX 也由主鍵直接得到），不掃描整表
+        found: Dict[int, Dict[str, Any]] = {}
+        with self._lock:
+            conn = self._connection()
+            low, high = conn.execute("SELECT MIN(id), MAX(id) FROM words").fetchone()
+            if low is None:
+                return []
+            ids = range(low, high + 1)
+            for _ in range(_SAMPLE_ATTEMPTS):
+                missing = size - len(found)
+                if missing <= 0:
+                    break
+                candidates = random.sample(ids, min(len(ids), missing * 2))
+                placeholders = ", ".join("?" * len(candidates))
+                for row in conn.execute(
+                    f"SELECT id, japanese, explanation FROM words WHERE id IN ({placeholders})",
+                    candidates,
+                ):
+                    if len(found) < size:
+                        found.setdefault(row[0], _row_to_sample(row))
+            if len(found) < size:
+                rows = conn.execute(
+                    "SELECT id, japanese, explanation FROM words ORDER BY RANDOM() LIMIT ?", (size,)
+                ).fetchall()
+                return [_row_to_sample(row) for row in rows]
+        samples = list(found.values())
+        random.shuffle(samples)
+        return samples
+
+    def ping(self) -> bool:
+        with self._lock:
+            self._connection().execute("SELECT 1")
+        return True
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
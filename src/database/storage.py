@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional, List, Dict, Any, Iterator, Tuple, Type
+
+from pymongo.errors import DuplicateKeyError
+
+from .bulk import DEFAULT_BATCH_SIZE
+from .rows import WordRow
+from .circuit_breaker import CircuitBreaker
+
+# 專案根目錄：數據文件的預設位置不隨啟動目錄改變
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 存儲後端配置：可用環境變量切換到嵌入式 SQLite
+STORAGE_CONFIG = {
+    "BACKEND": os.environ.get("JPLEARN_STORAGE", "mongodb"),  # "mongodb" 或 "sqlite"
+    "SQLITE_PATH": os.environ.get("JPLEARN_SQLITE_PATH", os.path.join(BASE_DIR, "japanese.db")),
+    # 離線寫入日誌
+    "JOURNAL_PATH": os.environ.get("JPLEARN_JOURNAL_PATH", os.path.join(BASE_DIR, "write_journal.db")),
+}
+
+# 違反唯一單字約束的異常（新增或改名為已存在的日文）
+DUPLICATE_ERRORS: Tuple[Type[BaseException], ...] = (DuplicateKeyError, sqlite3.IntegrityError)
+
+# 搜索範圍：只搜日文、只搜解釋、兩者皆搜
+SEARCH_FIELDS = ("japanese", "explanation", "all")
+
+# 解釋與全部模式的排序方式：按相關度排序，只支持 skip 分頁
+RELEVANCE = "relevance"
+
+
+class StorageBackend(ABC):
+    """單字存儲後端基類：定義單字數據操作的接口，失敗時直接拋出異常"""
+
+    # 是否支持離線寫入（實現 new_word_id 與 apply_writes）；不支持時 WordCRUD 不使用寫入日誌
+    supports_offline_writes = False
+
+    @abstractmethod
+    def connect_async(self):
+        """開始建立連接（不阻塞調用方）"""
+        pass
+
+    @abstractmethod
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待連接完成
+        Args:
+            timeout: 最長等待秒數
+        Returns:
+            bool: 存儲是否可用
+        """
+        pass
+
+    @abstractmethod
+    def insert_word(self, japanese: str, explanation: str) -> Any:
+        """插入單字，返回新單字的 ID"""
+        pass
+
+    @abstractmethod
+    def upsert_word(self, japanese: str, explanation: str) -> Tuple[Any, bool]:
+        """以 japanese 匹配寫入單字（已存在則更新解釋），返回 (單字 ID, 是否新插入)"""
+        pass
+
+    @abstractmethod
+    def insert_words(self, words: List[Dict[str, str]],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        """批量插入單字，返回 {"inserted_ids": [...], "errors": [...]}"""
+        pass
+
+    @abstractmethod
+    def upsert_words(self, words: List[Dict[str, str]],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        """以 japanese 匹配批量寫入，返回 {"upserted", "modified", "errors"}"""
+        pass
+
+    @abstractmethod
+    def find_words(self, limit: int = 5, sort_by: str = "_id", sort_order: int = -1,
+                   skip: int = 0, anchor: Any = None,
+                   backward: bool = False) -> List[WordRow]:
+        """查詢一頁單字，參數與 pagination.find_page 相同，解釋在數據庫端截斷為預覽"""
+        pass
+
+    @abstractmethod
+    def search_words(self, search_term: str, limit: Optional[int] = None,
+                     sort_by: str = "_id", sort_order: int = -1, skip: int = 0,
+                     anchor: Any = None, backward: bool = False,
+                     field: str = "japanese") -> List[WordRow]:
+        """
+        按子字串搜索一頁單字，分頁參數與 find_words 相同，解釋在數據庫端截斷為預覽
+        Args:
+            limit: 每頁數量，None 表示返回全部匹配
+            field: 搜索範圍（見 SEARCH_FIELDS）；非 japanese 時按相關度排序（排序參數與 anchor 無效）
+        """
+        pass
+
+    @abstractmethod
+    def count_matches(self, search_term: str, cap: Optional[int] = None,
+                      field: str = "japanese") -> int:
+        """
+        計算搜索匹配數
+        Args:
+            cap: 計數上限，達到上限即停止（返回值等於 cap 表示可能還有更多）
+            field: 搜索範圍（見 SEARCH_FIELDS）
+        """
+        pass
+
+    @abstractmethod
+    def get_word(self, word_id: Any) -> Optional[Dict[str, Any]]:
+        """讀取單字的完整文檔（編輯時使用），不存在時返回 None"""
+        pass
+
+    @abstractmethod
+    def update_word(self, word_id: Any, japanese: str, explanation: str) -> bool:
+        """更新單字，返回內容是否有變化；改名為已存在的日文時拋出 DUPLICATE_ERRORS 之一"""
+        pass
+
+    @abstractmethod
+    def delete_word(self, word_id: Any) -> bool:
+        """刪除單字，返回是否刪除成功"""
+        pass
+
+    @abstractmethod
+    def delete_words(self, word_ids: List[Any],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """批量刪除單字，返回刪除數量"""
+        pass
+
+    @abstractmethod
+    def count_words(self, exact: bool = False) -> int:
+        """
+        獲取單字總數
+        Args:
+            exact: 是否精確計數（否則允許使用元數據估算）
+        """
+        pass
+
+    @abstractmethod
+    def iter_words(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """逐筆讀取全部單字（_id、japanese、explanation），按批從數據庫取回"""
+        pass
+
+    def iter_test_words(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """逐筆讀取測驗單字（tests 集合），沒有測驗資料的後端返回空"""
+        return iter(())
+
+    def find_test_words(self, rank: Optional[str] = None, limit: int = 5, sort_by: str = "_id",
+                        sort_order: int = -1, skip: int = 0, anchor: Any = None,
+                        backward: bool = False) -> List[WordRow]:
+        """按級別查詢一頁測驗單字，分頁參數與 find_words 相同；沒有測驗資料的後端返回空"""
+        return []
+
+    def count_test_words(self, rank: Optional[str] = None) -> int:
+        """計算某級別（None 表示全部）的測驗單字數；沒有測驗資料的後端返回 0"""
+        return 0
+
+    def get_test_word(self, word_id: Any) -> Optional[Dict[str, Any]]:
+        """讀取測驗單字的完整文檔，不存在時返回 None"""
+        return None
+
+    def sample_test_words(self, size: int, rank: Optional[str] = None) -> List[Dict[str, Any]]:
+        """按級別（None 表示全部）隨機抽取測驗單字，格式與 sample_words 相同；沒有測驗資料的後端返回空"""
+        return []
+
+    def new_word_id(self) -> Any:
+        """在客戶端產生新單字的 ID（離線新增時使用），不支持離線寫入的後端拋出 NotImplementedError"""
+        raise NotImplementedError("此存儲後端不支持離線寫入")
+
+    def apply_writes(self, ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        按順序重放寫入日誌的操作（見 write_journal），每批一次往返
+
+        Returns:
+            Dict: {"applied": 成功數, "conflicts": [{"op", "reason"}]}
+        """
+        raise NotImplementedError("此存儲後端不支持離線寫入")
+
+    @abstractmethod
+    def due_reviews(self, now: float, limit: int) -> List[Dict[str, Any]]:
+        """
+        按到期時間升序讀取已到期的卡片（見 review 模組）
+        Returns:
+            List[Dict]: [{"_id", "japanese", "explanation", "review": 複習狀態}]
+        """
+        pass
+
+    @abstractmethod
+    def new_reviews(self, limit: int) -> List[Dict[str, Any]]:
+        """按 ID 升序讀取從未複習過的卡片，格式與 due_reviews 相同"""
+        pass
+
+    @abstractmethod
+    def save_review(self, word_id: Any, expected_due: Optional[float],
+                    state: Dict[str, Any]) -> bool:
+        """寫入複習狀態：只在目前的到期時間等於 expected_due 時更新，返回是否更新"""
+        pass
+
+    @abstractmethod
+    def count_due_reviews(self, now: float) -> int:
+        """計算已到期的卡片數"""
+        pass
+
+    @abstractmethod
+    def sample_words(self, size: int) -> List[Dict[str, Any]]:
+        """
+        在數據庫端隨機抽取單字（不讀取整個集合）
+        Returns:
+            List[Dict]: 最多 size 筆 {"_id", "japanese", "explanation"}，順序隨機
+        """
+        pass
+
+    @abstractmethod
+    def ping(self) -> bool:
+        """檢查存儲是否可用（斷路器探測時調用，可在此重新連接）"""
+        pass
+
+    @abstractmethod
+    def close(self):
+        """關閉連接"""
+        pass
+
+
+class GuardedStorage:
+    """
+    經由斷路器調用的存儲後端：方法與 StorageBackend 相同
+
+    數據庫無法連接時，斷開期間的調用立即拋出 CircuitOpenError，不再逐次等待連接逾時。
+    """
+
+    # 不經過斷路器的方法：連接管理本身不應被拒絕
+    _UNGUARDED = {"connect_async", "wait_ready", "ping", "close"}
+
+    def __init__(self, backend: StorageBackend, breaker: CircuitBreaker):
+        self.backend = backend
+        self.breaker = breaker
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.backend, name)
+        if name in self._UNGUARDED or name.startswith("_") or not callable(attribute):
+            return attribute
+
+        def guarded(*args, **kwargs):
+            return self.breaker.call(attribute, *args, **kwargs)
+        return guarded
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+# 存儲後端的斷路器：連續連接失敗後快速失敗，背景探測到恢復時自動閉合
+storage_breaker = CircuitBreaker(probe=lambda: _get_backend().ping())
+
+
+def _get_backend() -> StorageBackend:
+    """獲取按 STORAGE_CONFIG 選擇的全局存儲後端（不經過斷路器）"""
+    return get_storage().backend
+
+
+def get_storage() -> GuardedStorage:
+    """獲取按 STORAGE_CONFIG 選擇的全局存儲後端（經由斷路器調用）"""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            if STORAGE_CONFIG["BACKEND"] == "sqlite":
+                from .sqlite_storage import SQLiteStorage
+                backend = SQLiteStorage(STORAGE_CONFIG["SQLITE_PATH"])
+            else:
+                from .mongo_storage import MongoStorage
+                backend = MongoStorage()
+            _storage = GuardedStorage(backend, storage_breaker)
+        return _storage
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import csv
+import gzip
+import json
+import os
+from itertools import islice
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Callable, Tuple
+
+from .bulk import DEFAULT_BATCH_SIZE
+
+# 支持的文件格式：文件名再加上 .gz 時以 gzip 壓縮
+FORMATS = ("jsonl", "csv")
+
+# 匯出的字段：_id 不匯出，由目標數據庫重新產生（MongoDB 與 SQLite 的 ID 類型不同）
+EXPORT_FIELDS = ("japanese", "explanation")
+
+
+def detect_format(path: str) -> str:
+    """
+    按文件名判斷格式
+
+    Raises:
+        ValueError: 不支持的擴展名
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    ext = os.path.splitext(name)[1].lstrip(".").lower()
+    if ext not in FORMATS:
+        raise ValueError(f"不支持的文件格式: {path}（支持 .jsonl、.csv，可再加 .gz）")
+    return ext
+
+
+def _open(path: str, mode: str, compressed: bool):
+    """以 UTF-8 文本方式打開文件，compressed 時經 gzip 壓縮或解壓"""
+    if compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def export_words(path: str, docs: Iterable[Dict[str, Any]],
+                 progress: Optional[Callable[[int], None]] = None,
+                 progress_every: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    將單字逐筆寫入 JSONL 或 CSV 文件（不在內存中保留已寫出的單字）
+
+    先寫入 <path>.part，完成後才改名為 path，中斷時不會留下不完整的備份。
+
+    Args:
+        path: 目標文件路徑，格式按擴展名決定
+        docs: 單字迭代器（例如數據庫游標）
+        progress: 進度回調，參數為已寫出的數量
+        progress_every: 每寫出多少筆回調一次
+
+    Returns:
+        int: 寫出的單字數
+    """
+    fmt = detect_format(path)
+    part = path + ".part"
+    count = 0
+    try:
+        with _open(part, "w", path.endswith(".gz")) as file:
+            writer = None
+            if fmt == "csv":
+                writer = csv.writer(file)
+                writer.writerow(EXPORT_FIELDS)
+            for doc in docs:
+                values = [doc.get(field) or "" for field in EXPORT_FIELDS]
+                if writer is not None:
+                    writer.writerow(values)
+                else:
+                    file.write(json.dumps(dict(zip(EXPORT_FIELDS, values)), ensure_ascii=False))
+                    file.write("\n")
+                count += 1
+                if progress and count % progress_every == 0:
+                    progress(count)
+        os.replace(part, path)
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+    if progress:
+        progress(count)
+    return count
+
+
+def read_words(path: str, offset: int = 0) -> Iterator[Dict[str, str]]:
+    """
+    逐筆讀取 JSONL 或 CSV 文件中的單字
+
+    Args:
+        path: 文件路徑，格式按擴展名決定
+        offset: 跳過前幾筆（中斷後繼續匯入）
+
+    Returns:
+        Iterator[Dict]: {"japanese", "explanation"}
+    """
+    fmt = detect_format(path)
+    with _open(path, "r", path.endswith(".gz")) as file:
+        if fmt == "csv":
+            records = csv.DictReader(file)
+        else:
+            records = (json.loads(line) for line in file if line.strip())
+        for record in islice(records, offset, None):
+            yield {field: record.get(field) or "" for field in EXPORT_FIELDS}
+
+
+def read_batches(path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 offset: int = 0) -> Iterator[Tuple[int, List[Dict[str, str]]]]:
+    """
+    按批讀取文件中的單字
+
+    Args:
+        path: 文件路徑
+        batch_size: 每批數量
+        offset: 跳過前幾筆
+
+    Returns:
+        Iterator[Tuple]: (本批第一筆在文件中的位置, 本批單字)
+    """
+    words = read_words(path, offset)
+    start = offset
+    while True:
+        batch = list(islice(words, batch_size))
+        if not batch:
+            return
+        yield start, batch
+        start += len(batch)
@@ -12,6 +12,53 @@ WORDS_VALIDATOR = {
                 },
                 "explanation": {
                     "bsonType": "string",
+                },
+                "japanese_normalized": {
+                    "bsonType": "string",
+                    "description": "japanese 的正規化鍵（平假名、去除長音），用於搜索"
+                },
+                "japanese_ngrams": {
+                    "bsonType": "array",
+                    "description": "正規化鍵的單字元與雙字元 n-gram，用於子字串搜索"
+                },
+                "explanation_normalized": {
+                    "bsonType": "string",
+                    "description": "explanation 的正規化文字（NFKC、小寫），用於按解釋搜索"
+                },
+                "explanation_ngrams": {
+                    "bsonType": "array",
+                    "description": "explanation 的單字元與雙字元 n-gram，用於按解釋搜索"
+                },
+                "review": {
+                    "bsonType": "object",
+                    "required": ["due", "interval", "ease", "reps", "lapses"],
+                    "description": "複習狀態（見 review 模組），由排程整體寫入",
+                    "properties": {
+                        "due": {
+                            "bsonType": ["number", "null"],
+                            "description": "下次複習時間（Unix 秒），null 表示新卡片"
+                        },
+                        "interval": {
+                            "bsonType": "number",
+                            "minimum": 0,
+                            "description": "複習間隔（秒）"
+                        },
+                        "ease": {
+                            "bsonType": "number",
+                            "minimum": 0,
+                            "description": "難易係數"
+                        },
+                        "reps": {
+                            "bsonType": ["int", "long"],
+                            "minimum": 0,
+                            "description": "連續記得的次數"
+                        },
+                        "lapses": {
+                            "bsonType": ["int", "long"],
+                            "minimum": 0,
+                            "description": "忘記的次數"
+                        }
+                    }
                 }
             }
         }
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, List, Dict, Any, Tuple
+
+from bson import json_util
+
+# 日誌操作類型
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+UPSERT = "upsert"  # 以 japanese 匹配寫入：是否新插入要到重放時才知道
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class WriteJournal:
+    """
+    離線寫入日誌：數據庫無法連接時按順序追加寫入操作，恢復後由調用方批量重放並刪除
+
+    以 SQLite 文件保存（WAL、synchronous=NORMAL）：每次追加是一個事務，
+    fsync 合併到 WAL 檢查點時進行，應用崩潰不會遺失已追加的操作。
+    操作以 MongoDB Extended JSON 保存，ObjectId 等類型可原樣還原。
+    """
+
+    def __init__(self, path: str):
+        """
+        初始化寫入日誌（首次使用時才打開文件）
+
+        Args:
+            path: 日誌文件路徑，":memory:" 表示不持久化
+        """
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._count: Optional[int] = None  # 待重放的操作數（快取，避免每次寫入都查詢）
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._count = conn.execute("SELECT COUNT(*) FROM journal").fetchone()[0]
+        return self._conn
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._conn is None and self.path != ":memory:" and not os.path.exists(self.path):
+                return 0  # 從未離線寫入：不必建立日誌文件
+            self._connection()
+            return self._count
+
+    def append(self, op: Dict[str, Any]) -> int:
+        """
+        追加一個寫入操作
+
+        Args:
+            op: {"op": INSERT/UPDATE/DELETE, "_id": 單字 ID, "japanese", "explanation"}，
+                UPSERT 沒有 _id
+
+        Returns:
+            int: 操作的序號
+        """
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO journal (op, created_at) VALUES (?, ?)",
+                    (json_util.dumps(op), time.time()),
+                )
+            self._count += 1
+            return cursor.lastrowid
+
+    def peek(self, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        按順序讀取最早的操作（不刪除）
+
+        Args:
+            limit: 最多讀取的數量
+
+        Returns:
+            List[Tuple]: (序號, 操作)
+        """
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT seq, op FROM journal ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+        return [(seq, json_util.loads(op)) for seq, op in rows]
+
+    def remove_through(self, seq: int) -> int:
+        """
+        刪除序號不大於 seq 的操作（已重放）
+
+        Returns:
+            int: 刪除的數量
+        """
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                removed = conn.execute("DELETE FROM journal WHERE seq <= ?", (seq,)).rowcount
+            self._count -= removed
+            return removed
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._count = None
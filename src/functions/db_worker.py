@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ThreadPoolExecutor
+
+from kivy.clock import Clock
+
+
+class DBWorker:
+    """數據庫工作線程：在背景執行查詢，並在 Kivy 主線程上回傳結果"""
+    def __init__(self, max_workers=1):
+        """
+        初始化工作線程
+        Args:
+            max_workers: 線程數量（預設 1，保證寫入與之後的讀取按提交順序執行）
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="db-worker",
+        )
+
+    def submit(self, task, *args, on_result=None, on_error=None):
+        """
+        提交背景任務
+        Args:
+            task: 在工作線程中執行的函數
+            *args: 傳給 task 的參數
+            on_result: 成功時在主線程調用，參數為 task 的返回值
+            on_error: 失敗時在主線程調用，參數為異常
+        Returns:
+            Future: 可用於取消尚未開始的任務
+        """
+        future = self._executor.submit(task, *args)
+        future.add_done_callback(
+            lambda f: Clock.schedule_once(lambda dt: self._deliver(f, on_result, on_error))
+        )
+        return future
+
+    def _deliver(self, future, on_result, on_error):
+        """在主線程上分發任務結果"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                print(f"Error in database task: {str(error)}")
+            return
+        if on_result:
+            on_result(future.result())
+
+    def shutdown(self):
+        """關閉工作線程並取消尚未開始的任務"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 全局工作線程實例
+db_worker = DBWorker()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+from database import PageCache, get_storage, words_page_cache
+from functions.db_worker import DBWorker
+
+MAX_IN_FLIGHT = 2  # 同時進行的預取數量上限
+
+# 預取使用獨立的工作線程，避免佔用前台查詢的隊列
+prefetch_worker = DBWorker()
+
+
+class PagePrefetcher:
+    """相鄰頁預取器：頁面顯示後在背景預先載入前後頁到頁面快取"""
+    def __init__(self, paginator, page_size, max_in_flight=MAX_IN_FLIGHT, worker=prefetch_worker):
+        """
+        初始化預取器
+        Args:
+            paginator: 單字管理器的 KeysetPaginator，預取結果的邊界也會記錄在其中
+            page_size: 每頁數量
+            max_in_flight: 同時進行的預取數量上限
+            worker: 執行預取的工作線程
+        """
+        self.paginator = paginator
+        self.page_size = page_size
+        self.max_in_flight = max_in_flight
+        self.worker = worker
+        self._in_flight = {}  # 頁碼 -> Future
+
+    def prefetch_around(self, page, total_pages):
+        """
+        預取指定頁的下一頁與上一頁
+        Args:
+            page: 當前頁碼
+            total_pages: 總頁數
+        """
+        targets = [p for p in (page + 1, page - 1) if 1 <= p <= total_pages]
+        self.cancel_except(targets)
+        for target in targets:
+            self._prefetch(target)
+
+    def cancel_except(self, pages=()):
+        """取消不在 pages 中的預取（用戶跳到其他頁時調用）"""
+        for page in [p for p in self._in_flight if p not in pages]:
+            self._in_flight.pop(page).cancel()
+
+    def _prefetch(self, page):
+        """提交單頁預取：已快取、已在進行或達到上限時跳過"""
+        if page in self._in_flight or len(self._in_flight) >= self.max_in_flight:
+            return
+        params = self.paginator.locate(page, self.page_size)
+        key = PageCache.make_key(params)
+        if words_page_cache.contains(key):
+            return
+
+        # 記錄快取版本，查詢期間若有寫入則丟棄結果
+        version = words_page_cache.version
+        future = self.worker.submit(
+            self._load,
+            params,
+            on_result=lambda docs: self._on_loaded(page, key, docs, version, future),
+            on_error=lambda e: self._finish(page, future),
+        )
+        self._in_flight[page] = future
+
+    @staticmethod
+    def _load(params):
+        """查詢一頁單字（工作線程）"""
+        return get_storage().find_words(**params)
+
+    def _on_loaded(self, page, key, docs, version, future):
+        """預取完成（主線程）：寫入快取並記錄邊界"""
+        if not self._finish(page, future):
+            return
+        if words_page_cache.put_if_current(key, docs, version):
+            self.paginator.record(page, docs)
+
+    def _finish(self, page, future):
+        """移除已完成的預取，返回該預取是否仍有效（未被取消或取代）"""
+        if self._in_flight.get(page) is not future:
+            return False
+        del self._in_flight[page]
+        return True
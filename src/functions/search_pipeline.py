@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+from kivy.clock import Clock
+
+from functions.db_worker import db_worker
+
+SEARCH_DEBOUNCE = 0.3  # 停止輸入多少秒後才發出查詢
+
+
+class SearchPipeline:
+    """搜索管線：輸入防抖、取消被取代的查詢，只顯示最新一次查詢的結果"""
+    def __init__(self, query, on_result, on_error=None, on_issue=None,
+                 debounce=SEARCH_DEBOUNCE, worker=db_worker):
+        """
+        初始化搜索管線
+        Args:
+            query: 在工作線程中執行的查詢函數，參數為搜索詞
+            on_result: 最新查詢完成時在主線程調用，參數為 (搜索詞, 結果)
+            on_error: 最新查詢失敗時在主線程調用，參數為異常
+            on_issue: 真正發出查詢時在主線程調用，參數為搜索詞（例如顯示載入指示器）
+            debounce: 防抖秒數，輸入停止超過此時間才發出查詢
+            worker: 執行查詢的工作線程
+        """
+        self.query = query
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_issue = on_issue
+        self.debounce = debounce
+        self.worker = worker
+
+        self._pending_term = None  # 等待防抖結束的搜索詞
+        self._event = None         # 防抖計時器
+        self._future = None        # 進行中的查詢
+        self._issued_term = None   # 最近一次發出（且未被取消）的搜索詞
+        self._seq = 0              # 查詢序號，結果返回時序號已過期則丟棄
+
+        # 統計：輸入次數、實際查詢次數、取消的查詢、丟棄的過期結果
+        self.requested = 0
+        self.issued = 0
+        self.cancelled = 0
+        self.stale = 0
+
+    def submit(self, term, immediate=False):
+        """
+        提交搜索詞：重新開始防抖計時，計時結束時只查詢最後一次提交的詞
+        Args:
+            term: 搜索關鍵詞
+            immediate: 是否跳過防抖立即查詢（點擊搜索圖標、按下 Enter）
+        """
+        self.requested += 1
+        self._pending_term = term
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        if immediate:
+            self._issued_term = None  # 明確要求搜索時即使搜索詞相同也重新查詢
+            self._fire()
+        elif self.debounce <= 0:
+            self._fire()
+        else:
+            self._event = Clock.schedule_once(lambda dt: self._fire(), self.debounce)
+
+    def cancel(self):
+        """取消等待中與進行中的查詢（例如搜索詞被清空）"""
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        self._pending_term = None
+        self._issued_term = None
+        self._seq += 1
+        self._cancel_future()
+
+    def _fire(self):
+        """防抖結束：發出查詢並取消被取代的舊查詢"""
+        self._event = None
+        term, self._pending_term = self._pending_term, None
+        # 與上一次查詢相同（例如輸入後又刪除）時不重複查詢
+        if term is None or term == self._issued_term:
+            return
+
+        self._seq += 1
+        seq = self._seq
+        self._cancel_future()
+        self._issued_term = term
+        self.issued += 1
+        if self.on_issue:
+            self.on_issue(term)
+        self._future = self.worker.submit(
+            self.query,
+            term,
+            on_result=lambda results: self._on_done(seq, term, results),
+            on_error=lambda e: self._on_failed(seq, e),
+        )
+
+    def _cancel_future(self):
+        """取消尚未開始的查詢；已在執行的查詢由序號丟棄其結果"""
+        if self._future is not None and self._future.cancel():
+            self.cancelled += 1
+        self._future = None
+
+    def _on_done(self, seq, term, results):
+        """查詢完成（主線程）：只處理最新一次查詢"""
+        if seq != self._seq:
+            self.stale += 1
+            return
+        self._future = None
+        self.on_result(term, results)
+
+    def _on_failed(self, seq, error):
+        """查詢失敗（主線程）：允許之後以相同搜索詞重試"""
+        if seq != self._seq:
+            self.stale += 1
+            return
+        self._future = None
+        self._issued_term = None
+        if self.on_error:
+            self.on_error(error)
+        else:
+            print(f"Error searching words: {str(error)}")
+
+    def stats(self):
+        """
+        返回管線統計
+        Returns:
+            dict: requested（提交次數）、issued（查詢次數）、saved（防抖省下的查詢）、
+                  cancelled（取消的查詢）、stale（丟棄的過期結果）
+        """
+        return {
+            "requested": self.requested,
+            "issued": self.issued,
+            "saved": self.requested - self.issued,
+            "cancelled": self.cancelled,
+            "stale": self.stale,
+        }
@@ -9,15 +9,31 @@ from math import ceil
 from kivy.uix.label import Label
 from kivy.clock import Clock
 
-from database import words_collection
-from components import ConfirmButton, CancelButton, ConfirmLabel, WordItem, LoadingIndicator
+from database import (
+    WordCRUD, TestCRUD, KeysetPaginator, PageCache, get_storage, words_page_cache, storage_breaker
+)
+from database.circuit_breaker import CLOSED, CONNECTION_ERRORS
+from database.storage import RELEVANCE, DUPLICATE_ERRORS
+from database.crud import SEARCH_COUNT_CAP
+from components import (
+    ConfirmButton, CancelButton, ConfirmLabel, WordItem, SuggestionItem, LoadingIndicator
+)
+from functions.db_worker import db_worker
+from functions.page_prefetcher import PagePrefetcher
+from functions.search_pipeline import SearchPipeline
 
 TEST_MODE = False  # 開啟測試模式
 
 class WordManager(ScrollView):
-    """單字管理器：負責單字的增刪改查和分頁顯示"""
-    def __init__(self, **kwargs):
+    """單字管理器：負責單字的增刪改查和分頁顯示，數據庫操作都在背景線程執行"""
+    def __init__(self, on_view_updated=None, **kwargs):
+        """
+        初始化單字管理器
+        Args:
+            on_view_updated: 每次載入完成、頁數可能改變時的回調（用於同步分頁控件）
+        """
         super().__init__(**kwargs)
+        self.on_view_updated = on_view_updated
         # 創建垂直佈局容器
         self.layout = BoxLayout(
             orientation="vertical",
@@ -43,128 +59,375 @@ class WordManager(ScrollView):
         self.current_page = 1         # 當前頁碼
         self.items_per_page = 5       # 每頁顯示5個單字
         self.total_pages = 1          # 總頁數
+        self.paginator = KeysetPaginator()  # 記錄每頁邊界，按 _id 降序翻頁
+        self.prefetcher = PagePrefetcher(self.paginator, self.items_per_page)  # 預取相鄰頁
         
-        # 初始化搜索相關的狀態
+        # 初始化搜索相關的狀態：搜索結果在數據庫端分頁，內存只保留當前頁
         self.search_mode = False      # 是否處於搜索模式
-        self.search_results = []      # 搜索結果列表
+        self.search_term = ""         # 當前顯示結果的搜索關鍵詞
+        self.search_field = "japanese"  # 搜索範圍："japanese"、"explanation" 或 "all"
+        self.search_result_field = "japanese"  # 當前顯示結果的搜索範圍
+        self.search_total = 0         # 匹配數（達到計數上限時為上限值）
+        self.search_count_cap = SEARCH_COUNT_CAP  # 當前計數上限
+        self.search_paginator = KeysetPaginator()  # 搜索結果的頁面邊界
+        self.search_suggestions = []  # 沒有匹配時的模糊搜索建議
         self.last_search_term = ""    # 最後的搜索關鍵詞
+
+        # 級別瀏覽：選擇級別時改為只讀瀏覽 tests 集合中該級別的單字
+        self.rank = None              # 當前級別，None 表示瀏覽 words 集合
+        self.rank_paginator = KeysetPaginator()  # 級別列表的頁面邊界
+
+        # 搜索管線：防抖並只顯示最新一次搜索的結果
+        self.search_pipeline = SearchPipeline(
+            self._query_search,
+            on_result=self._on_search_loaded,
+            on_issue=lambda query: self._show_loading(),
+            on_error=lambda e: self._on_load_error(self._load_seq, e),
+        )
+
+        # 請求序號：結果返回時序號已過期（用戶已翻頁）則丟棄
+        self._load_seq = 0
+
+        # 最後顯示的單字項：離線時載入失敗，繼續顯示這些項（含本地已做的修改）
+        self.shown_items = []
+
+        # 數據庫恢復連接時自動重新載入
+        storage_breaker.add_listener(self._on_storage_state)
         
         # 載入單字數據
         self.load_words_from_db()
 
-    def search_words(self, search_term):
-        """搜索單字：根據輸入的關鍵詞搜索單字"""
-        try:
-            self.last_search_term = search_term
-            if not search_term:  # 如果搜索詞為空，返回普通顯示模式
-                self.search_mode = False
-                self.load_words_from_db()
-                return
-
-            # 進入搜索模式
-            self.search_mode = True
-            # 使用正則表達式進行模糊搜索
-            self.search_results = list(
-                words_collection.find(
-                    {"japanese": {"$regex": search_term, "$options": "i"}}
-                )
-            )
-            # 更新分頁信息
-            self.total_pages = max(1, ceil(len(self.search_results) / self.items_per_page))
+    def search_words(self, search_term, immediate=False):
+        """
+        搜索單字：根據輸入的關鍵詞搜索單字（經防抖後在背景查詢）
+        Args:
+            search_term: 搜索關鍵詞
+            immediate: 是否跳過防抖立即查詢
+        """
+        self.last_search_term = search_term
+        if not search_term:  # 如果搜索詞為空，返回普通顯示模式
+            self.search_pipeline.cancel()
+            self.search_mode = False
             self.current_page = 1
-            self.update_view()
-        except Exception as e:
-            print(f"Error searching words: {str(e)}")
+            self.load_words_from_db()
+            return
+
+        self.search_pipeline.submit((search_term, self.search_field), immediate)
+
+    def set_search_field(self, field):
+        """
+        切換搜索範圍：已有搜索詞時立即按新範圍重新搜索
+        Args:
+            field: "japanese"、"explanation" 或 "all"
+        """
+        self.search_field = field
+        if self.last_search_term:
+            self.search_words(self.last_search_term, immediate=True)
+
+    def set_rank(self, rank):
+        """
+        切換瀏覽的級別：清除搜索並從第一頁載入
+        Args:
+            rank: 級別（見 TEST_RANKS），None 表示回到 words 集合
+        """
+        self.rank = rank
+        self.rank_paginator.reset()
+        self.search_pipeline.cancel()
+        self.search_mode = False
+        self.last_search_term = ""
+        self.current_page = 1
+        self.load_words_from_db()
+
+    def _search_params(self, field, page):
+        """
+        搜索結果某一頁的查詢參數
+        日文搜索按 keyset 邊界翻頁；解釋與全部模式按相關度排序，以 skip 翻頁
+        """
+        if field == "japanese":
+            return self.search_paginator.locate(page, self.items_per_page)
+        return {"limit": self.items_per_page, "skip": (page - 1) * self.items_per_page,
+                "sort_by": RELEVANCE, "field": field}
+
+    def _query_search(self, query):
+        """執行搜索查詢（工作線程）：有上限的匹配數與第一頁結果，沒有匹配時附上模糊建議"""
+        search_term, field = query
+        total = get_storage().count_matches(search_term, SEARCH_COUNT_CAP, field)
+        words = self._query_search_page(search_term, self._search_params(field, 1))
+        # 模糊建議按日文讀音匹配，只搜索解釋時不適用
+        suggestions = (WordCRUD.fuzzy_search(search_term)
+                       if total == 0 and field != "explanation" else [])
+        return total, words, suggestions
+
+    @staticmethod
+    def _query_search_page(search_term, params):
+        """查詢一頁搜索結果（工作線程）"""
+        return words_page_cache.get_or_load(
+            PageCache.make_key(params, search_term),
+            lambda: get_storage().search_words(search_term, **params),
+        )
+
+    def _on_search_loaded(self, query, result):
+        """搜索結果返回（主線程）：管線已丟棄被新搜索取代的結果"""
+        # 進入搜索模式，顯示第一頁
+        self.search_mode = True
+        self.search_term, self.search_result_field = query
+        self.search_total, words, self.search_suggestions = result
+        self.search_count_cap = SEARCH_COUNT_CAP
+        self.search_paginator.reset()
+        self.current_page = 1
+        self._load_seq += 1
+        self._on_page_loaded(self._load_seq, 1, (self.search_total, words))
+
+    @property
+    def search_capped(self):
+        """搜索匹配數是否達到計數上限（實際可能更多）"""
+        return self.search_mode and self.search_total >= self.search_count_cap
+
+    def _extend_search_count(self):
+        """瀏覽到計數上限的最後一頁時，提高上限重新計數"""
+        self.search_count_cap *= 2
+        term, field, cap = self.search_term, self.search_result_field, self.search_count_cap
+
+        def on_counted(total):
+            if (self.search_mode and self.search_term == term
+                    and self.search_result_field == field):
+                self.search_total = total
+                self.total_pages = max(1, ceil(total / self.items_per_page))
+                self._notify_view_updated()
+
+        db_worker.submit(get_storage().count_matches, term, cap, field, on_result=on_counted)
 
     def load_words_from_db(self):
         """從數據庫加載單字：根據當前頁碼和搜索狀態加載對應的單字"""
-        # 清空當前佈局
+        self._load_seq += 1
+        seq = self._load_seq
+
+        self._show_loading()
+        page = self.current_page
+
+        # 搜索模式：在數據庫端查詢當前頁，匹配數沿用搜索時的計數
+        if self.search_mode:
+            params = self._search_params(self.search_result_field, page)
+            db_worker.submit(
+                self._query_search_page,
+                self.search_term,
+                params,
+                on_result=lambda words: self._on_page_loaded(
+                    seq, page, (self.search_total, words)
+                ),
+                on_error=lambda e: self._on_load_error(seq, e),
+            )
+            return
+
+        # 級別模式：按 {rank, _id} 索引以 keyset 邊界翻頁
+        if self.rank is not None:
+            db_worker.submit(
+                self._query_rank_page,
+                self.rank,
+                self.rank_paginator.locate(page, self.items_per_page),
+                on_result=lambda result: self._on_page_loaded(seq, page, result),
+                on_error=lambda e: self._on_load_error(seq, e),
+            )
+            return
+
+        # 用戶跳到其他頁時，取消與目標頁無關的預取
+        self.prefetcher.cancel_except([page])
+        params = self.paginator.locate(page, self.items_per_page)
+
+        def submit():
+            db_worker.submit(
+                self._query_page,
+                params,
+                on_result=lambda result: self._on_page_loaded(seq, page, result),
+                on_error=lambda e: self._on_load_error(seq, e),
+            )
+
+        if TEST_MODE:
+            # 測試模式：延遲 3 秒加載數據
+            Clock.schedule_once(lambda dt: submit(), 3)
+            return
+        submit()
+
+    @staticmethod
+    def _query_page(params):
+        """查詢一頁單字和總數（工作線程）"""
+        # 按ID降序，最新添加的顯示在前面；已瀏覽過的頁直接從快取返回
+        words = words_page_cache.get_or_load(
+            PageCache.make_key(params), lambda: get_storage().find_words(**params)
+        )
+        return WordCRUD.get_total_count(), words
+
+    @staticmethod
+    def _query_rank_page(rank, params):
+        """查詢某級別的一頁測驗單字和該級別總數（工作線程）"""
+        words = get_storage().find_test_words(rank, **params)
+        return TestCRUD.get_total_count(rank), words
+
+    def _show_loading(self):
+        """清空列表並顯示載入指示器（先記下目前顯示的單字項）"""
+        if self.loading not in self.layout.children:
+            self.shown_items = [
+                child for child in reversed(self.layout.children) if isinstance(child, WordItem)
+            ]
         self.layout.clear_widgets()
+        self.loading.start()
+        self.layout.add_widget(self.loading)
+
+    def _on_page_loaded(self, seq, page, result):
+        """頁面數據返回（主線程）：用戶已切換到其他頁時丟棄"""
+        if seq != self._load_seq:
+            return
+        total_words, words = result
+        if self.search_mode:
+            self.search_paginator.record(page, words)
+        elif self.rank is not None:
+            self.rank_paginator.record(page, words)
+        else:
+            self.paginator.record(page, words)
+
+        # 更新總頁數
+        self.total_pages = max(1, ceil(total_words / self.items_per_page))
+
+        # 刪除後當前頁可能超出範圍，改為載入最後一頁
+        if not words and self.current_page > self.total_pages:
+            self.current_page = self.total_pages
+            self.load_words_from_db()
+            return
+
+        self.loading.stop()
+        self.layout.clear_widgets()
+
+        # 離線修改重放時無法套用的（例如單字已在其他地方刪除），提示用戶
+        conflicts = WordCRUD.take_journal_conflicts()
+        if conflicts:
+            self.layout.add_widget(self._status_label(
+                f"{len(conflicts)} 筆離線修改無法同步：{conflicts[0]['reason']}"
+            ))
+
+        # 添加單字到界面
+        for word in words:
+            self.add_word(word["japanese"], word["explanation"], word["_id"], word["truncated"])
         
-        # 只在非搜索模式下顯示加載動畫
-        if not self.search_mode:
-            self.loading.start()
-            self.layout.add_widget(self.loading)
-            if TEST_MODE:
-                # 測試模式：延遲 3 秒加載數據
-                Clock.schedule_once(lambda dt: self._load_data(), 3)
-                return
-        
-        # 非測試模式：直接加載數據
-        self._load_data()
-
-    def _load_data(self):
-        """實際加載數據的方法"""
-        try:
-            if words_collection is None:
-                raise ConnectionError("無法連接到數據庫")
-            
-            # 根據搜索模式決定數據來源
-            if self.search_mode:
-                # 從搜索結果中獲取當前頁的數據
-                total_words = len(self.search_results)
-                words = self.search_results[
-                    (self.current_page - 1) * self.items_per_page : 
-                    self.current_page * self.items_per_page
-                ]
+        # 如果沒有數據，顯示提示信息
+        if not words:
+            no_data_label = Label(
+                text="暫無數據" if not self.search_mode else "未找到匹配的單字",
+                font_name="ChineseFont",
+                font_size='24sp',
+                bold=True,
+                color=(0.8, 0.8, 0.8, 1),
+                size_hint_y=None,
+                height=dp(60),
+                halign='center',
+                valign='middle'
+            )
+            if self.search_mode and self.search_suggestions:
+                # 沒有完全匹配時顯示打錯字的建議
+                no_data_label.text = "未找到匹配的單字，您是不是要找："
+                no_data_label.font_size = '20sp'
+                self.layout.add_widget(no_data_label)
+                for suggestion in self.search_suggestions:
+                    self.layout.add_widget(SuggestionItem(
+                        suggestion["japanese"],
+                        suggestion.get("explanation", ""),
+                        suggestion["source"],
+                        suggestion.get("rank"),
+                    ))
             else:
-                # 從數據庫中獲取當前頁的數據
-                total_words = words_collection.count_documents({})
-                skip = (self.current_page - 1) * self.items_per_page
-                words = list(
-                    words_collection.find()
-                    .sort([("_id", -1)])  # 按ID降序排序，最新添加的顯示在前面
-                    .skip(skip)
-                    .limit(self.items_per_page)
-                )
-
-            # 更新總頁數
-            self.total_pages = max(1, ceil(total_words / self.items_per_page))
-
-            # 添加單字到界面
-            for word in words:
-                self.add_word(word["japanese"], word["explanation"], word["_id"])
-            
-            # 如果沒有數據，顯示提示信息
-            if not words:
-                no_data_label = Label(
-                    text="暫無數據" if not self.search_mode else "未找到匹配的單字",
-                    font_name="ChineseFont",
-                    font_size='24sp',
-                    bold=True,
-                    color=(0.8, 0.8, 0.8, 1),
-                    size_hint_y=None,
-                    height=dp(60),
-                    halign='center',
-                    valign='middle'
-                )
                 # 添加一個空白 Widget 來推動文字向下
                 self.layout.add_widget(Widget(size_hint_y=None, height=dp(100)))
                 self.layout.add_widget(no_data_label)
-            
-        except Exception as e:
-            # 錯誤處理
-            error_label = Label(
+
+        self._notify_view_updated()
+
+        # 用戶通常會接著翻到相鄰頁，提前在背景載入
+        if not self.search_mode and self.rank is None:
+            self.prefetcher.prefetch_around(self.current_page, self.total_pages)
+        elif self.search_capped and self.current_page >= self.total_pages:
+            self._extend_search_count()
+
+    def _on_load_error(self, seq, error):
+        """頁面載入失敗（主線程）"""
+        if seq != self._load_seq:
+            return
+        self.loading.stop()
+        self.layout.clear_widgets()
+        print(f"Error loading words: {str(error)}")
+
+        offline = isinstance(error, CONNECTION_ERRORS) or storage_breaker.is_open
+        if not offline:
+            self.layout.add_widget(Label(
                 text="加載數據時發生錯誤",
                 font_name="ChineseFont",
                 color=(1, 0, 0, 1)  # 紅色文字
-            )
-            self.layout.add_widget(error_label)
-            print(f"Error loading words: {str(e)}")
-            
-        finally:
-            # 只在非搜索模式下停止加載動畫
-            if not self.search_mode:
-                self.loading.stop()
-
-    def add_word(self, japanese, explanation, word_id=None):
-        """添加單字到界面"""
+            ))
+            return
+
+        # 連接失敗：繼續顯示之前的單字項，並提示修改已暫存、恢復後自動同步
+        pending = WordCRUD.pending_writes()
+        if pending:
+            text = f"離線中：{pending} 筆修改已暫存，恢復連接後自動同步"
+        else:
+            text = "無法連接數據庫，恢復後自動重新載入"
+        self.layout.add_widget(self._status_label(text))
+        for word_item in self.shown_items:
+            self.layout.add_widget(word_item)
+
+    @staticmethod
+    def _status_label(text):
+        """列表頂部的狀態提示"""
+        return Label(
+            text=text,
+            font_name="ChineseFont",
+            color=(1, 0, 0, 1),  # 紅色文字
+            size_hint_y=None,
+            height=dp(40),
+        )
+
+    def _on_storage_state(self, state):
+        """斷路器狀態變化（探測線程）：恢復連接時回到主線程重新載入"""
+        if state == CLOSED:
+            Clock.schedule_once(lambda dt: self.reload())
+
+    def reload(self):
+        """重新載入當前的列表或搜索結果"""
+        if self.last_search_term:
+            self.search_words(self.last_search_term, immediate=True)
+        else:
+            self.load_words_from_db()
+
+    def release(self):
+        """視窗關閉時調用：取消搜索並停止接收斷路器通知"""
+        self.search_pipeline.cancel()
+        storage_breaker.remove_listener(self._on_storage_state)
+
+    def _notify_view_updated(self):
+        """通知外部頁數或頁碼已更新"""
+        if self.on_view_updated:
+            self.on_view_updated()
+
+    def go_to_page(self, page):
+        """切換到指定頁碼：相鄰頁使用 keyset 邊界，跳頁時退回 skip"""
+        self.current_page = max(1, min(page, self.total_pages))
+        self.update_view()
+
+    def on_word_added(self, japanese, explanation, word_id=None, pending=False):
+        """新增單字後的回調：新單字排在最前，所有頁面邊界都會移動"""
+        self.paginator.reset()
+        self.add_word(japanese, explanation, word_id, pending=pending)
+
+    def add_word(self, japanese, explanation, word_id=None, truncated=False, pending=False):
+        """添加單字到界面（pending 為暫存在離線日誌、尚未寫入數據庫的單字）"""
         word_item = WordItem(
             japanese,
             explanation,
             self.show_delete_confirmation,
             self.edit_word,
             word_id,
+            truncated=truncated,
+            load_callback=self.load_full_word,
+            readonly=self.rank is not None,
+            pending=pending,
         )
         # 新單字添加到頂部
         if self.current_page == 1:
@@ -218,43 +481,71 @@ class WordManager(ScrollView):
 
     def delete_word(self, word_item, popup):
         """刪除單字並更新界面"""
-        # 從數據庫中刪除
-        words_collection.delete_one({"_id": word_item.word_id})
-        # 從界面中移除
+        # 先從界面中移除，數據庫刪除完成後再重新載入當前頁
         self.layout.remove_widget(word_item)
+        popup.dismiss()
 
-        # 更新分頁信息
-        total_words = words_collection.count_documents({})
-        new_total_pages = max(1, ceil(total_words / self.items_per_page))
+        def on_deleted(deleted):
+            # 當前頁之前的頁面邊界不受影響，只需清除之後的
+            if self.search_mode:
+                self.search_total = max(0, self.search_total - int(deleted))
+                self.search_paginator.invalidate(self.current_page)
+            else:
+                self.paginator.invalidate(self.current_page)
+            self.update_view()
 
-        # 如果當前頁超出範圍，調整到最後一頁
-        if self.current_page > new_total_pages:
-            self.current_page = new_total_pages
+        # 從數據庫中刪除（經由 WordCRUD 以同步調整總數快取）
+        db_worker.submit(WordCRUD.delete_word, word_item.word_id, on_result=on_deleted)
 
-        self.update_view()
-        popup.dismiss()
+    def load_full_word(self, word_id, callback):
+        """在背景讀取單字的完整內容（列表中的解釋可能已截斷），完成後在主線程回調"""
+        db_worker.submit(
+            WordCRUD.get_word,
+            word_id,
+            on_result=callback,
+            on_error=lambda e: print(f"Error loading word: {str(e)}"),
+        )
 
     def edit_word(self, word_item, new_japanese, new_explanation):
-        """更新單字信息"""
-        words_collection.update_one(
-            {"_id": word_item.word_id},
-            {"$set": {"japanese": new_japanese, "explanation": new_explanation}},
+        """更新單字信息：界面已先行更新，數據庫寫入在背景執行，失敗時撤銷界面上的修改"""
+        db_worker.submit(
+            self._update_word_in_db,
+            word_item.word_id,
+            new_japanese,
+            new_explanation,
+            on_result=lambda updated: self._on_word_updated(word_item, updated),
+            on_error=lambda e: self._on_update_error(word_item, e),
         )
 
-    def update_view(self):
-        """更新界面顯示：重新計算頁數並刷新顯示"""
-        # 獲取總單字數
-        if self.search_mode:
-            total_words = len(self.search_results)
+    @staticmethod
+    def _update_word_in_db(word_id, japanese, explanation):
+        """寫入單字修改（工作線程）"""
+        # 經由 WordCRUD 寫入，使頁面快取失效
+        return WordCRUD.update_word(word_id, japanese, explanation)
+
+    def _on_word_updated(self, word_item, updated):
+        """修改寫入完成（主線程）：內容有變化卻沒有更新（單字已被刪除或寫入失敗）時撤銷"""
+        if not updated and word_item.edit_changed:
+            word_item.revert_edit()
+            self._show_edit_error("修改失敗，已恢復原內容")
+
+    def _on_update_error(self, word_item, error):
+        """修改寫入出錯（主線程）：撤銷界面上的修改並提示"""
+        print(f"Error updating word: {str(error)}")
+        attempted = word_item.word
+        word_item.revert_edit()
+        if isinstance(error, DUPLICATE_ERRORS):
+            self._show_edit_error(f"單字「{attempted}」已存在，修改未保存")
         else:
-            total_words = words_collection.count_documents({})
+            self._show_edit_error("修改失敗，已恢復原內容")
 
-        # 更新分頁信息
-        new_total_pages = max(1, ceil(total_words / self.items_per_page))
-        self.total_pages = new_total_pages
-        self.current_page = min(self.current_page, self.total_pages)
+    def _show_edit_error(self, text):
+        """在列表頂部顯示修改失敗的提示（下次載入頁面時清除）"""
+        self.layout.add_widget(self._status_label(text), index=len(self.layout.children))
 
-        # 重新加載數據並更新分頁控件
+    def update_view(self):
+        """更新界面顯示：重新載入當前頁，頁數在載入完成後更新"""
+        if self.search_mode:
+            self.total_pages = max(1, ceil(self.search_total / self.items_per_page))
+            self.current_page = min(self.current_page, self.total_pages)
         self.load_words_from_db()
-        if hasattr(self, "parent") and hasattr(self.parent, "update_pagination"):
-            self.parent.update_pagination()
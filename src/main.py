@@ -3,6 +3,8 @@
 from kivy.app import App
 from kivy.core.window import Window
 from kivy.core.text import LabelBase
+from database import get_storage, WordCRUD
+from functions.db_worker import db_worker
 from ui import MainView
 
 
@@ -14,6 +16,9 @@ class JapaneseLearnApp(App):
             fn_regular="resources/fonts/NotoSansTC-VariableFont_wght.ttf",
         )
         Window.clearcolor = (0.94, 0.97, 1, 1)  # 設置窗口背景顏色為淺藍色
+        get_storage().connect_async()  # 在背景連接數據庫，不阻塞主界面顯示
+        if WordCRUD.pending_writes():
+            db_worker.submit(WordCRUD.replay_journal)  # 重放上次離線時未同步的修改
         return MainView()
 
 
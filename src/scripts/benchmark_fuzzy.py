@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import sys
+import os
+import time
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.database.fuzzy import FuzzyIndex, levenshtein, allowed_distance
+from src.database.kana import normalize_kana, normalize_query
+
+WORD_COUNT = 100000  # 索引單字數量
+QUERY_COUNT = 200    # 查詢次數
+LIMIT = 10           # 每次返回的建議數量
+MAX_DISTANCE = 2
+KANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをんがぎぐげござじずぜぞだでどばびぶべぼぱぴぷぺぽっゃゅょ"
+
+# 常見打錯字：促音、濁點、半濁點
+CONFUSIONS = {"っ": "つ", "つ": "っ", "か": "が", "が": "か", "さ": "ざ", "た": "だ",
+              "は": "ば", "ば": "ぱ", "ひ": "び", "ふ": "ぶ", "し": "じ", "と": "ど"}
+
+
+def make_words(count):
+    """生成固定隨機種子的測試單字（部分為片假名與長音）"""
+    rng = random.Random(42)
+    words = []
+    for i in range(count):
+        word = "".join(rng.choice(KANA) for _ in range(rng.randint(2, 6)))
+        if i % 5 == 0:
+            word = "".join(chr(ord(c) + 0x60) for c in word) + "ー"
+        words.append(word)
+    return words
+
+
+def make_typo(word, rng):
+    """模擬學習者打錯字：替換易混淆的假名、漏打或多打一個字"""
+    chars = list(normalize_kana(word))
+    for _ in range(rng.randint(1, MAX_DISTANCE)):
+        position = rng.randrange(len(chars))
+        kind = rng.random()
+        if kind < 0.5:
+            chars[position] = CONFUSIONS.get(chars[position], rng.choice(KANA))
+        elif kind < 0.75 and len(chars) > 1:
+            del chars[position]
+        else:
+            chars.insert(position, rng.choice(KANA))
+    return "".join(chars)
+
+
+def brute_force(term, keys):
+    """逐一計算編輯距離的暴力搜索（容許距離規則與索引相同）"""
+    query = normalize_query(term)
+    distance = allowed_distance(query, MAX_DISTANCE)
+    return {key for key in keys if levenshtein(query, key, distance) <= distance}
+
+
+def benchmark_fuzzy():
+    words = make_words(WORD_COUNT)
+    rng = random.Random(7)
+    queries = [make_typo(rng.choice(words), rng) for _ in range(QUERY_COUNT)]
+
+    index = FuzzyIndex(max_distance=MAX_DISTANCE)
+    start = time.perf_counter()
+    index.add_many((i, word, {"japanese": word}) for i, word in enumerate(words))
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"建立索引: {len(index)} 筆，{build_ms:.0f}ms")
+
+    keys = {normalize_kana(word) for word in words}
+    index_times, brute_times, mismatches = [], [], 0
+    for term in queries:
+        start = time.perf_counter()
+        index.lookup(term, limit=LIMIT)
+        index_times.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        expected = brute_force(term, keys)
+        brute_times.append((time.perf_counter() - start) * 1000)
+
+        # 比對完整結果集（不計時）
+        found = index.lookup(term, limit=len(words))
+        if {normalize_kana(doc["japanese"]) for _, doc in found} != expected:
+            mismatches += 1
+
+    def summary(times):
+        times = sorted(times)
+        return f"平均 {sum(times) / len(times):8.2f}ms  p95 {times[int(len(times) * 0.95)]:8.2f}ms"
+
+    print(f"SymSpell 索引:  {summary(index_times)}")
+    print(f"暴力編輯距離:   {summary(brute_times)}")
+    print("結果一致" if not mismatches else f"結果不一致: {mismatches} 個查詢")
+
+
+if __name__ == "__main__":
+    benchmark_fuzzy()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import sys
+import os
+import time
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from pymongo import MongoClient
+from src.database.mongodb import MONGODB_CONFIG
+from src.database.validators import WORDS_VALIDATOR
+from src.database.indexes import INDEXES, reconcile_indexes
+from src.database.mongo_storage import MongoStorage
+from src.database.sqlite_storage import SQLiteStorage
+from src.database.review import GRADES, DAY, schedule
+
+CARD_COUNT = 50000     # 卡片總數
+REVIEWED_COUNT = 20000 # 已複習過的卡片數（其餘為新卡片）
+SESSION_SIZE = 20      # 每次取出的卡片數
+ROUNDS = 50            # 取卡片的次數
+GRADE_COUNT = 200      # 評分次數
+TARGET_MS = 10         # 取一次卡片的目標耗時
+KANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをん"
+
+
+def make_words(count):
+    """生成不重複的測試單字（以假名表示序號）"""
+    words = []
+    for i in range(count):
+        digits, n = [], i
+        while True:
+            n, r = divmod(n, len(KANA))
+            digits.append(KANA[r])
+            if n == 0:
+                break
+        words.append({"japanese": "".join(digits) + "の", "explanation": f"卡片 {i}"})
+    return words
+
+
+def seed_reviews(storage, now):
+    """為部分卡片寫入隨機的複習狀態，到期時間分布在前後 30 天內"""
+    rng = random.Random(42)
+    cards = storage.new_reviews(REVIEWED_COUNT)
+    for card in cards:
+        state = schedule(None, rng.choice(GRADES[1:]), now - rng.uniform(0, 30 * DAY))
+        state["due"] += rng.uniform(-30 * DAY, 30 * DAY)
+        storage.save_review(card["_id"], None, state)
+
+
+def next_cards(storage, now):
+    """與 ReviewScheduler.next_cards 相同：到期卡片優先，不足時補新卡片"""
+    cards = storage.due_reviews(now, SESSION_SIZE)
+    if len(cards) < SESSION_SIZE:
+        cards.extend(storage.new_reviews(SESSION_SIZE - len(cards)))
+    return cards
+
+
+def run_workload(storage, now):
+    """
+    對存儲後端執行同一組複習操作
+    Returns:
+        Dict: 各操作平均耗時 ms
+    """
+    timings = {}
+    storage.insert_words(make_words(CARD_COUNT))
+    seed_reviews(storage, now)
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        next_cards(storage, now)
+    timings["取到期卡片"] = (time.perf_counter() - start) * 1000 / ROUNDS
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        storage.new_reviews(SESSION_SIZE)
+    timings["取新卡片"] = (time.perf_counter() - start) * 1000 / ROUNDS
+
+    # 逐張評分：每次評分後重新取卡片，到期佇列隨之前進
+    rng = random.Random(43)
+    graded = 0
+    start = time.perf_counter()
+    while graded < GRADE_COUNT:
+        for card in next_cards(storage, now):
+            state = schedule(card["review"], rng.choice(GRADES), now)
+            storage.save_review(card["_id"], card["review"]["due"], state)
+            graded += 1
+    timings["評分"] = (time.perf_counter() - start) * 1000 / graded
+
+    start = time.perf_counter()
+    storage.count_due_reviews(now)
+    timings["計算到期數"] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def benchmark_review():
+    now = time.time()
+    backends = {"SQLite": SQLiteStorage(":memory:")}
+    client = MongoClient(MONGODB_CONFIG["URL"], serverSelectionTimeoutMS=MONGODB_CONFIG["TIMEOUT"])
+    try:
+        client.server_info()
+        db = client["japanese_benchmark"]
+        db.drop_collection("words")
+        db.create_collection("words", **WORDS_VALIDATOR)
+        reconcile_indexes(db["words"], INDEXES["words"])
+        backends["MongoDB"] = MongoStorage(db["words"])
+    except Exception as e:
+        print(f"無法連接到 MongoDB，只測試 SQLite: {e}\n")
+
+    results = {}
+    for name, storage in backends.items():
+        results[name] = run_workload(storage, now)
+        storage.close()
+
+    names = list(results)
+    print(f"{CARD_COUNT} 張卡片，每次取 {SESSION_SIZE} 張（平均耗時）")
+    print(f"{'操作':<20}" + "".join(f"{name:>12}" for name in names))
+    for label in results[names[0]]:
+        print(f"{label:<20}" + "".join(f"{results[name][label]:>10.2f}ms" for name in names))
+
+    slow = [name for name in names if results[name]["取到期卡片"] > TARGET_MS]
+    print(f"\n取卡片均在 {TARGET_MS}ms 內" if not slow else f"\n取卡片超過 {TARGET_MS}ms: {slow}")
+
+    if "MongoDB" in backends:
+        client.drop_database("japanese_benchmark")
+    client.close()
+
+
+if __name__ == "__main__":
+    benchmark_review()
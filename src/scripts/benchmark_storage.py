@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import sys
+import os
+import time
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from pymongo import MongoClient
+from src.database.mongodb import MONGODB_CONFIG
+from src.database.validators import WORDS_VALIDATOR
+from src.database.indexes import INDEXES, reconcile_indexes
+from src.database.mongo_storage import MongoStorage
+from src.database.sqlite_storage import SQLiteStorage
+from src.database.pagination import KeysetPaginator
+
+WORD_COUNT = 20000   # 測試單字數量
+PAGE_SIZE = 5        # 每頁數量
+PAGES = 200          # 連續翻頁次數
+SEARCH_TERMS = ["あい", "かきく", "さしすせ", "ん"]
+KANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをん"
+# 解釋搜索：(關鍵詞, 搜索範圍)，按相關度排序取前 RANKED_LIMIT 筆比對
+EXPLANATION_SEARCHES = [("謝謝", "explanation"), ("學", "explanation"),
+                        ("apple", "explanation"), ("かき", "all")]
+RANKED_LIMIT = 50
+GLOSSES = ["謝謝", "感謝", "學校", "學生", "大學", "吃飯", "喝水", "蘋果", "apple", "pineapple",
+           "老師", "朋友", "時間", "天氣", "電車", "寫字", "看書", "雨", "雪", "花"]
+
+
+def make_words(count):
+    """生成固定隨機種子的測試單字（日文不重複，兩個後端都能全部插入）"""
+    rng = random.Random(42)
+    gloss_rng = random.Random(43)  # 解釋另用一個種子，跳過重複的日文不影響解釋
+    seen = set()
+    words = []
+    while len(words) < count:
+        japanese = "".join(rng.choice(KANA) for _ in range(rng.randint(2, 6)))
+        if japanese in seen:
+            continue
+        seen.add(japanese)
+        words.append({
+            "japanese": japanese,
+            "explanation": "；".join(gloss_rng.sample(GLOSSES, gloss_rng.randint(1, 3)))
+                           + f" {len(words)}",
+        })
+    return words
+
+
+def timed(label, results, func):
+    """執行並記錄耗時"""
+    start = time.perf_counter()
+    value = func()
+    results[label] = (time.perf_counter() - start) * 1000
+    return value
+
+
+def run_workload(storage, words):
+    """
+    對存儲後端執行同一組操作
+    Returns:
+        Tuple[Dict, Dict]: (各操作耗時 ms, 用於比對兩個後端的結果)
+    """
+    timings, outputs = {}, {}
+    report = timed("批量插入", timings, lambda: storage.insert_words(words))
+    outputs["inserted"] = len(report["inserted_ids"])
+    outputs["rejected"] = [error["index"] for error in report["errors"]]
+
+    def page_through():
+        paginator = KeysetPaginator()
+        pages = []
+        for page in range(1, PAGES + 1):
+            docs = storage.find_words(**paginator.locate(page, PAGE_SIZE))
+            paginator.record(page, docs)
+            pages.append([doc["japanese"] for doc in docs])
+        return pages
+    outputs["pages"] = timed(f"keyset 翻 {PAGES} 頁", timings, page_through)
+
+    outputs["deep_skip"] = [doc["japanese"] for doc in timed(
+        "skip 跳到最後一頁", timings,
+        lambda: storage.find_words(limit=PAGE_SIZE, skip=len(words) - PAGE_SIZE),
+    )]
+
+    for term in SEARCH_TERMS:
+        outputs[f"search:{term}"] = sorted(doc["japanese"] for doc in timed(
+            f"搜索 {term}", timings, lambda: storage.search_words(term)
+        ))
+
+    for term, field in EXPLANATION_SEARCHES:
+        outputs[f"search:{field}:{term}"] = [doc["japanese"] for doc in timed(
+            f"搜索 {term}（{field}）", timings,
+            lambda: storage.search_words(term, limit=RANKED_LIMIT, field=field),
+        )]
+        outputs[f"count:{field}:{term}"] = storage.count_matches(term, field=field)
+
+    outputs["count"] = timed("精確計數", timings, lambda: storage.count_words(exact=True))
+
+    first = storage.find_words(limit=1)[0]
+    outputs["updated"] = timed(
+        "更新單字", timings, lambda: storage.update_word(first["_id"], "こうしん", "更新")
+    )
+    outputs["deleted"] = timed("刪除單字", timings, lambda: storage.delete_word(first["_id"]))
+    return timings, outputs
+
+
+def benchmark_storage():
+    words = make_words(WORD_COUNT)
+    words.append({"japanese": "abc", "explanation": "不合法的單字"})  # 兩個後端都應拒絕
+
+    backends = {"SQLite": SQLiteStorage(":memory:")}
+    client = MongoClient(MONGODB_CONFIG["URL"], serverSelectionTimeoutMS=MONGODB_CONFIG["TIMEOUT"])
+    try:
+        client.server_info()
+        db = client["japanese_benchmark"]
+        db.drop_collection("words")
+        db.create_collection("words", **WORDS_VALIDATOR)
+        # 與應用相同的索引，否則 MongoDB 的搜索與翻頁都是全表掃描
+        reconcile_indexes(db["words"], INDEXES["words"])
+        backends["MongoDB"] = MongoStorage(db["words"])
+    except Exception as e:
+        print(f"無法連接到 MongoDB，只測試 SQLite: {e}\n")
+
+    results = {}
+    for name, storage in backends.items():
+        results[name] = run_workload(storage, words)
+        storage.close()
+
+    # 輸出耗時
+    names = list(results)
+    print(f"{'操作':<20}" + "".join(f"{name:>12}" for name in names))
+    for label in results[names[0]][0]:
+        print(f"{label:<20}" + "".join(f"{results[name][0][label]:>10.1f}ms" for name in names))
+
+    # 比對兩個後端的結果
+    if len(names) == 2:
+        left, right = (results[name][1] for name in names)
+        mismatches = [key for key in left if left[key] != right[key]]
+        print("\n結果一致" if not mismatches else f"\n結果不一致: {mismatches}")
+
+    if "MongoDB" in backends:
+        client.drop_database("japanese_benchmark")
+    client.close()
+
+
+if __name__ == "__main__":
+    benchmark_storage()
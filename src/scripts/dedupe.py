@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from pymongo import MongoClient
+from src.database.mongodb import MONGODB_CONFIG
+from src.database.dedupe import dedupe_all
+
+
+def dedupe(dry_run):
+    """合併 words 與 tests 中的重複單字並列出合併結果（結構遷移時已自動執行一次）"""
+    client = MongoClient(MONGODB_CONFIG["URL"], serverSelectionTimeoutMS=MONGODB_CONFIG["TIMEOUT"])
+    try:
+        client.server_info()
+    except Exception as e:
+        print(f"無法連接到 MongoDB: {e}")
+        return
+
+    db = client[MONGODB_CONFIG["DB_NAME"]]
+    for name, report in dedupe_all(db, dry_run=dry_run).items():
+        action = "將合併" if dry_run else "已合併"
+        print(f"{name}: {action} {report['groups']} 組重複，刪除 {report['removed']} 筆")
+        for sample in report["samples"]:
+            rank = f" [{sample['rank']}]" if "rank" in sample else ""
+            print(f"  {sample['japanese']}{rank} x{sample['count']} -> {sample['explanation']}")
+        if report["groups"] > len(report["samples"]):
+            print(f"  ……另有 {report['groups'] - len(report['samples'])} 組")
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="合併重複單字（重啟應用後會建立唯一索引）")
+    parser.add_argument("--dry-run", action="store_true", help="只列出重複，不修改數據")
+    dedupe(parser.parse_args().dry_run)
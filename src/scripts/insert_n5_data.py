@@ -1,80 +1,167 @@
 # -*- coding: utf-8 -*-
 import sys
 import os
+import re
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from src.database.mongodb import MongoDBManager
+from src.database.bulk import upsert_many_batched
 import tabula
 import pandas as pd
 
 # 使用 os.path 來構建絕對路徑
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 DATA_FILE_PATH = os.path.join(BASE_DIR, 'resources', 'docs', 'N5.pdf')
+CACHE_DIR = os.path.join(BASE_DIR, '.cache', 'pdf_tables')  # 表格解析結果的快取
+CACHE_VERSION = 1      # 修改解析或過濾規則時遞增，使舊快取失效
+BATCH_SIZE = 500       # 每批寫入的筆數
+RANK = "N5"
+PAGES_PER_TASK = 10    # 每個工作進程解析的頁數
+MAX_WORKERS = os.cpu_count() or 1
+MATCH_KEYS = ("japanese", "rank")  # 重複匯入時以日文與級別匹配已有單字
+
+
+def file_hash(file_path):
+    """計算文件內容的 SHA-256（作為快取鍵）"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def count_pages(file_path):
+    """
+    從 PDF 的頁面對象估算頁數
+
+    Returns:
+        int: 頁數，頁面對象在壓縮的對象流中（無法直接計數）時返回 0
+    """
+    with open(file_path, 'rb') as f:
+        return len(re.findall(rb"/Type\s*/Page(?!s)", f.read()))
+
+
+def filter_table(df):
+    """
+    從表格取出前兩欄作為日文與解釋（向量化過濾空白與純數字的行）
+
+    Returns:
+        List[Dict]: [{"japanese", "explanation"}]
+    """
+    if len(df.columns) < 2:
+        return []
+    pairs = df.iloc[:, :2].dropna()
+    pairs.columns = ["japanese", "explanation"]
+    pairs = pairs.astype(str).apply(lambda column: column.str.strip())
+    valid = (pairs != "").all(axis=1) & ~pairs.apply(lambda column: column.str.isdigit()).any(axis=1)
+    return pairs[valid].to_dict("records")
+
+
+def extract_pages(file_path, pages):
+    """
+    解析指定頁的表格（在工作進程中執行，每次調用都會啟動一次 JVM）
+
+    Args:
+        file_path: PDF 文件路徑
+        pages: tabula 的頁碼參數，例如 "1-10" 或 "all"
+
+    Returns:
+        List[Dict]: 過濾後的單字
+    """
+    dfs = tabula.read_pdf(
+        file_path,
+        pages=pages,
+        lattice=True,
+        pandas_options={'header': None}
+    )
+    rows = []
+    for df in dfs:
+        rows.extend(filter_table(df))
+    return rows
+
+
+def extract_rows(file_path):
+    """解析整份 PDF：頁數多時按頁範圍分給多個進程並行解析，結果保持頁面順序"""
+    page_count = count_pages(file_path)
+    if page_count <= PAGES_PER_TASK or MAX_WORKERS == 1:
+        return extract_pages(file_path, 'all')
+
+    ranges = [
+        f"{start}-{min(start + PAGES_PER_TASK - 1, page_count)}"
+        for start in range(1, page_count + 1, PAGES_PER_TASK)
+    ]
+    rows = []
+    with ProcessPoolExecutor(max_workers=min(MAX_WORKERS, len(ranges))) as executor:
+        for part in executor.map(extract_pages, [file_path] * len(ranges), ranges):
+            rows.extend(part)
+    return rows
+
 
 def read_pdf_data(file_path):
-    """讀取 PDF 文件中的表格數據"""
+    """讀取 PDF 文件中的表格數據：同一內容的 PDF 只解析一次，之後從快取讀取"""
     if not os.path.exists(file_path):
         print(f"錯誤：找不到文件 '{file_path}'")
         print(f"當前工作目錄：{os.getcwd()}")
         print(f"檢查的完整路徑：{os.path.abspath(file_path)}")
         return []
 
-    data = []
-    try:
-        dfs = tabula.read_pdf(
-            file_path, 
-            pages='all',
-            lattice=True,
-            pandas_options={'header': None}
-        )
-        
-        for df in dfs:
-            if len(df.columns) >= 2:
-                for _, row in df.iterrows():
-                    japanese = str(row[0]).strip()
-                    explanation = str(row[1]).strip()
-                    
-                    if pd.notna(japanese) and pd.notna(explanation) and japanese != '' and explanation != '':
-                        if not japanese.isdigit() and not explanation.isdigit():
-                            data.append({
-                                "japanese": japanese,
-                                "rank": "N5",
-                                "explanation": explanation
-                            })
-    except Exception as e:
-        print(f"讀取 PDF 文件時發生錯誤: {e}")
-        print(f"錯誤詳情: {str(e)}")
-    return data
+    cache_path = os.path.join(CACHE_DIR, f"{file_hash(file_path)}-v{CACHE_VERSION}.json")
+    if os.path.exists(cache_path):
+        with open(cache_path, encoding='utf-8') as f:
+            rows = json.load(f)
+        print(f"使用快取的解析結果：{len(rows)} 筆")
+    else:
+        try:
+            rows = extract_rows(file_path)
+        except Exception as e:
+            print(f"讀取 PDF 文件時發生錯誤: {e}")
+            return []
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False)
+        os.replace(cache_path + '.tmp', cache_path)
+
+    return [{**row, "rank": RANK} for row in rows]
+
+
+def unique_rows(data):
+    """去除 PDF 中重複出現的單字（同一批 upsert 中的重複鍵會互相競爭），保留最後一筆"""
+    return list({tuple(row[key] for key in MATCH_KEYS): row for row in data}.values())
+
 
 def insert_n5_data():
-    """插入 N5 單字數據到 tests collection"""
-    data = read_pdf_data(DATA_FILE_PATH)
-    success_count = 0
-    
+    """寫入 N5 單字數據到 tests collection：以日文與級別匹配，重複執行不會產生重複資料"""
+    data = unique_rows(read_pdf_data(DATA_FILE_PATH))
+
     if not data:
         print("沒有找到有效的數據")
         return
 
     # 獲取 MongoDB 連接
     db_manager = MongoDBManager()
-    tests_collection = db_manager.db["tests"]
-    
+    tests_collection = db_manager.get_collection("tests")
+    if tests_collection is None:
+        print("無法連接到 MongoDB")
+        return
+
+    report = {"upserted": 0, "modified": 0, "errors": []}
     try:
-        for word in data:
-            try:
-                # 插入數據到 tests collection
-                result = tests_collection.insert_one(word)
-                if result.inserted_id:
-                    success_count += 1
-                    print(f"成功插入: {word['japanese']} - {word['explanation']}")
-                else:
-                    print(f"插入失敗: {word['japanese']} - {word['explanation']}")
-            except Exception as e:
-                print(f"插入數據時發生錯誤: {word['japanese']} - {e}")
+        # 分批 upsert 到 tests collection，被驗證規則拒絕的行逐一列出
+        report = upsert_many_batched(tests_collection, data, MATCH_KEYS, batch_size=BATCH_SIZE)
+        for error in report["errors"]:
+            word = data[error["index"]]
+            print(f"寫入失敗: {word['japanese']} - {word['explanation']} ({error['message']})")
+    except Exception as e:
+        print(f"寫入數據時發生錯誤: {e}")
     finally:
         db_manager.close()
-    
-    print(f"\n總共成功插入 {success_count} 筆資料")
+
+    print(f"\n新增 {report['upserted']} 筆，更新 {report['modified']} 筆，"
+          f"失敗 {len(report['errors'])} 筆，"
+          f"其餘 {len(data) - report['upserted'] - report['modified'] - len(report['errors'])} 筆已是最新")
 
 if __name__ == "__main__":
-    insert_n5_data()
\ No newline at end of file
+    insert_n5_data()
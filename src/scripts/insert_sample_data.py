@@ -41,19 +41,12 @@ sample_words = [
 ]
 
 def insert_sample_data():
-    success_count = 0
-    for word in sample_words:
-        result = WordCRUD.create_word(
-            japanese=word["japanese"],
-            explanation=word["explanation"]
-        )
-        if result:
-            success_count += 1
-            print(f"成功插入: {word['japanese']}")
-        else:
-            print(f"插入失敗: {word['japanese']}")
+    # 以日文匹配寫入，重複執行不會產生重複資料
+    report = WordCRUD.upsert_words(sample_words)
+    for error in report["errors"]:
+        print(f"插入失敗: {error['japanese']} - {error['message']}")
     
-    print(f"\n總共成功插入 {success_count} 筆資料")
+    print(f"\n新增 {report['upserted']} 筆，更新 {report['modified']} 筆資料")
 
 if __name__ == "__main__":
     insert_sample_data()
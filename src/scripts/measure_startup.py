@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import sys
+import os
+import json
+import time
+import subprocess
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(ROOT_DIR)
+
+
+def measure_mode(mode):
+    """
+    在目前進程中測量一種連接方式（必須是全新進程，才不會測到已建立的連接）
+
+    Args:
+        mode: "eager"（舊版：導入時同步連接與結構初始化）或 "lazy"（背景連接）
+
+    Returns:
+        Dict: {"blocking": 阻塞界面的秒數, "ready": 連接完成的秒數, "connected": 是否已連接}
+    """
+    start = time.perf_counter()
+    from src.database.mongodb import MongoDBManager
+    db_manager = MongoDBManager()
+    try:
+        if mode == "eager":
+            db_manager._connect()
+            blocking = time.perf_counter() - start
+            connected = db_manager.collection is not None
+        else:
+            # 背景連接：build() 只需付出啟動線程的成本
+            db_manager.connect_async()
+            blocking = time.perf_counter() - start
+            connected = db_manager.wait_ready()
+        return {"blocking": blocking, "ready": time.perf_counter() - start, "connected": connected}
+    finally:
+        db_manager.close()
+
+
+def run_in_subprocess(mode):
+    """在全新的 Python 進程中執行一次測量，返回 measure_mode 的結果"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--mode", mode],
+        capture_output=True, text=True, check=True, cwd=ROOT_DIR,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_startup():
+    """比較同步連接與背景連接對界面啟動的阻塞時間（各在冷啟動的子進程中測量）"""
+    eager = run_in_subprocess("eager")
+    lazy = run_in_subprocess("lazy")
+
+    print(f"數據庫狀態: {'已連接' if lazy['connected'] else '無法連接'}")
+    print(f"同步連接阻塞界面: {eager['blocking'] * 1000:.1f} ms")
+    print(f"背景連接阻塞界面: {lazy['blocking'] * 1000:.1f} ms（連接完成於 {lazy['ready'] * 1000:.1f} ms）")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--mode":
+        print(json.dumps(measure_mode(sys.argv[2])))
+    else:
+        measure_startup()
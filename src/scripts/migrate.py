@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from pymongo import MongoClient
+from src.database.mongodb import MONGODB_CONFIG
+from src.database.migrations import run_migrations, get_schema_version, LATEST_VERSION
+
+
+def print_progress(name, processed, total):
+    """在同一行顯示回填進度"""
+    percent = processed / total * 100 if total else 100
+    print(f"\r{name}: {processed}/{total} ({percent:.0f}%)", end="", flush=True)
+
+
+def migrate():
+    """在啟動應用前執行結構遷移（大量數據時可看到回填進度，中斷後重新執行會從斷點繼續）"""
+    client = MongoClient(MONGODB_CONFIG["URL"], serverSelectionTimeoutMS=MONGODB_CONFIG["TIMEOUT"])
+    try:
+        client.server_info()
+    except Exception as e:
+        print(f"無法連接到 MongoDB: {e}")
+        return
+
+    db = client[MONGODB_CONFIG["DB_NAME"]]
+    print(f"目前結構版本: {get_schema_version(db)}，最新版本: {LATEST_VERSION}")
+    report = run_migrations(db, progress=print_progress)
+    if report["applied"]:
+        print(f"\n已執行: {', '.join(report['applied'])}，結構版本 {report['from']} -> {report['to']}")
+    else:
+        print("已是最新版本")
+    client.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.database.crud import WordCRUD
+
+
+def export_words(path):
+    """匯出全部單字，顯示進度"""
+    total = WordCRUD.get_total_count()
+
+    def print_progress(count):
+        print(f"\r已匯出 {count}/{total}", end="", flush=True)
+
+    count = WordCRUD.export_words(path, progress=print_progress)
+    if count is None:
+        print("\n匯出失敗")
+    else:
+        print(f"\n已匯出 {count} 筆單字到 {path}")
+
+
+def import_words(path, upsert, offset):
+    """匯入單字，中斷時顯示繼續匯入的命令"""
+    def print_progress(position, written):
+        print(f"\r已處理 {position} 筆，寫入 {written} 筆", end="", flush=True)
+
+    report = WordCRUD.import_words(path, upsert=upsert, offset=offset, progress=print_progress)
+    print()
+    for error in report["errors"]:
+        print(f"第 {error['index'] + 1} 筆匯入失敗: {error['japanese']} - {error['message']}")
+    if report["error"]:
+        print(f"匯入中斷: {report['error']}")
+        print(f"恢復後執行以下命令繼續: import {path}{' --upsert' if upsert else ''} "
+              f"--offset {report['offset']}")
+    else:
+        print(f"匯入完成：寫入 {report['written']} 筆，失敗 {len(report['errors'])} 筆")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="匯出或匯入單字（JSONL/CSV，文件名加 .gz 時壓縮）")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="匯出全部單字")
+    export_parser.add_argument("path", help="目標文件，例如 words.jsonl.gz")
+
+    import_parser = commands.add_parser("import", help="從文件匯入單字")
+    import_parser.add_argument("path", help="來源文件，例如 words.csv")
+    import_parser.add_argument("--upsert", action="store_true", help="已存在的單字改為更新解釋")
+    import_parser.add_argument("--offset", type=int, default=0, help="跳過前幾筆（從中斷處繼續）")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        export_words(args.path)
+    else:
+        import_words(args.path, args.upsert, args.offset)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,10 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.widget import Widget
 from kivy.metrics import dp
 
-from database import words_collection
+from database import WordCRUD, get_storage, storage_breaker
+from database.storage import DUPLICATE_ERRORS
 from components import JapaneseTextInput, ExplanationTextInput, ErrorLabel, CancelButton, ConfirmButton
+from functions.db_worker import db_worker
 from ui.confirm_popup import ConfirmPopup
 
 class WordPopup(Popup):
@@ -145,24 +147,55 @@ class WordPopup(Popup):
         """
         try:
             if self.mode == "add":
-                # 新增模式：檢查數據庫連接並插入新記錄
-                if words_collection is None:
-                    self.error_label.text = "資料庫連接失敗"
-                    return
-
-                result = words_collection.insert_one({
-                    "japanese": japanese,
-                    "explanation": explanation
-                })
-                self.callback(japanese, explanation, result.inserted_id)
-            else:
-                # 編輯模式：直接調用回調函數
-                self.callback(japanese, explanation)
-
-            # 關閉彈窗並更新視圖
-            self.dismiss()
-            self.update_view_callback()
+                # 新增模式：在背景插入新記錄（無法連接時暫存到離線日誌）
+                db_worker.submit(
+                    self._insert_word,
+                    japanese,
+                    explanation,
+                    on_result=lambda result: self._on_inserted(japanese, explanation, result),
+                    on_error=lambda e: self._show_submit_error(e),
+                )
+                return
+
+            # 編輯模式：直接調用回調函數
+            self.callback(japanese, explanation)
+            self._finish_submit()
             
         except Exception as e:
-            # 顯示錯誤信息
-            self.error_label.text = f"{'新增' if self.mode == 'add' else '修改'}失敗: {str(e)}"
+            self._show_submit_error(e)
+
+    @staticmethod
+    def _insert_word(japanese: str, explanation: str):
+        """
+        插入新單字（工作線程）：同一日文已存在時拋出 DUPLICATE_ERRORS 之一，不覆蓋原有解釋；
+        數據庫無法連接時由 WordCRUD 暫存到離線日誌
+        Returns:
+            Tuple[Optional[Any], bool]: (單字ID, 是否暫存到離線日誌)，失敗時單字ID為 None
+        """
+        # 等待啟動時的背景連接完成；斷路器斷開時不必等待
+        if not storage_breaker.is_open:
+            get_storage().wait_ready()
+        word_id = WordCRUD.create_word(japanese, explanation)
+        # 日誌不為空時所有寫入都會排在日誌中，此時新單字要等重放後才真正寫入
+        return word_id, WordCRUD.pending_writes() > 0
+
+    def _on_inserted(self, japanese: str, explanation: str, result):
+        """新增完成（主線程）：更新列表或顯示錯誤；暫存的單字先以待同步的狀態顯示"""
+        word_id, pending = result
+        if word_id is None:
+            self.error_label.text = "新增失敗"
+            return
+        self.callback(japanese, explanation, word_id, pending)
+        self._finish_submit()
+
+    def _finish_submit(self):
+        """關閉彈窗並更新視圖"""
+        self.dismiss()
+        self.update_view_callback()
+
+    def _show_submit_error(self, error):
+        """顯示錯誤信息"""
+        if isinstance(error, DUPLICATE_ERRORS):
+            self.error_label.text = "單字已存在"
+            return
+        self.error_label.text = f"{'新增' if self.mode == 'add' else '修改'}失敗: {str(error)}"
@@ -2,11 +2,18 @@ from kivy.uix.popup import Popup
 from kivy.uix.boxlayout import BoxLayout
 from kivy.metrics import dp
 from kivy.uix.anchorlayout import AnchorLayout
+from kivy.uix.button import Button
 
 from components import Pagination, SearchBar, AddButton, HeaderLabel
 from functions.words_manager import WordManager
 from ui.word_popup import WordPopup
 
+# 級別按鈕依序切換的列表：(級別, 按鈕文字)，None 表示自己的單字
+RANK_FILTERS = [
+    (None, "我的"), ("N5", "N5"), ("N4", "N4"), ("N3", "N3"),
+    ("N2", "N2"), ("N1", "N1"), ("basic", "基礎"),
+]
+
 
 class WordsMain(Popup):
     """主要單字列表視窗：包含搜索、新增、列表顯示和分頁功能"""
@@ -26,7 +33,7 @@ class WordsMain(Popup):
         content.add_widget(self._create_header())  # 標題欄：單字和解釋的標題
 
         # 添加單字列表管理器
-        self.words_list = WordManager()
+        self.words_list = WordManager(on_view_updated=self.update_pagination)
         content.add_widget(self.words_list)
 
         # 添加分頁控制器
@@ -47,17 +54,33 @@ class WordsMain(Popup):
         )
 
         # 添加搜索欄
-        self.search_bar = SearchBar(search_callback=self._on_search_text)
+        self.search_bar = SearchBar(
+            search_callback=self._on_search_text,
+            submit_callback=self._on_search_submit,
+            mode_callback=self._on_search_mode,
+        )
         function_bar.add_widget(self.search_bar)
 
+        # 添加級別按鈕：點擊在自己的單字與各級別的測驗單字之間切換
+        self.rank_index = 0
+        self.rank_btn = Button(
+            text=RANK_FILTERS[0][1],
+            size_hint_x=None,
+            width=dp(60),
+            font_name="ChineseFont",
+            font_size=dp(16),
+        )
+        self.rank_btn.bind(on_press=self._on_rank_press)
+        function_bar.add_widget(self.rank_btn)
+
         # 創建新增按鈕容器（用於居中對齊）
         add_button_container = AnchorLayout(
             anchor_x="center", anchor_y="center", size_hint_x=None, width=dp(40)
         )
 
         # 添加新增按鈕
-        add_button = AddButton(callback=self.show_add_popup)
-        add_button_container.add_widget(add_button)
+        self.add_button = AddButton(callback=self.show_add_popup)
+        add_button_container.add_widget(self.add_button)
         function_bar.add_widget(add_button_container)
 
         return function_bar
@@ -90,23 +113,52 @@ class WordsMain(Popup):
         self.words_list.search_words(value)
         self.update_pagination()
 
+    def _on_search_submit(self, value):
+        """處理搜索圖標點擊或 Enter：跳過防抖立即搜索"""
+        self.words_list.search_words(value, immediate=True)
+        self.update_pagination()
+
+    def _on_search_mode(self, field):
+        """處理搜索範圍切換：按新範圍重新搜索當前關鍵詞"""
+        self.words_list.set_search_field(field)
+        self.update_pagination()
+
+    def _on_rank_press(self, instance):
+        """處理級別切換：瀏覽測驗單字時只讀，停用搜索與新增"""
+        self.rank_index = (self.rank_index + 1) % len(RANK_FILTERS)
+        rank, label = RANK_FILTERS[self.rank_index]
+        self.rank_btn.text = label
+        self.search_bar.clear()
+        self.search_bar.disabled = rank is not None
+        self.add_button.disabled = rank is not None
+        self.words_list.set_rank(rank)
+        self.update_pagination()
+
+    def on_dismiss(self):
+        """關閉視窗時釋放單字管理器的背景訂閱"""
+        self.words_list.release()
+
     def show_add_popup(self, instance):
         """顯示新增單字彈窗"""
         popup = WordPopup(
-            callback=self.words_list.add_word, update_view_callback=self.update_view
+            callback=self.words_list.on_word_added, update_view_callback=self.update_view
         )
         popup.open()
 
     def update_pagination(self):
-        """更新分頁狀態：同步當前頁碼和總頁數"""
+        """更新分頁狀態：同步當前頁碼和總頁數（單字列表在背景載入完成後也會調用）"""
+        if not hasattr(self, "pagination"):
+            return
         self.pagination.update_state(
-            self.words_list.current_page, self.words_list.total_pages
+            self.words_list.current_page,
+            self.words_list.total_pages,
+            has_more=self.words_list.search_capped,
         )
 
     def _handle_page_change(self, new_page):
-        """處理頁碼變化：更新列表顯示"""
-        self.words_list.current_page = new_page
-        self.update_view()
+        """處理頁碼變化：由單字管理器按 keyset 邊界載入該頁"""
+        self.words_list.go_to_page(new_page)
+        self.update_pagination()
 
     def update_view(self):
         """更新整個視圖：包括列表顯示和分頁狀態"""
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+
+# 與 src/scripts 相同，以 src.database 的形式導入
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "mongodb: 需要本機 MongoDB 服務的測試（無法連接時跳過）")
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import pytest
+
+from src.database.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN
+
+
+def fail():
+    raise ConnectionError("offline")
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=2)
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.state == CLOSED
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.is_open
+
+
+def test_rejects_calls_while_open():
+    breaker = CircuitBreaker(failure_threshold=1)
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    called = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: called.append(1))
+    assert called == []
+    assert breaker.rejected == 1
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.call(lambda: 42) == 42
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.state == CLOSED
+
+
+def test_other_errors_do_not_count():
+    breaker = CircuitBreaker(failure_threshold=1)
+    with pytest.raises(ValueError):
+        breaker.call(lambda: int("x"))
+    assert breaker.state == CLOSED
+
+
+def test_probe_closes_and_notifies_listeners():
+    recovered = threading.Event()
+    attempts = []
+
+    def probe():
+        attempts.append(1)
+        return len(attempts) >= 2
+    breaker = CircuitBreaker(probe, failure_threshold=1, probe_delay=0.01)
+    states = []
+    breaker.add_listener(states.append)
+    breaker.add_listener(lambda state: state == CLOSED and recovered.set())
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert recovered.wait(2)
+    assert states == [OPEN, CLOSED]
+    assert breaker.call(lambda: "ok") == "ok"
+
+
+def test_failing_listener_does_not_break_others():
+    breaker = CircuitBreaker(failure_threshold=1)
+    states = []
+    breaker.add_listener(lambda state: 1 / 0)
+    breaker.add_listener(states.append)
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert states == [OPEN]
+
+
+def test_keeps_probing_when_a_listener_trips_the_breaker_again():
+    recovered = threading.Event()
+    probes = []
+
+    def probe():
+        probes.append(1)
+        return True
+    breaker = CircuitBreaker(probe, failure_threshold=1, probe_delay=0.01)
+
+    def on_state(state):
+        # 第一次恢復時的監聽者（例如重放日誌）再次遇到連接失敗
+        if state == CLOSED and len(probes) == 1:
+            with pytest.raises(ConnectionError):
+                breaker.call(fail)
+        elif state == CLOSED:
+            recovered.set()
+    breaker.add_listener(on_state)
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert recovered.wait(2)
+    assert breaker.state == CLOSED
+    assert len(probes) == 2
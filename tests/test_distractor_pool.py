@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from src.database.distractor_pool import DistractorPool
+
+
+def docs(*pairs):
+    return [{"_id": word_id, "explanation": text} for word_id, text in pairs]
+
+
+def test_evicts_oldest_when_full():
+    pool = DistractorPool(max_size=2)
+    pool.extend(docs((1, "水"), (2, "茶"), (3, "酒")))
+    assert pool.texts() == ["茶", "酒"]
+    pool.extend(docs((2, "茶")))  # 已在池中的移到最新
+    pool.extend(docs((4, "飯")))
+    assert pool.texts() == ["茶", "飯"]
+
+
+def test_update_and_delete_patch_entries():
+    pool = DistractorPool()
+    pool.extend(docs((1, "水"), (2, "茶")))
+    pool.on_update(1, "冷水")
+    pool.on_update(9, "不在池中")
+    pool.on_delete(2)
+    assert pool.texts() == ["冷水"]
+    pool.on_update(1, "")
+    assert len(pool) == 0
+
+
+def test_stale_sample_is_discarded():
+    pool = DistractorPool()
+    version = pool.version
+    pool.on_delete(1)
+    assert not pool.extend_if_current(docs((1, "水")), version)
+    assert pool.texts() == []
+    assert pool.extend_if_current(docs((2, "茶")), pool.version)
+    pool.clear()
+    assert pool.texts() == []
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import random
+
+import pytest
+
+from src.database.fuzzy import FuzzyIndex, levenshtein, allowed_distance
+from src.database.kana import normalize_kana, normalize_query
+
+KANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをんがっー"
+
+
+def make_words(count, seed=7):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(KANA) for _ in range(rng.randint(2, 7))) for _ in range(count)]
+
+
+WORDS = make_words(800) + ["がっこう", "ラーメン", "ありがとう"]
+
+
+def brute_force(term, max_distance):
+    """逐一計算編輯距離的參考實現"""
+    query = normalize_query(term)
+    max_distance = allowed_distance(query, max_distance)
+    return {
+        (i, levenshtein(query, normalize_kana(word)))
+        for i, word in enumerate(WORDS)
+        if levenshtein(query, normalize_kana(word)) <= max_distance
+    }
+
+
+@pytest.fixture(scope="module")
+def index():
+    index = FuzzyIndex()
+    index.add_many((i, word, {"_id": i, "japanese": word}) for i, word in enumerate(WORDS))
+    return index
+
+
+@pytest.mark.parametrize("term", ["がつこう", "がこう", "らめん", "ramen", "ありかと", "あり"]
+                         + make_words(20, seed=11))
+@pytest.mark.parametrize("max_distance", [1, 2])
+def test_lookup_matches_brute_force(index, term, max_distance):
+    found = {(doc["_id"], distance)
+             for distance, doc in index.lookup(term, max_distance, limit=len(WORDS))}
+    assert found == brute_force(term, max_distance)
+
+
+def test_results_sorted_by_distance(index):
+    distances = [distance for distance, _ in index.lookup("がつこう", limit=50)]
+    assert distances == sorted(distances)
+    assert index.lookup("がつこう", limit=1)[0][1]["japanese"] == "がっこう"
+
+
+def test_levenshtein():
+    assert levenshtein("がっこう", "がつこう") == 1
+    assert levenshtein("", "あい") == 2
+    assert levenshtein("あいうえお", "か", max_distance=2) == 3
+
+
+def test_remove_and_replace():
+    index = FuzzyIndex()
+    index.add(1, "がっこう", {"_id": 1})
+    index.add(2, "がっこう", {"_id": 2})
+    index.remove(1)
+    assert [doc["_id"] for _, doc in index.lookup("がっこう")] == [2]
+    index.add(2, "せんせい", {"_id": 2})
+    assert index.lookup("がっこう") == []
+    index.remove(2)
+    assert not index._keys and not index._variants  # 沒有條目的鍵與刪除變體都已清除
+
+
+def test_loader_runs_once_until_invalidated():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return [(1, "がっこう", {"_id": 1})]
+    index = FuzzyIndex(loader)
+    index.lookup("がっこう")
+    index.lookup("がっこう")
+    assert len(calls) == 1
+    index.invalidate()
+    assert len(index) == 0
+    assert index.lookup("がっこう")
+    assert len(calls) == 2
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from src.database.kana import normalize_query, normalize_kana, romaji_to_kana, katakana_to_hiragana
+
+
+@pytest.mark.parametrize("term", ["らーめん", "ラーメン", "ramen", "RAMEN", "ﾗｰﾒﾝ", "らめん"])
+def test_query_forms_share_a_key(term):
+    assert normalize_query(term) == "らめん"
+
+
+@pytest.mark.parametrize("romaji, kana", [
+    ("gakkou", "がっこう"),
+    ("konnichiha", "こんにちは"),
+    ("shinbun", "しんぶん"),
+    ("kyou", "きょう"),
+    ("matcha", "まっちゃ"),
+    ("tsukue", "つくえ"),
+    ("kan'i", "かんい"),
+    ("sushi", "すし"),
+    ("si", "し"),
+])
+def test_romaji_to_kana(romaji, kana):
+    assert romaji_to_kana(romaji) == kana
+
+
+def test_mixed_kana_and_romaji():
+    assert normalize_query("がkkou") == "がっこう"
+
+
+@pytest.mark.parametrize("text, kana", [
+    ("ののa", "ののあ"),
+    ("ささki", "ささき"),
+    ("人人", "人人"),
+])
+def test_repeated_kana_is_not_sokuon(text, kana):
+    assert romaji_to_kana(text) == kana
+
+
+def test_katakana_to_hiragana_keeps_other_characters():
+    assert katakana_to_hiragana("カタカナ漢字abc") == "かたかな漢字abc"
+
+
+def test_full_width_normalized():
+    assert normalize_kana("ＡＢＣ") == "abc"
+
+
+def test_only_long_vowel_marks_normalize_to_empty():
+    assert normalize_query("ー") == ""
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+from src.database.page_cache import PageCache
+
+
+def page(*ids):
+    return [{"_id": word_id, "japanese": str(word_id)} for word_id in ids]
+
+
+def key(anchor=None, backward=False, skip=0, limit=3, sort_by="_id", search_term=None):
+    return PageCache.make_key({"anchor": anchor, "backward": backward, "skip": skip,
+                               "limit": limit, "sort_by": sort_by, "sort_order": -1},
+                              search_term)
+
+
+# 降序 _id：第一頁 9..7，keyset 第二頁（邊界 7 之後）6..4
+FIRST = key()
+SECOND = key(anchor=7)
+BACKWARD = key(anchor=4, backward=True)  # 邊界 4 之前的一頁：7..5
+
+
+def test_covers_first_page():
+    docs = page(9, 8, 7)
+    assert PageCache._covers(FIRST, docs, 8)
+    assert PageCache._covers(FIRST, docs, 10)  # 新單字排在最前，整頁位移
+    assert PageCache._covers(FIRST, docs, 7)
+    assert not PageCache._covers(FIRST, docs, 6)
+
+
+def test_covers_keyset_page():
+    docs = page(6, 5, 4)
+    assert not PageCache._covers(SECOND, docs, 8)  # 在邊界之前
+    assert not PageCache._covers(SECOND, docs, 7)  # 邊界本身屬於上一頁
+    assert PageCache._covers(SECOND, docs, 5)
+    assert not PageCache._covers(SECOND, docs, 3)
+
+
+def test_covers_partial_page_extends_to_end():
+    assert PageCache._covers(SECOND, page(6, 5), 1)
+
+
+def test_covers_backward_page():
+    docs = page(7, 6, 5)
+    assert PageCache._covers(BACKWARD, docs, 6)
+    assert not PageCache._covers(BACKWARD, docs, 8)
+    assert not PageCache._covers(BACKWARD, docs, 4)
+    assert PageCache._covers(key(anchor=4, backward=True), page(6, 5), 8)  # 未滿頁時從開頭
+
+
+def test_covers_non_id_sort_is_conservative():
+    assert PageCache._covers(key(sort_by="japanese"), page(9, 8, 7), 1)
+
+
+def filled_cache():
+    cache = PageCache()
+    cache.put(FIRST, page(9, 8, 7))
+    cache.put(SECOND, page(6, 5, 4))
+    cache.put(key(search_term="あ", limit=1), page(8))
+    return cache
+
+
+def test_insert_invalidates_covering_pages_and_searches():
+    cache = filled_cache()
+    cache.on_insert(10)
+    assert not cache.contains(FIRST)
+    assert cache.contains(SECOND)
+    assert not cache.contains(key(search_term="あ", limit=1))
+
+
+def test_delete_invalidates_only_affected_pages():
+    cache = filled_cache()
+    cache.on_delete(5)
+    assert cache.contains(FIRST)
+    assert not cache.contains(SECOND)
+    assert cache.contains(key(search_term="あ", limit=1))
+
+
+def test_update_invalidates_pages_containing_word_and_searches():
+    cache = filled_cache()
+    cache.put(key(sort_by="japanese"), page(1, 2, 3))
+    cache.on_update(8)
+    assert not cache.contains(FIRST)
+    assert cache.contains(SECOND)
+    assert not cache.contains(key(search_term="あ", limit=1))
+    assert not cache.contains(key(sort_by="japanese"))
+
+
+def test_put_if_current_discards_results_from_before_invalidation():
+    cache = PageCache()
+    version = cache.version
+    cache.on_insert(1)
+    assert not cache.put_if_current(FIRST, page(9, 8, 7), version)
+    assert not cache.contains(FIRST)
+    assert cache.put_if_current(FIRST, page(9, 8, 7), cache.version)
+
+
+def test_lru_eviction_and_stats():
+    cache = PageCache(max_size=2)
+    cache.put(FIRST, page(9))
+    cache.put(SECOND, page(6))
+    cache.get(FIRST)
+    cache.put(BACKWARD, page(7))
+    assert cache.contains(FIRST)
+    assert not cache.contains(SECOND)
+    assert cache.get(SECOND) is None
+    assert cache.stats == {"hits": 1, "misses": 1, "size": 2, "hit_rate": 0.5}
+
+
+def test_get_or_load_does_not_cache_failures():
+    cache = PageCache()
+
+    def fail():
+        raise ConnectionError()
+    try:
+        cache.get_or_load(FIRST, fail)
+    except ConnectionError:
+        pass
+    assert not cache.contains(FIRST)
+    assert cache.get_or_load(FIRST, lambda: page(9)) == page(9)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+from src.database.pagination import KeysetPaginator, keyset_filter, sort_key
+
+
+def page(*ids):
+    return [{"_id": word_id, "japanese": str(word_id)} for word_id in ids]
+
+
+def test_first_page_has_no_anchor():
+    assert KeysetPaginator().locate(1, 5) == {"limit": 5, "sort_by": "_id", "sort_order": -1}
+
+
+def test_next_page_continues_after_previous_last_key():
+    paginator = KeysetPaginator()
+    paginator.record(1, page(9, 8, 7))
+    assert paginator.locate(2, 3)["anchor"] == 7
+    assert "skip" not in paginator.locate(2, 3)
+
+
+def test_previous_page_reads_backward_from_next_first_key():
+    paginator = KeysetPaginator()
+    paginator.record(3, page(3, 2, 1))
+    params = paginator.locate(2, 3)
+    assert params["anchor"] == 3
+    assert params["backward"]
+
+
+def test_jump_falls_back_to_skip():
+    paginator = KeysetPaginator()
+    paginator.record(1, page(9, 8, 7))
+    assert paginator.locate(5, 3)["skip"] == 12
+    assert "anchor" not in paginator.locate(5, 3)
+
+
+def test_invalidate_keeps_earlier_pages():
+    paginator = KeysetPaginator()
+    for number, docs in ((1, page(9, 8)), (2, page(7, 6)), (3, page(5, 4))):
+        paginator.record(number, docs)
+    paginator.invalidate(2)
+    assert paginator.locate(2, 2)["anchor"] == 8
+    assert "anchor" not in paginator.locate(4, 2)
+    paginator.reset()
+    assert "anchor" not in paginator.locate(2, 2)
+
+
+def test_empty_page_clears_its_bounds():
+    paginator = KeysetPaginator()
+    paginator.record(1, page(9, 8))
+    paginator.record(1, [])
+    assert "anchor" not in paginator.locate(2, 2)
+
+
+def test_non_id_sort_uses_value_and_id():
+    paginator = KeysetPaginator("japanese", 1)
+    paginator.record(1, [{"_id": 2, "japanese": "あ"}, {"_id": 1, "japanese": "い"}])
+    assert paginator.locate(2, 2)["anchor"] == ("い", 1)
+    assert sort_key({"_id": 1, "japanese": "い"}, "japanese") == ("い", 1)
+    assert keyset_filter(("い", 1), "japanese", 1) == {"$or": [
+        {"japanese": {"$gt": "い"}},
+        {"japanese": "い", "_id": {"$gt": 1}},
+    ]}
+
+
+def test_backward_filter_flips_operator():
+    assert keyset_filter(7, sort_order=-1) == {"_id": {"$lt": 7}}
+    assert keyset_filter(7, sort_order=-1, backward=True) == {"_id": {"$gt": 7}}
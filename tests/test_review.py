@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from src.database.review import (
+    schedule, new_state, AGAIN, HARD, GOOD, EASY, DAY, DEFAULT_EASE, MIN_EASE, RELEARN_INTERVAL,
+    REVIEW_FIELDS,
+)
+from src.database.validators import WORDS_VALIDATOR
+
+NOW = 1_700_000_000.0
+
+
+def test_new_card_first_intervals():
+    assert schedule(None, GOOD, NOW)["interval"] == DAY
+    assert schedule(None, EASY, NOW)["interval"] == 4 * DAY
+    state = schedule(new_state(), GOOD, NOW)
+    assert state == {"due": NOW + DAY, "interval": DAY, "ease": DEFAULT_EASE,
+                     "reps": 1, "lapses": 0}
+
+
+def test_good_reviews_grow_by_ease():
+    state = schedule(None, GOOD, NOW)
+    state = schedule(state, GOOD, NOW)
+    assert state["interval"] == 6 * DAY
+    state = schedule(state, GOOD, NOW)
+    assert state["interval"] == pytest.approx(6 * DAY * DEFAULT_EASE)
+    assert state["reps"] == 3
+
+
+def test_hard_grows_slowly_and_easy_gets_bonus():
+    state = {"due": NOW, "interval": 10 * DAY, "ease": 2.0, "reps": 5, "lapses": 0}
+    assert schedule(state, HARD, NOW)["interval"] == pytest.approx(12 * DAY)
+    assert schedule(state, EASY, NOW)["interval"] == pytest.approx(10 * DAY * 2.15 * 1.3)
+
+
+def test_interval_grows_by_at_least_a_day():
+    state = {"due": NOW, "interval": DAY, "ease": MIN_EASE, "reps": 3, "lapses": 0}
+    assert schedule(state, HARD, NOW)["interval"] == 2 * DAY
+
+
+def test_again_resets_reps_and_counts_lapse():
+    state = {"due": NOW, "interval": 30 * DAY, "ease": 2.5, "reps": 6, "lapses": 1}
+    result = schedule(state, AGAIN, NOW)
+    assert result == {"due": NOW + RELEARN_INTERVAL, "interval": RELEARN_INTERVAL,
+                      "ease": pytest.approx(2.3), "reps": 0, "lapses": 2}
+
+
+def test_ease_has_a_floor():
+    state = {"due": NOW, "interval": DAY, "ease": MIN_EASE, "reps": 3, "lapses": 0}
+    assert schedule(state, AGAIN, NOW)["ease"] == MIN_EASE
+
+
+def test_unknown_grade():
+    with pytest.raises(ValueError):
+        schedule(None, 4, NOW)
+
+
+def test_validator_declares_every_review_field():
+    schema = WORDS_VALIDATOR["validator"]["$jsonSchema"]["properties"]["review"]
+    assert set(schema["required"]) == set(REVIEW_FIELDS)
+    assert set(schema["properties"]) == set(REVIEW_FIELDS)
+    state = schedule(schedule(None, GOOD, NOW), AGAIN, NOW)
+    assert set(state) == set(REVIEW_FIELDS)
+    assert isinstance(state["reps"], int) and isinstance(state["lapses"], int)
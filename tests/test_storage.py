@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+兩個存儲後端共用的測試：SQLite 與 MongoDB 必須對同一組操作返回相同結果
+
+MongoDB 的用例需要本機的 MongoDB 服務（見 MONGODB_CONFIG），無法連接時跳過；
+只測 SQLite 可執行 pytest -m "not mongodb"
+"""
+import pytest
+
+from src.database.sqlite_storage import SQLiteStorage
+from src.database.mongo_storage import MongoStorage
+from src.database.indexes import INDEXES, reconcile_indexes
+from src.database.pagination import KeysetPaginator
+from src.database.mongodb import MONGODB_CONFIG
+from src.database.validators import WORDS_VALIDATOR
+
+WORDS = [
+    {"japanese": "あいさつ", "explanation": "問候；打招呼"},
+    {"japanese": "がっこう", "explanation": "學校"},
+    {"japanese": "ガッコウ", "explanation": "學校（片假名）"},
+    {"japanese": "せんせい", "explanation": "老師"},
+    {"japanese": "ありがとう", "explanation": "謝謝；感謝"},
+    {"japanese": "たべる", "explanation": "吃"},
+    {"japanese": "のむ", "explanation": "喝；吞"},
+    {"japanese": "りんご", "explanation": "蘋果 apple"},
+]
+
+
+@pytest.fixture(scope="module")
+def mongo_db():
+    """獨立的測試數據庫（只連接一次，無法連接時跳過全部 MongoDB 用例）"""
+    from pymongo import MongoClient
+    client = MongoClient(MONGODB_CONFIG["URL"], serverSelectionTimeoutMS=1000)
+    try:
+        client.server_info()
+    except Exception as e:
+        client.close()
+        pytest.skip(f"無法連接到 MongoDB: {e}")
+    yield client["japanese_test"]
+    client.drop_database("japanese_test")
+    client.close()
+
+
+@pytest.fixture(params=[
+    "sqlite",
+    pytest.param("mongodb", marks=pytest.mark.mongodb),
+])
+def storage(request):
+    """以同一組單字初始化的存儲後端"""
+    if request.param == "sqlite":
+        backend = SQLiteStorage(":memory:")
+    else:
+        db = request.getfixturevalue("mongo_db")
+        db.drop_collection("words")
+        db.create_collection("words", **WORDS_VALIDATOR)
+        reconcile_indexes(db["words"], INDEXES["words"])
+        backend = MongoStorage(db["words"])
+    backend.insert_words(WORDS)
+    yield backend
+    backend.close()
+
+
+def japanese(rows):
+    """取出單字行的日文"""
+    return [row["japanese"] for row in rows]
+
+
+def test_insert_and_get(storage):
+    word_id = storage.insert_word("みず", "水")
+    doc = storage.get_word(word_id)
+    assert doc["japanese"] == "みず"
+    assert doc["explanation"] == "水"
+    assert storage.count_words(exact=True) == len(WORDS) + 1
+
+
+def test_update_and_delete(storage):
+    word_id = storage.find_words(limit=1)[0]["_id"]
+    assert storage.update_word(word_id, "みず", "水")
+    assert not storage.update_word(word_id, "みず", "水")  # 內容沒有變化
+    assert storage.get_word(word_id)["japanese"] == "みず"
+    assert storage.delete_word(word_id)
+    assert storage.get_word(word_id) is None
+    assert not storage.delete_word(word_id)
+
+
+def test_upsert_matches_japanese(storage):
+    word_id, created = storage.upsert_word("たべる", "吃；食用")
+    assert not created
+    assert storage.get_word(word_id)["explanation"] == "吃；食用"
+    _, created = storage.upsert_word("みず", "水")
+    assert created
+    assert storage.count_words(exact=True) == len(WORDS) + 1
+
+
+def test_newest_first(storage):
+    assert japanese(storage.find_words(limit=3)) == ["りんご", "のむ", "たべる"]
+
+
+@pytest.mark.parametrize("sort_by, sort_order", [("_id", -1), ("_id", 1), ("japanese", 1)])
+def test_keyset_pages_match_skip_pages(storage, sort_by, sort_order):
+    paginator = KeysetPaginator(sort_by, sort_order)
+    keyset_pages, skip_pages = [], []
+    for page in range(1, 4):
+        rows = storage.find_words(**paginator.locate(page, 3))
+        paginator.record(page, rows)
+        keyset_pages.append(japanese(rows))
+        skip_pages.append(japanese(storage.find_words(
+            limit=3, sort_by=sort_by, sort_order=sort_order, skip=(page - 1) * 3
+        )))
+    assert keyset_pages == skip_pages
+    assert sum(keyset_pages, []) == japanese(storage.find_words(
+        limit=len(WORDS), sort_by=sort_by, sort_order=sort_order
+    ))
+
+
+def test_backward_page(storage):
+    paginator = KeysetPaginator()
+    for page in (1, 2, 3):
+        paginator.record(page, storage.find_words(**paginator.locate(page, 3)))
+    expected = japanese(storage.find_words(limit=3, skip=3))
+    paginator.invalidate(1)
+    paginator.record(3, storage.find_words(limit=3, skip=6))
+    assert japanese(storage.find_words(**paginator.locate(2, 3))) == expected
+
+
+def test_search_across_kana(storage):
+    # 平假名、片假名與羅馬字查詢匹配同一組單字
+    expected = ["がっこう", "ガッコウ"]
+    for term in ("がっこう", "ガッコウ", "gakkou", "っこ"):
+        assert sorted(japanese(storage.search_words(term))) == sorted(expected)
+        assert storage.count_matches(term) == 2
+
+
+def test_search_pages_and_cap(storage):
+    first = storage.search_words("あ", limit=1)
+    second = storage.search_words("あ", limit=1, skip=1)
+    assert len(first) == len(second) == 1
+    assert first[0]["_id"] != second[0]["_id"]
+    assert storage.count_matches("あ") == 2
+    assert storage.count_matches("あ", cap=1) == 1
+
+
+def test_search_explanation(storage):
+    assert japanese(storage.search_words("學校", field="explanation")) == ["がっこう", "ガッコウ"]
+    assert storage.count_matches("學校", field="explanation") == 2
+    assert japanese(storage.search_words("apple", field="explanation")) == ["りんご"]
+    assert storage.count_matches("不存在", field="all") == 0
+
+
+def test_search_explanation_is_width_insensitive(storage):
+    storage.insert_word("ぱいなっぷる", "ＰＩＮＥＡＰＰＬＥ；鳳梨")
+    assert japanese(storage.search_words("apple", field="explanation")) == ["りんご", "ぱいなっぷる"]
+    assert storage.count_matches("ｐｉｎｅ", field="explanation") == 1
+
+
+def test_list_rows_are_previews(storage):
+    word_id = storage.insert_word("ながい", "長" * 200)
+    row = storage.find_words(limit=1)[0]
+    assert row["_id"] == word_id
+    assert row["truncated"]
+    assert len(storage.get_word(word_id)["explanation"]) == 200
+
+
+def test_validation_rejects_non_japanese(storage):
+    report = storage.insert_words([{"japanese": "abc", "explanation": "x"},
+                                   {"japanese": "みず", "explanation": "水"}])
+    assert [error["index"] for error in report["errors"]] == [0]
+    assert len(report["inserted_ids"]) == 1
+
+
+def test_unique_japanese(storage):
+    report = storage.insert_words([{"japanese": "たべる", "explanation": "重複"}])
+    assert report["inserted_ids"] == []
+    assert report["errors"][0]["code"] == 11000
+    assert storage.count_words(exact=True) == len(WORDS)
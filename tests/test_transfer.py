@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from src.database import transfer
+
+WORDS = [
+    {"japanese": "あいさつ", "explanation": "問候；打招呼"},
+    {"japanese": "ありがとう", "explanation": "謝謝, \"感謝\"\n（換行）"},
+    {"japanese": "のむ", "explanation": ""},
+]
+
+
+@pytest.mark.parametrize("name", ["words.jsonl", "words.csv", "words.jsonl.gz", "words.csv.gz"])
+def test_round_trip(tmp_path, name):
+    path = str(tmp_path / name)
+    docs = [{"_id": i, **word} for i, word in enumerate(WORDS)]
+    assert transfer.export_words(path, iter(docs)) == len(WORDS)
+    assert list(transfer.read_words(path)) == WORDS
+    assert not (tmp_path / (name + ".part")).exists()
+
+
+def test_missing_explanation_exported_as_empty(tmp_path):
+    path = str(tmp_path / "words.jsonl")
+    transfer.export_words(path, [{"japanese": "みず", "explanation": None}])
+    assert list(transfer.read_words(path)) == [{"japanese": "みず", "explanation": ""}]
+
+
+def test_batches_resume_from_offset(tmp_path):
+    path = str(tmp_path / "words.csv")
+    transfer.export_words(path, WORDS)
+    assert [(start, len(batch)) for start, batch in transfer.read_batches(path, 2)] == [(0, 2), (2, 1)]
+    batches = list(transfer.read_batches(path, 2, offset=1))
+    assert [start for start, _ in batches] == [1]
+    assert batches[0][1] == WORDS[1:]
+
+
+def test_failed_export_leaves_no_file(tmp_path):
+    path = tmp_path / "words.jsonl"
+
+    def docs():
+        yield WORDS[0]
+        raise ConnectionError("offline")
+    with pytest.raises(ConnectionError):
+        transfer.export_words(str(path), docs())
+    assert not path.exists()
+    assert not (tmp_path / "words.jsonl.part").exists()
+
+
+def test_progress_reports_final_count(tmp_path):
+    reported = []
+    transfer.export_words(str(tmp_path / "words.jsonl"), WORDS, reported.append, progress_every=2)
+    assert reported == [2, 3]
+
+
+def test_unsupported_format():
+    with pytest.raises(ValueError):
+        transfer.detect_format("words.txt")
+    assert transfer.detect_format("words.CSV.gz") == "csv"
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import pytest
+from bson import ObjectId
+
+from src.database.storage import DUPLICATE_ERRORS
+from src.database.write_journal import WriteJournal, INSERT, UPDATE, DELETE, UPSERT
+
+
+def test_missing_file_is_empty_and_not_created(tmp_path):
+    path = tmp_path / "journal.db"
+    assert len(WriteJournal(str(path))) == 0
+    assert not path.exists()
+
+
+def test_ops_replay_in_order_and_keep_types(tmp_path):
+    journal = WriteJournal(str(tmp_path / "journal.db"))
+    word_id = ObjectId()
+    ops = [
+        {"op": INSERT, "_id": word_id, "japanese": "みず", "explanation": "水"},
+        {"op": UPDATE, "_id": word_id, "japanese": "みず", "explanation": "水；冷水"},
+        {"op": UPSERT, "japanese": "おちゃ", "explanation": "茶"},
+        {"op": DELETE, "_id": word_id},
+    ]
+    seqs = [journal.append(op) for op in ops]
+    assert seqs == sorted(seqs)
+    assert len(journal) == 4
+    entries = journal.peek(10)
+    assert [op for _, op in entries] == ops
+    assert isinstance(entries[0][1]["_id"], ObjectId)
+
+
+def test_remove_through_drops_replayed_prefix(tmp_path):
+    journal = WriteJournal(str(tmp_path / "journal.db"))
+    for i in range(5):
+        journal.append({"op": DELETE, "_id": i})
+    batch = journal.peek(2)
+    assert journal.remove_through(batch[-1][0]) == 2
+    assert len(journal) == 3
+    assert [op["_id"] for _, op in journal.peek(10)] == [2, 3, 4]
+
+
+def test_pending_ops_survive_reopen(tmp_path):
+    path = str(tmp_path / "journal.db")
+    journal = WriteJournal(path)
+    journal.append({"op": DELETE, "_id": 1})
+    journal.close()
+    reopened = WriteJournal(path)
+    assert len(reopened) == 1
+    assert reopened.peek(1)[0][1] == {"op": DELETE, "_id": 1}
+
+
+
+@pytest.fixture
+def sqlite_crud(tmp_path, monkeypatch):
+    """使用 SQLite 存儲後端與臨時日誌的 crud 模組"""
+    from src.database import crud
+    from src.database.circuit_breaker import CircuitBreaker
+    from src.database.sqlite_storage import SQLiteStorage
+    from src.database.storage import GuardedStorage
+
+    storage = GuardedStorage(SQLiteStorage(":memory:"), CircuitBreaker(probe=lambda: True))
+    monkeypatch.setattr(crud, "get_storage", lambda: storage)
+    monkeypatch.setattr(crud, "write_journal", WriteJournal(str(tmp_path / "journal.db")))
+    return crud
+
+
+def test_sqlite_backend_writes_directly_and_leaves_journal(sqlite_crud):
+    journal = sqlite_crud.write_journal
+    journal.append({"op": DELETE, "_id": ObjectId()})  # 之前使用 MongoDB 時留下的操作
+
+    word_id = sqlite_crud.WordCRUD.create_word("ねこ", "貓")
+    assert word_id is not None
+    assert sqlite_crud.get_storage().get_word(word_id)["japanese"] == "ねこ"
+    assert sqlite_crud.WordCRUD.pending_writes() == 0
+    assert sqlite_crud.WordCRUD.replay_journal() == {"replayed": 0, "conflicts": []}
+    assert len(journal) == 1
+
+
+def test_create_word_rejects_existing_word(sqlite_crud):
+    word_id = sqlite_crud.WordCRUD.create_word("はし", "橋")
+    with pytest.raises(DUPLICATE_ERRORS):
+        sqlite_crud.WordCRUD.create_word("はし", "箸")
+    assert sqlite_crud.get_storage().get_word(word_id)["explanation"] == "橋"